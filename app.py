@@ -1,148 +1,408 @@
-"""
-Forrest Gump Timer - Web Application
-Flask web server for mobile access and local hosting
-"""
-
-from flask import Flask, render_template, request, jsonify
-from datetime import datetime
-from forrest_timer import timer
-import json
-
-app = Flask(__name__)
-
-@app.route('/')
-def index():
-    """Main timer page"""
-    return render_template('index.html')
-
-@app.route('/api/start_session', methods=['POST'])
-def start_session():
-    """Start a new session"""
-    try:
-        session_id = timer.start_session()
-        return jsonify({
-            'success': True,
-            'session_id': session_id,
-            'message': 'Session started successfully!'
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 400
-
-@app.route('/api/stop_session', methods=['POST'])
-def stop_session():
-    """Stop current session"""
-    try:
-        session_data = timer.stop_session()
-        return jsonify({
-            'success': True,
-            'data': session_data
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 400
-
-@app.route('/api/add_break', methods=['POST'])
-def add_break():
-    """Add break time to current session"""
-    try:
-        data = request.get_json()
-        minutes = int(data.get('minutes', 0))
-        seconds = int(data.get('seconds', 0))
-        
-        timer.add_break(minutes, seconds)
-        return jsonify({
-            'success': True,
-            'message': f'Break added: {minutes:02d}:{seconds:02d}'
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 400
-
-@app.route('/api/session_stats')
-def session_stats():
-    """Get current session statistics"""
-    try:
-        stats = timer.get_session_stats()
-        return jsonify({
-            'success': True,
-            'data': stats
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 400
-
-@app.route('/api/overall_progress')
-def overall_progress():
-    """Get overall progress statistics"""
-    try:
-        progress = timer.get_overall_progress()
-        return jsonify({
-            'success': True,
-            'data': progress
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 400
-
-@app.route('/api/monthly_data/<int:year>/<int:month>')
-def monthly_data(year, month):
-    """Get monthly data for graphs"""
-    try:
-        data = timer.get_monthly_data(year, month)
-        return jsonify({
-            'success': True,
-            'data': data
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 400
-
-@app.route('/api/export_data')
-def export_data():
-    """Export all session data"""
-    try:
-        sessions = timer.load_all_sessions()
-        progress = timer.get_overall_progress()
-        
-        export_data = {
-            'export_date': datetime.now().isoformat(),
-            'total_sessions': len(sessions),
-            'overall_progress': progress,
-            'sessions': sessions
-        }
-        
-        return jsonify({
-            'success': True,
-            'data': export_data
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 400
-
-@app.route('/progress')
-def progress_page():
-    """Progress visualization page"""
-    return render_template('progress.html')
-
-if __name__ == '__main__':
-    print("🚀 Starting Forrest Gump Timer Web Server...")
-    print("🌐 Open your browser to: http://localhost:5000")
-    print("📱 Access from your phone using your computer's IP address")
-    print("🏃‍♂️ Run, Forrest, Run!")
-    
-    app.run(debug=True, host='0.0.0.0', port=5000)
+"""
+Forrest Gump Timer - Web Application
+Flask web server for mobile access and local hosting
+"""
+
+from flask import Flask, Response, render_template, request, jsonify, url_for
+from datetime import datetime, timezone
+from functools import wraps
+from forrest_timer import runners, aggregate_cache, UnknownRunnerError
+from session_export import prepare_export, gzip_chunks
+from session_metrics import metrics, MetricsMiddleware, instrument_storage, aggregate_cache_collector, CONTENT_TYPE
+from session_encoding import (CBOR_MIMETYPE, negotiate, parse_fields, select_fields, representation_tag,
+                              compact, encode_cbor)
+from session_sketch import parse_quantiles
+import json
+import zlib
+
+app = Flask(__name__)
+app.json.compact = True
+
+# Request latency, error and storage-read metrics, served on /api/metrics
+instrument_storage(metrics)
+metrics.add_collector(aggregate_cache_collector(aggregate_cache))
+app.wsgi_app = MetricsMiddleware(app.wsgi_app, metrics)
+
+@app.before_request
+def name_request_endpoint():
+    """Tell MetricsMiddleware which route the request was routed to"""
+    request.environ[MetricsMiddleware.ENDPOINT_KEY] = request.endpoint or 'unmatched'
+
+def runner_id():
+    """Runner named by ?runner= or X-Runner-Id (default runner if none)"""
+    return request.args.get('runner') or request.headers.get('X-Runner-Id') or runners.DEFAULT_RUNNER
+
+def runner_timer(create=False):
+    """Timer for the runner named by ?runner= or X-Runner-Id (default runner if none)
+    
+    Only requests that record sessions pass create=True; for any other
+    request an unknown runner raises UnknownRunnerError (a 404).
+    """
+    return runners.get(runner_id(), create=create)
+
+def error_status(error):
+    """HTTP status for an error raised while handling a request"""
+    return 404 if isinstance(error, UnknownRunnerError) else 400
+
+def response_encoding():
+    """Response encoding asked for by the Accept header: "cbor" or "json" (the default)"""
+    return negotiate(request.headers.get('Accept'))
+
+def requested_fields():
+    """Session fields named by ?fields= (None for all); ValueError for unknown names"""
+    return parse_fields(request.args.get('fields'))
+
+def int_arg(name):
+    """Integer query parameter (None if absent); ValueError if it is not a whole number"""
+    value = request.args.get(name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"Invalid {name}: {value} (use a whole number)") from None
+
+def api_response(payload, status=200):
+    """JSON, or compact CBOR with epoch timestamps when the client asks for it"""
+    if response_encoding() == 'cbor':
+        response = Response(encode_cbor(compact(payload)), status=status, mimetype=CBOR_MIMETYPE)
+    else:
+        response = jsonify(payload)
+        response.status_code = status
+    response.vary.add('Accept')
+    return response
+
+def query_tag():
+    """ETag suffix for the query parameters that shape the body (beyond runner and fields)
+    
+    Caches key their entries by URL, but a client may still replay an ETag
+    against another URL of the same view (the next export page, another
+    format), so the tag must tell them apart.
+    """
+    shaping = sorted((key, value) for key, value in request.args.items(multi=True)
+                     if key not in ('runner', 'fields'))
+    return "-" + format(zlib.crc32(repr(shaping).encode()), "08x") if shaping else ""
+
+def conditional_on_data(view, daily=False):
+    """Answer 304 Not Modified while the runner's stored sessions are unchanged
+    
+    The ETag is built from the storage fingerprint (file mtimes, sizes and
+    inodes), so checking it costs a few stat() calls; the view itself - and
+    with it every storage read and the JSON encoding - only runs when the
+    client's copy is out of date. With daily=True the ETag also changes at
+    midnight.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            runner = runner_timer()
+            data_tag = runner.progress_tag if daily else runner.data_tag
+            etag = (f"{runner_id()}-{data_tag}{representation_tag(response_encoding(), requested_fields())}"
+                    f"{query_tag()}")
+            last_modified = runner.progress_last_modified if daily else runner.data_last_modified
+        except Exception:
+            # Let the view report a bad runner ID or storage error as usual
+            return view(*args, **kwargs)
+        
+        if request.if_none_match:
+            not_modified = request.if_none_match.contains_weak(etag)
+        elif request.if_modified_since and last_modified is not None:
+            not_modified = request.if_modified_since.timestamp() >= int(last_modified)
+        else:
+            not_modified = False
+        
+        if not_modified:
+            response = app.response_class(status=304)
+        else:
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        
+        response.set_etag(etag, weak=True)
+        if last_modified is not None:
+            response.last_modified = datetime.fromtimestamp(int(last_modified), tz=timezone.utc)
+        response.headers['Cache-Control'] = 'no-cache'
+        response.vary.add('X-Runner-Id')
+        response.vary.add('Accept')
+        return response
+    return wrapper
+
+def conditional_on_data_and_day(view):
+    """conditional_on_data for views that also change with the date (rolling windows)"""
+    return conditional_on_data(view, daily=True)
+
+@app.route('/')
+def index():
+    """Main timer page"""
+    return render_template('index.html')
+
+@app.route('/api/start_session', methods=['POST'])
+def start_session():
+    """Start a new session"""
+    try:
+        session_id = runner_timer(create=True).start_session()
+        return jsonify({
+            'success': True,
+            'session_id': session_id,
+            'message': 'Session started successfully!'
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), error_status(e)
+
+@app.route('/api/stop_session', methods=['POST'])
+def stop_session():
+    """Stop current session"""
+    try:
+        session_data = runner_timer().stop_session()
+        return jsonify({
+            'success': True,
+            'data': session_data
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), error_status(e)
+
+@app.route('/api/add_break', methods=['POST'])
+def add_break():
+    """Add break time to current session"""
+    try:
+        data = request.get_json()
+        minutes = int(data.get('minutes', 0))
+        seconds = int(data.get('seconds', 0))
+        
+        runner_timer().add_break(minutes, seconds)
+        return jsonify({
+            'success': True,
+            'message': f'Break added: {minutes:02d}:{seconds:02d}'
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), error_status(e)
+
+@app.route('/api/batch', methods=['POST'])
+def batch():
+    """Apply an ordered list of timer operations in one request (offline sync)
+    
+    Body: {"operations": [{"op": "start", "timestamp": ...},
+                          {"op": "break", "minutes": 1, "seconds": 30, "timestamp": ...},
+                          {"op": "stop", "timestamp": ...}, ...]}
+    Every finished session is stored in one commit; each operation gets its
+    own entry in "results".
+    """
+    try:
+        data = request.get_json()
+        operations = data.get('operations') if isinstance(data, dict) else data
+        results = runner_timer(create=True).apply_batch(operations)
+        return jsonify({
+            'success': True,
+            'results': results,
+            'failed': sum(1 for result in results if not result['success'])
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), error_status(e)
+
+@app.route('/api/session_stats')
+def session_stats():
+    """Get current session statistics"""
+    try:
+        stats = runner_timer().get_session_stats()
+        return api_response({
+            'success': True,
+            'data': stats
+        })
+    except Exception as e:
+        return api_response({
+            'success': False,
+            'error': str(e)
+        }, error_status(e))
+
+@app.route('/api/session_stream')
+def session_stream():
+    """Server-Sent Events: live ticks, breaks and the stop summary of the current session"""
+    try:
+        subscription = runner_timer().events.subscribe()
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), error_status(e)
+    
+    return Response(iter(subscription), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/api/overall_progress')
+@conditional_on_data_and_day
+def overall_progress():
+    """Get overall progress statistics"""
+    try:
+        progress = runner_timer().get_overall_progress()
+        return api_response({
+            'success': True,
+            'data': progress
+        })
+    except Exception as e:
+        return api_response({
+            'success': False,
+            'error': str(e)
+        }, error_status(e))
+
+@app.route('/api/monthly_data/<int:year>/<int:month>')
+@conditional_on_data
+def monthly_data(year, month):
+    """Get monthly data for graphs (?fields=a,b limits the fields of each session)"""
+    try:
+        fields = requested_fields()
+        data = runner_timer().get_monthly_data(year, month)
+        if fields is not None:
+            data = dict(data, sessions=select_fields(data['sessions'], fields))
+        return api_response({
+            'success': True,
+            'data': data
+        })
+    except Exception as e:
+        return api_response({
+            'success': False,
+            'error': str(e)
+        }, error_status(e))
+
+@app.route('/api/range')
+@conditional_on_data_and_day
+def range_data():
+    """Totals and a bucketed series for any date range
+    
+    Query parameters: start=YYYY-MM-DD, end=YYYY-MM-DD (exclusive; default
+    through today, hence the daily ETag) and granularity=day (default),
+    week, month or year.
+    """
+    try:
+        data = runner_timer().get_range_data(request.args.get('start'), request.args.get('end'),
+                                             request.args.get('granularity', 'day'))
+        return api_response({
+            'success': True,
+            'data': data
+        })
+    except Exception as e:
+        return api_response({
+            'success': False,
+            'error': str(e)
+        }, error_status(e))
+
+@app.route('/api/percentiles')
+def percentiles():
+    """Median and p90 (or ?q=) session distance, duration and break length
+    
+    Query parameters: start=YYYY-MM and end=YYYY-MM (inclusive; default all
+    months), q=0.5,0.9, by=month for each month as well, and runners=all or
+    runners=a,b to merge several runners (default: the request's runner).
+    """
+    try:
+        quantiles = parse_quantiles(request.args.get('q'))
+        by = request.args.get('by')
+        if by not in (None, 'month'):
+            raise ValueError(f"Unknown by: {by} (use month)")
+        start, end = request.args.get('start'), request.args.get('end')
+        selected = request.args.get('runners')
+        if selected:
+            runner_ids = None if selected == 'all' else selected.split(',')
+            data = runners.get_percentiles(runner_ids, start, end, quantiles, by == 'month')
+        else:
+            data = runner_timer().get_percentiles(start, end, quantiles, by == 'month')
+        return api_response({
+            'success': True,
+            'data': data
+        })
+    except Exception as e:
+        return api_response({
+            'success': False,
+            'error': str(e)
+        }, error_status(e))
+
+@app.route('/api/export_data')
+@conditional_on_data_and_day
+def export_data():
+    """Export session data, streamed so memory use does not grow with the history
+    
+    Query parameters:
+        format=json (default)  the usual {"success", "data": {...}} object, sessions
+                               written out page by page as a chunked JSON array
+        format=ndjson          one session per line
+        limit=N, cursor=C      paginate: at most N sessions starting at cursor C;
+                               the next cursor is in data.next_cursor (json), the
+                               X-Next-Cursor header and a Link: rel="next" header
+        fields=a,b,...         only these fields of each session
+    The body is gzip-compressed when the client sends Accept-Encoding: gzip,
+    and CBOR (epoch timestamps) when it sends Accept: application/cbor. The
+    json format embeds overall_progress, whose training load and forecast
+    roll over at midnight, so the ETag does too.
+    """
+    try:
+        chunks, mimetype, next_cursor = prepare_export(
+            runner_timer(), request.args.get('format', 'json'),
+            request.args.get('cursor'), int_arg('limit'),
+            response_encoding(), requested_fields())
+    except Exception as e:
+        return api_response({
+            'success': False,
+            'error': str(e)
+        }, error_status(e))
+    
+    headers = {}
+    if next_cursor is not None:
+        headers['X-Next-Cursor'] = next_cursor
+        headers['Link'] = '<{}>; rel="next"'.format(
+            url_for('export_data', **dict(request.args.items(), cursor=next_cursor)))
+    if 'gzip' in request.accept_encodings:
+        chunks = gzip_chunks(chunks)
+        headers['Content-Encoding'] = 'gzip'
+    
+    response = Response(chunks, mimetype=mimetype, headers=headers)
+    response.vary.add('Accept-Encoding')
+    response.vary.add('Accept')
+    return response
+
+@app.route('/api/runners')
+def list_runners():
+    """List known runners and the live stats of those currently running"""
+    try:
+        return api_response({
+            'success': True,
+            'data': {
+                'runners': runners.runner_ids(),
+                'active_sessions': runners.active_sessions()
+            }
+        })
+    except Exception as e:
+        return api_response({
+            'success': False,
+            'error': str(e)
+        }, error_status(e))
+
+@app.route('/api/metrics')
+def prometheus_metrics():
+    """Request counts, latency histograms and storage-read time (Prometheus text format)"""
+    return Response(metrics.render(), content_type=CONTENT_TYPE)
+
+@app.route('/progress')
+def progress_page():
+    """Progress visualization page"""
+    return render_template('progress.html')
+
+if __name__ == '__main__':
+    print("🚀 Starting Forrest Gump Timer Web Server...")
+    print("🌐 Open your browser to: http://localhost:5000")
+    print("📱 Access from your phone using your computer's IP address")
+    print("🏃‍♂️ Run, Forrest, Run!")
+    
+    app.run(debug=True, host='0.0.0.0', port=5000)
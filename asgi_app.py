@@ -0,0 +1,125 @@
+"""
+Forrest Gump Timer - Async Web Server
+The Flask app (app.py) served from an asyncio (ASGI) server with uvicorn
+
+Run with:  python asgi_app.py   (or: uvicorn asgi_app:app --host 0.0.0.0 --port 5000)
+
+Every route is app.py's own, served through the a2wsgi WSGI adapter:
+uvicorn's event loop reads and writes the sockets, so a slow client costs
+no thread, and each Flask request - with all of its storage access - runs
+on a small thread pool off the loop. The one route answered here instead is
+the live session stream, whose clients stay connected for a whole run: they
+wait on the event loop and hold no thread at all.
+"""
+
+import asyncio
+from typing import Dict, Optional
+from urllib.parse import parse_qs
+
+from a2wsgi import WSGIMiddleware
+
+from app import app as flask_app
+from forrest_timer import runners
+from session_metrics import metrics
+from session_stream import AsyncSubscription
+
+# Threads running Flask requests (and so every timer and storage call)
+WSGI_THREADS = 8
+
+# Every other route, answered by the Flask app on the thread pool
+wsgi = WSGIMiddleware(flask_app, workers=WSGI_THREADS)
+
+SESSION_STREAM_PATH = "/api/session_stream"
+
+
+def stream_runner_id(scope: Dict) -> Optional[str]:
+    """Runner named by ?runner= or X-Runner-Id, as app.runner_id() reads it (None: default runner)"""
+    runner = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("runner")
+    if runner:
+        return runner[0]
+    for name, value in scope.get("headers", []):
+        if name.lower() == b"x-runner-id" and value:
+            return value.decode("latin-1")
+    return None
+
+
+async def session_stream(scope: Dict, receive, send) -> None:
+    """Server-Sent Events: the same stream as app.py's session_stream, without a thread per client"""
+    loop = asyncio.get_running_loop()
+    try:
+        # Creating a runner's timer reads its data, so look it up off the loop
+        runner_timer = await loop.run_in_executor(None, runners.get, stream_runner_id(scope))
+    except Exception:
+        # Let the Flask view report a bad runner ID or storage error as usual
+        await wsgi(scope, receive, send)
+        return
+
+    started = metrics.start_request()
+    broadcaster = runner_timer.events
+    subscription = AsyncSubscription(broadcaster, broadcaster.max_queued)
+    await loop.run_in_executor(None, broadcaster.subscribe, subscription)
+    disconnected = asyncio.ensure_future(wait_for_disconnect(receive))
+    try:
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"text/event-stream; charset=utf-8"),
+                        (b"cache-control", b"no-cache"),
+                        (b"x-accel-buffering", b"no")]
+        })
+        while True:
+            next_frame = asyncio.ensure_future(subscription.frames.get())
+            await asyncio.wait({next_frame, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnected.done():
+                next_frame.cancel()
+                return
+            await send({"type": "http.response.body", "body": next_frame.result().encode("utf-8"),
+                        "more_body": True})
+    finally:
+        disconnected.cancel()
+        subscription.close()
+        # Timed until the client went away, like a streamed Flask response
+        metrics.finish_request(started, "GET", "session_stream", 200)
+
+
+async def wait_for_disconnect(receive) -> None:
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+async def app(scope, receive, send):
+    """ASGI entry point"""
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] != "http":
+        return
+
+    if scope["path"] == SESSION_STREAM_PATH and scope["method"] == "GET":
+        await session_stream(scope, receive, send)
+    else:
+        await wsgi(scope, receive, send)
+
+
+def main():
+    try:
+        import uvicorn
+    except ImportError:
+        print("❌ uvicorn is not installed: pip install uvicorn")
+        return
+
+    print("🚀 Starting Forrest Gump Timer Web Server (async)...")
+    print("🌐 Open your browser to: http://localhost:5000")
+    print("📱 Access from your phone using your computer's IP address")
+    print("🏃‍♂️ Run, Forrest, Run!")
+
+    uvicorn.run(app, host="0.0.0.0", port=5000, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: storage-backend aggregation vs the vectorized numpy engine
+Usage: python benchmarks/bench_aggregate.py [sessions] [storage]
+
+Monthly stats are timed end to end, the way get_monthly_data computes
+them (aggregate cache aside): each month's rows are loaded from storage,
+then aggregated by the storage backend or by numpy over those rows. Each
+side starts from a fresh timer, so the first pass includes reading the
+files; the second pass runs with the storage caches warm. Overall totals
+are timed from the stored files too, including building the archive the
+engine reads.
+"""
+
+import datetime
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_startup import make_records
+from forrest_timer import ForrestGumpTimer
+from session_aggregate import SessionAggregator
+import session_aggregate
+
+
+def timed(label: str, func):
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<44} {elapsed * 1000:9.1f} ms")
+    return elapsed, result
+
+
+def month_bounds(months):
+    for year, month in months:
+        start = datetime.datetime(year, month, 1)
+        end = datetime.datetime(year + 1, 1, 1) if month == 12 else datetime.datetime(year, month + 1, 1)
+        yield year, month, start, end
+
+
+def monthly_passes(label: str, data_dir: str, kind: str, months, vectorized: bool):
+    """Cold and warm passes of _compute_monthly_data over every month; returns (seconds, results)"""
+    available = session_aggregate.available
+    if not vectorized:
+        session_aggregate.available = lambda: False
+    try:
+        timer = ForrestGumpTimer(data_dir, storage=kind)
+
+        def every_month():
+            return [timer._compute_monthly_data(*bounds) for bounds in month_bounds(months)]
+
+        cold, results = timed(f"{label}, first pass", every_month)
+        warm, _ = timed(f"{label}, warm storage", every_month)
+    finally:
+        session_aggregate.available = available
+    return (cold, warm), results
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    kind = sys.argv[2] if len(sys.argv) > 2 else "ndjson"
+    print("🧮 Aggregation benchmark")
+    print("=" * 50)
+    if not session_aggregate.available():
+        print("⚠️  numpy is not installed; the vectorized engine is unavailable")
+        return
+
+    data_dir = tempfile.mkdtemp(prefix="forrest_bench_")
+    try:
+        records = list(make_records(n, datetime.datetime(2015, 1, 1)))
+        ForrestGumpTimer(data_dir, storage=kind).storage.append_many(records)
+        months = sorted({(int(r["start_time"][:4]), int(r["start_time"][5:7])) for r in records})
+        print(f"Sessions: {n:,}  storage: {kind}  months: {len(months)}\n")
+
+        print("Monthly data for every month (rows loaded + daily data + totals)")
+        before, storage_results = monthly_passes("storage backend", data_dir, kind, months, False)
+        after, engine_results = monthly_passes("numpy engine", data_dir, kind, months, True)
+        assert storage_results == engine_results, "numpy and storage results differ"
+        print(f"  {'speed-up, first pass / warm':<44} {before[0] / after[0]:6.1f}x / {before[1] / after[1]:.1f}x\n")
+
+        print("Overall totals recomputed from every stored session")
+        timer = ForrestGumpTimer(data_dir, storage=kind)
+        before, _ = timed("storage backend (rebuild_totals)", timer.storage.rebuild_totals)
+        timer = ForrestGumpTimer(data_dir, storage=kind)
+        build, columns = timed("numpy engine: build the archive", timer.get_session_columns)
+        totals, _ = timed("numpy engine: totals over the archive", SessionAggregator.from_columns(columns).totals)
+        print(f"  {'speed-up, archive built / reused':<44} {before / (build + totals):6.1f}x / "
+              f"{before / totals:.0f}x")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
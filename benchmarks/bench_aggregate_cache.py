@@ -0,0 +1,70 @@
+"""
+Benchmark: monthly aggregates with and without the aggregate cache
+Usage: python benchmarks/bench_aggregate_cache.py [sessions] [storage]
+
+Polls get_monthly_data for every month the way dashboards do, stores a new
+session in the latest month, and polls again: only that month is recomputed.
+"""
+
+import datetime
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_startup import make_records
+from forrest_timer import ForrestGumpTimer
+from session_cache import AggregateCache
+
+ROUNDS = 5
+
+
+def timed(label: str, func):
+    started = time.perf_counter()
+    result = func()
+    print(f"  {label:<44} {(time.perf_counter() - started) * 1000:9.1f} ms")
+    return result
+
+
+def poll_all(timer: ForrestGumpTimer, months) -> None:
+    for _ in range(ROUNDS):
+        for year, month in months:
+            timer.get_monthly_data(year, month)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    kind = sys.argv[2] if len(sys.argv) > 2 else "partitioned"
+    data_dir = tempfile.mkdtemp(prefix="forrest_bench_")
+    print("🗃️  Aggregate cache benchmark")
+    print("=" * 50)
+
+    try:
+        records = list(make_records(n, datetime.datetime(2015, 1, 1)))
+        ForrestGumpTimer(data_dir, storage=kind).storage.append_many(records)
+        months = sorted({(int(r["start_time"][:4]), int(r["start_time"][5:7])) for r in records})
+        print(f"Sessions: {n:,}  storage: {kind}  months: {len(months)}  rounds: {ROUNDS}\n")
+
+        uncached = ForrestGumpTimer(data_dir, storage=kind, aggregate_cache=AggregateCache(max_entries=0))
+        timed("every month, no cache", lambda: poll_all(uncached, months))
+
+        timer = ForrestGumpTimer(data_dir, storage=kind, aggregate_cache=AggregateCache(len(months)))
+        timed("every month, cached", lambda: poll_all(timer, months))
+
+        last = datetime.datetime.fromisoformat(records[-1]["end_time"]) + datetime.timedelta(hours=1)
+        timer.start_session(last.timestamp())
+        timer.stop_session(last.timestamp() + 1800)
+        timed("every month after one new session", lambda: poll_all(timer, months))
+
+        stats = timer.aggregate_cache.stats()
+        print(f"\n  hits {stats['hits']:,}  misses {stats['misses']:,}  evictions {stats['evictions']:,}"
+              f"  invalidations {stats['invalidations']:,}  hit ratio {stats['hit_ratio']:.1%}")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
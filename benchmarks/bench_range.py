@@ -0,0 +1,71 @@
+"""
+Benchmark: date-range totals from the prefix-sum index vs scanning sessions
+Usage: python benchmarks/bench_range.py [sessions] [storage]
+"""
+
+import datetime
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_startup import make_records
+from forrest_timer import ForrestGumpTimer
+
+QUERIES = 200
+
+
+def timed(label: str, func, repeat: int = 1):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    print(f"  {label:<44} {(time.perf_counter() - started) * 1000 / repeat:9.3f} ms")
+    return result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    kind = sys.argv[2] if len(sys.argv) > 2 else "partitioned"
+    data_dir = tempfile.mkdtemp(prefix="forrest_bench_")
+    print("📅 Range query benchmark")
+    print("=" * 50)
+
+    try:
+        first = datetime.datetime(2015, 1, 1)
+        timer = ForrestGumpTimer(data_dir, storage=kind)
+        timer.storage.append_many(make_records(n, first))
+        last = datetime.datetime.fromisoformat(timer.storage.load_all()[-1]["start_time"])
+        span = (last - first).days
+        print(f"Sessions: {n:,}  storage: {kind}  days: {span:,}\n")
+
+        random.seed(5)
+        ranges = []
+        for _ in range(QUERIES):
+            start = first + datetime.timedelta(days=random.randint(0, span - 1))
+            ranges.append((start, start + datetime.timedelta(days=random.randint(1, 400))))
+
+        def scan():
+            for start, end in ranges:
+                timer.storage.get_range_totals(start, end)
+
+        def indexed():
+            for start, end in ranges:
+                timer._compute_range_data([start.date(), end.date()], "day")
+
+        timed("first use (index + prefix sums)", timer.get_daily_prefix_sums)
+        timed(f"{QUERIES} range totals, storage scan", scan)
+        timed(f"{QUERIES} range totals, prefix sums", indexed)
+        timed("weekly series over all history", lambda: timer.get_range_data(
+            first.date(), (last + datetime.timedelta(days=1)).date(), "week"))
+        timed("daily series over all history", lambda: timer.get_range_data(
+            first.date(), (last + datetime.timedelta(days=1)).date(), "day"))
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
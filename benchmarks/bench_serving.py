@@ -0,0 +1,164 @@
+"""
+Benchmark: Flask (threaded) vs async ASGI serving under many concurrent pollers
+Usage: python benchmarks/bench_serving.py [pollers] [seconds]
+
+Each mode runs in its own server process on a scratch data directory with
+some history and a running session. Pollers loop over the endpoints the
+mobile page polls (session stats and overall progress), one request per
+connection like a phone's fetch(); a few "slow clients" trickle their
+request headers to show what a stalled connection does to everyone else.
+Needs flask for the first mode, plus a2wsgi and uvicorn for the second; a
+mode whose server is not installed is skipped.
+"""
+
+import asyncio
+import datetime
+import importlib.util
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_startup import make_records
+
+HOST = "127.0.0.1"
+PATHS = ["/api/session_stats", "/api/overall_progress"]
+SLOW_CLIENTS = 4
+
+# Mode -> (modules it needs, server process code)
+SERVERS = {
+    "flask": (("flask",), "import app; app.app.run(host={host!r}, port={port}, threaded=True)"),
+    "asgi": (("flask", "a2wsgi", "uvicorn"), "import uvicorn, asgi_app; "
+             "uvicorn.run(asgi_app.app, host={host!r}, port={port}, log_level='warning')"),
+}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind((HOST, 0))
+        return s.getsockname()[1]
+
+
+def prepare_data(data_dir: str, sessions: int) -> None:
+    from forrest_timer import ForrestGumpTimer
+    timer = ForrestGumpTimer(os.path.join(data_dir, "data"))
+    timer.storage.append_many(make_records(sessions, datetime.datetime(2020, 1, 1)))
+    # A session left running, as when phones poll during a run
+    timer.start_session()
+
+
+def start_server(mode: str, data_dir: str, port: int) -> subprocess.Popen:
+    code = SERVERS[mode][1].format(host=HOST, port=port)
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    process = subprocess.Popen([sys.executable, "-c", code], cwd=data_dir, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            socket.create_connection((HOST, port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"{mode} server did not start")
+
+
+async def get(port: int, path: str) -> int:
+    reader, writer = await asyncio.open_connection(HOST, port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {HOST}\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return int(response.split(b" ", 2)[1])
+
+
+async def poller(port: int, deadline: float, latencies: list, errors: list, offset: int) -> None:
+    i = offset
+    while time.perf_counter() < deadline:
+        path = PATHS[i % len(PATHS)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            status = await get(port, path)
+        except OSError:
+            status = 0
+        if status == 200:
+            latencies.append(time.perf_counter() - started)
+        else:
+            errors.append(status)
+
+
+async def slow_client(port: int, deadline: float) -> None:
+    """Open a connection and send the request one byte every 100 ms"""
+    request = f"GET {PATHS[0]} HTTP/1.1\r\nHost: {HOST}\r\nConnection: close\r\n\r\n".encode()
+    while time.perf_counter() < deadline:
+        try:
+            reader, writer = await asyncio.open_connection(HOST, port)
+            for byte in request:
+                if time.perf_counter() >= deadline:
+                    break
+                writer.write(bytes([byte]))
+                await writer.drain()
+                await asyncio.sleep(0.1)
+            writer.close()
+        except OSError:
+            await asyncio.sleep(0.1)
+
+
+async def load(port: int, pollers: int, seconds: float) -> dict:
+    deadline = time.perf_counter() + seconds
+    latencies, errors = [], []
+    tasks = [poller(port, deadline, latencies, errors, i) for i in range(pollers)]
+    tasks += [slow_client(port, deadline) for _ in range(SLOW_CLIENTS)]
+    await asyncio.gather(*tasks)
+    latencies.sort()
+    count = len(latencies)
+    return {
+        "rps": count / seconds,
+        "p50": latencies[count // 2] * 1000 if count else float("nan"),
+        "p99": latencies[min(count - 1, int(count * 0.99))] * 1000 if count else float("nan"),
+        "errors": len(errors),
+    }
+
+
+def main():
+    pollers = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    print("🌐 Serving benchmark")
+    print("=" * 50)
+    print(f"Pollers: {pollers}  slow clients: {SLOW_CLIENTS}  duration: {seconds:.0f}s per mode")
+
+    results = {}
+    for mode, (modules, _) in SERVERS.items():
+        missing = [module for module in modules if importlib.util.find_spec(module) is None]
+        if missing:
+            print(f"  ⚠️  {mode}: {', '.join(missing)} not installed, skipped")
+            continue
+        data_dir = tempfile.mkdtemp(prefix="forrest_bench_")
+        try:
+            prepare_data(data_dir, 20_000)
+            port = free_port()
+            process = start_server(mode, data_dir, port)
+            try:
+                asyncio.run(load(port, 10, 1))  # warm-up
+                results[mode] = asyncio.run(load(port, pollers, seconds))
+            finally:
+                process.terminate()
+                process.wait()
+        finally:
+            shutil.rmtree(data_dir)
+
+    print(f"\n  {'mode':<8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for mode, result in results.items():
+        print(f"  {mode:<8}{result['rps']:>10.0f}{result['p50']:>10.1f}{result['p99']:>10.1f}"
+              f"{result['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Benchmark: slotted Session/Break records vs plain session dicts
+Compares the two ways a timer loads its stored history, time and memory
+per session: load_all_sessions() (dicts, kept in the storage cache) and
+load_sessions() (slotted records decoded page by page from the files),
+then the storage codec against the previous dataclass.
+
+Usage: python benchmarks/bench_session_records.py [sessions] [storage]
+"""
+
+import datetime
+import gc
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from forrest_timer import ForrestGumpTimer
+from session_records import (Session, Break, session_to_record, session_from_record,
+                             encode_record, decode_record)
+
+N = 50_000
+
+
+@dataclass
+class LegacySession:
+    """The previous dataclass Session, breaks as dicts with ISO timestamps"""
+    session_id: str
+    start_time: datetime.datetime
+    end_time: Optional[datetime.datetime] = None
+    breaks: List[Dict] = None
+    total_break_time: int = 0
+    running_time: int = 0
+    distance_miles: float = 0.0
+    calories: int = 0
+
+
+def legacy_to_dict(session: LegacySession) -> Dict:
+    """What _save_session used to build by hand"""
+    return {
+        "session_id": session.session_id,
+        "start_time": session.start_time.isoformat(),
+        "end_time": session.end_time.isoformat() if session.end_time else None,
+        "breaks": session.breaks,
+        "total_break_time": session.total_break_time,
+        "running_time": session.running_time,
+        "distance_miles": session.distance_miles,
+        "calories": session.calories
+    }
+
+
+def make_sessions(n: int) -> List[Session]:
+    random.seed(7)
+    sessions = []
+    start = time.time() - n * 86400
+    for i in range(n):
+        start_ts = start + i * 86400 + random.random()
+        breaks = [Break(random.randint(0, 5), random.randint(0, 59), start_ts + 600 * (j + 1))
+                  for j in range(random.randint(0, 3))]
+        running = random.uniform(600, 7200)
+        sessions.append(Session(
+            datetime.datetime.fromtimestamp(start_ts).isoformat(), start_ts,
+            start_ts + running + sum(b.total_seconds for b in breaks), breaks,
+            sum(b.total_seconds for b in breaks), running, running / 3600 * 2.4,
+            int(running / 3600 * 2.4 * 100)))
+    return sessions
+
+
+def timed(label: str, func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<38} {elapsed * 1000:9.1f} ms  ({elapsed / len(result) * 1e6:6.2f} us/session)")
+    return result
+
+
+def measure_load(label: str, data_dir: str, kind: str, load, n: int) -> None:
+    """Time of load(timer) on a fresh timer, and the memory its result keeps on another"""
+    timer = ForrestGumpTimer(data_dir, storage=kind)
+    started = time.perf_counter()
+    load(timer)
+    elapsed = time.perf_counter() - started
+
+    timer = ForrestGumpTimer(data_dir, storage=kind)
+    gc.collect()
+    tracemalloc.start()
+    result = load(timer)
+    gc.collect()
+    kept, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(result) == n
+    print(f"  {label:<28} {elapsed * 1000:8.1f} ms  ({elapsed / n * 1e6:5.2f} us/session)  "
+          f"kept {kept / n:6.0f} B/session  peak {peak / n:6.0f} B/session")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N
+    kind = sys.argv[2] if len(sys.argv) > 2 else "partitioned"
+    print("🏁 Session record benchmark")
+    print("=" * 50)
+    print(f"Sessions: {n:,}  storage: {kind}")
+
+    sessions = make_sessions(n)
+    records = [session_to_record(session) for session in sessions]
+    lines = [encode_record(record) for record in records]
+    legacy = [LegacySession(r["session_id"], datetime.datetime.fromisoformat(r["start_time"]),
+                            datetime.datetime.fromisoformat(r["end_time"]), r["breaks"],
+                            r["total_break_time"], r["running_time"], r["distance_miles"],
+                            r["calories"]) for r in records]
+
+    data_dir = tempfile.mkdtemp(prefix="forrest_bench_")
+    try:
+        ForrestGumpTimer(data_dir, storage=kind).import_records(records)
+        print("\n📦 Load the stored history")
+        measure_load("load_all_sessions() -> dicts", data_dir, kind, lambda t: t.load_all_sessions(), n)
+        measure_load("load_sessions() -> Session", data_dir, kind, lambda t: t.load_sessions(), n)
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    print("\n✍️  Encode (record -> JSON line)")
+    timed("legacy dict + json.dumps", lambda: [json.dumps(legacy_to_dict(s)) for s in legacy])
+    timed("codec session_to_record + encode", lambda: [encode_record(session_to_record(s)) for s in sessions])
+    timed("codec encode_record (record only)", lambda: [encode_record(r) for r in records])
+
+    print("\n📖 Decode (JSON line -> record)")
+    timed("json.loads -> dict", lambda: [json.loads(line) for line in lines])
+    timed("codec decode_record -> dict", lambda: [decode_record(line) for line in lines])
+    timed("codec decode -> Session", lambda: [session_from_record(decode_record(line)) for line in lines])
+
+    print(f"\n📏 Bytes per stored line: legacy {sum(len(json.dumps(r)) for r in records) / n:.0f}, "
+          f"codec {sum(len(line) for line in lines) / n:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: timer startup with snapshot + log tail vs full history replay
+Usage: python benchmarks/bench_startup.py [sessions] [storage]
+"""
+
+import datetime
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from forrest_timer import ForrestGumpTimer
+from session_storage import create_storage
+
+TAIL = 1000
+
+
+def make_records(n: int, start: datetime.datetime):
+    random.seed(11)
+    for i in range(n):
+        started = start + datetime.timedelta(minutes=37 * i, seconds=random.random())
+        running = random.uniform(600, 7200)
+        yield {
+            "session_id": started.isoformat(),
+            "start_time": started.isoformat(),
+            "end_time": (started + datetime.timedelta(seconds=running)).isoformat(),
+            "breaks": [],
+            "total_break_time": 0,
+            "running_time": running,
+            "distance_miles": running / 3600 * 2.4,
+            "calories": int(running / 3600 * 240)
+        }
+
+
+def timed(label: str, func):
+    started = time.perf_counter()
+    result = func()
+    print(f"  {label:<44} {(time.perf_counter() - started) * 1000:9.1f} ms")
+    return result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    kind = sys.argv[2] if len(sys.argv) > 2 else "partitioned"
+    data_dir = tempfile.mkdtemp(prefix="forrest_bench_")
+    print("🏁 Startup benchmark")
+    print("=" * 50)
+    print(f"Sessions: {n:,}  storage: {kind}  dir: {data_dir}")
+
+    try:
+        records = list(make_records(n + TAIL, datetime.datetime(2015, 1, 1)))
+        create_storage(kind, data_dir).append_many(records[:n])
+
+        print("\n⏱️  Without a snapshot")
+        timer = timed("construct ForrestGumpTimer", lambda: ForrestGumpTimer(data_dir, storage=kind))
+        timed("first index use (replays all history)", timer.get_session_index)
+        timed("load_all_sessions (reference full parse)", timer.load_all_sessions)
+        timer.index.write_snapshot()
+
+        print("\n⏱️  With a snapshot, empty tail")
+        timer = timed("construct ForrestGumpTimer", lambda: ForrestGumpTimer(data_dir, storage=kind))
+        timed("first index use (snapshot + tail)", timer.get_session_index)
+        timed("first get_overall_progress", timer.get_overall_progress)
+
+        create_storage(kind, data_dir).append_many(records[n:])
+        print(f"\n⏱️  With a snapshot, {TAIL:,}-session tail")
+        timer = timed("construct ForrestGumpTimer", lambda: ForrestGumpTimer(data_dir, storage=kind))
+        timed("first index use (snapshot + tail)", timer.get_session_index)
+        print(f"  replayed after snapshot: {timer.index.replayed_since_snapshot:,}"
+              f" (background compaction at {timer.index.compact_every:,})")
+        if timer.index._compactor is not None:
+            timer.index._compactor.join()
+        print(f"  snapshots written in background: {timer.index.snapshot_count}")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
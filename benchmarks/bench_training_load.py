@@ -0,0 +1,67 @@
+"""
+Benchmark: rolling training load from ring buffers vs recomputing from every session
+Usage: python benchmarks/bench_training_load.py [sessions] [storage]
+"""
+
+import datetime
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_startup import make_records
+from forrest_timer import ForrestGumpTimer
+from session_snapshot import day_ordinal
+from session_training import WINDOWS
+
+REFRESHES = 100
+
+
+def timed(label: str, func, repeat: int = 1):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    print(f"  {label:<44} {(time.perf_counter() - started) * 1000 / repeat:9.3f} ms")
+    return result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    kind = sys.argv[2] if len(sys.argv) > 2 else "partitioned"
+    data_dir = tempfile.mkdtemp(prefix="forrest_bench_")
+    print("📈 Training load benchmark")
+    print("=" * 50)
+
+    try:
+        timer = ForrestGumpTimer(data_dir, storage=kind)
+        timer.storage.append_many(make_records(n, datetime.datetime(2015, 1, 1)))
+        today = datetime.date.fromisoformat(timer.storage.load_all()[-1]["start_time"][:10])
+        print(f"Sessions: {n:,}  storage: {kind}  as of: {today}\n")
+
+        def recompute():
+            # What a refresh costs without the ring buffers
+            last = today.toordinal()
+            windows = {window: [0.0, 0.0, 0] for window in WINDOWS}
+            for session in timer.storage.load_all():
+                age = last - day_ordinal(session["start_time"])
+                for window, sums in windows.items():
+                    if 0 <= age < window:
+                        sums[0] += session["distance_miles"]
+                        sums[1] += session["running_time"]
+                        sums[2] += 1
+            return windows
+
+        timed("first use (index load)", lambda: timer.get_training_load(today))
+        timed("per refresh, recomputed from all sessions", recompute, REFRESHES)
+        timed("per refresh, ring buffers", lambda: timer.get_training_load(today), REFRESHES)
+        timed("per refresh, ring buffers a year later", lambda: timer.get_training_load(
+            today + datetime.timedelta(days=365)))
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,288 +1,940 @@
-"""
-Forrest Gump Timer - Core Module
-Handles timer calculations and data management
-"""
-
-import json
-import datetime
-from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
-import os
-
-@dataclass
-class Session:
-    """Represents a single running session"""
-    session_id: str
-    start_time: datetime.datetime
-    end_time: Optional[datetime.datetime] = None
-    breaks: List[Dict] = None
-    total_break_time: int = 0  # seconds
-    running_time: int = 0  # seconds
-    distance_miles: float = 0.0
-    calories: int = 0
-    
-    def __post_init__(self):
-        if self.breaks is None:
-            self.breaks = []
-
-class ForrestGumpTimer:
-    """Main timer class for tracking Forrest Gump's epic journey"""
-    
-    # Forrest's journey constants
-    TOTAL_YEARS = 3
-    TOTAL_MONTHS = 2
-    TOTAL_DAYS = 14
-    TOTAL_HOURS = 16
-    SPEED_MPH = 2.4
-    
-    def __init__(self, data_dir: str = "data"):
-        """Initialize the timer with data directory"""
-        self.data_dir = data_dir
-        self.current_session = None
-        self.sessions_file = os.path.join(data_dir, "sessions.json")
-        
-        # Create data directory if it doesn't exist
-        os.makedirs(data_dir, exist_ok=True)
-        
-        # Calculate total target time and distance
-        self.total_target_seconds = self._calculate_total_target_seconds()
-        self.total_target_miles = self._calculate_total_target_miles()
-        
-    def _calculate_total_target_seconds(self) -> int:
-        """Calculate total seconds for Forrest's journey"""
-        total_days = (self.TOTAL_YEARS * 365) + (self.TOTAL_MONTHS * 30) + self.TOTAL_DAYS
-        total_hours = (total_days * 24) + self.TOTAL_HOURS
-        return total_hours * 3600
-    
-    def _calculate_total_target_miles(self) -> float:
-        """Calculate total miles for Forrest's journey"""
-        total_hours = self.total_target_seconds / 3600
-        return total_hours * self.SPEED_MPH
-    
-    def start_session(self) -> str:
-        """Start a new running session"""
-        if self.current_session:
-            raise ValueError("Session already active")
-        
-        session_id = datetime.datetime.now().isoformat()
-        self.current_session = Session(
-            session_id=session_id,
-            start_time=datetime.datetime.now()
-        )
-        return session_id
-    
-    def add_break(self, minutes: int, seconds: int) -> None:
-        """Add break time to current session"""
-        if not self.current_session:
-            raise ValueError("No active session")
-        
-        break_seconds = minutes * 60 + seconds
-        break_data = {
-            "minutes": minutes,
-            "seconds": seconds,
-            "total_seconds": break_seconds,
-            "timestamp": datetime.datetime.now().isoformat()
-        }
-        
-        self.current_session.breaks.append(break_data)
-        self.current_session.total_break_time += break_seconds
-    
-    def stop_session(self) -> Dict:
-        """Stop current session and calculate final statistics"""
-        if not self.current_session:
-            raise ValueError("No active session")
-        
-        # Set end time
-        self.current_session.end_time = datetime.datetime.now()
-        
-        # Calculate session statistics
-        total_duration = (self.current_session.end_time - self.current_session.start_time).total_seconds()
-        self.current_session.running_time = total_duration - self.current_session.total_break_time
-        
-        # Calculate distance and calories
-        running_hours = self.current_session.running_time / 3600
-        self.current_session.distance_miles = running_hours * self.SPEED_MPH
-        self.current_session.calories = int(self.current_session.distance_miles * 100)  # ~100 cal/mile
-        
-        # Save session
-        self._save_session(self.current_session)
-        
-        # Prepare return data
-        session_data = {
-            "session_id": self.current_session.session_id,
-            "total_duration": total_duration,
-            "running_time": self.current_session.running_time,
-            "break_time": self.current_session.total_break_time,
-            "distance_miles": self.current_session.distance_miles,
-            "calories": self.current_session.calories,
-            "breaks_count": len(self.current_session.breaks)
-        }
-        
-        # Clear current session
-        self.current_session = None
-        
-        return session_data
-    
-    def get_session_stats(self) -> Dict:
-        """Get real-time stats for current session"""
-        if not self.current_session:
-            return {"error": "No active session"}
-        
-        current_time = datetime.datetime.now()
-        total_duration = (current_time - self.current_session.start_time).total_seconds()
-        running_time = total_duration - self.current_session.total_break_time
-        
-        # Calculate current distance
-        running_hours = running_time / 3600
-        current_distance = running_hours * self.SPEED_MPH
-        current_calories = int(current_distance * 100)
-        
-        return {
-            "session_time": int(total_duration),
-            "running_time": int(running_time),
-            "break_time": self.current_session.total_break_time,
-            "distance_miles": current_distance,
-            "calories": current_calories,
-            "breaks_count": len(self.current_session.breaks)
-        }
-    
-    def get_overall_progress(self) -> Dict:
-        """Get overall progress toward Forrest's goal"""
-        sessions = self.load_all_sessions()
-        
-        total_running_time = sum(session.get("running_time", 0) for session in sessions)
-        total_distance = sum(session.get("distance_miles", 0) for session in sessions)
-        total_sessions = len(sessions)
-        
-        # Calculate progress percentages
-        time_progress = (total_running_time / self.total_target_seconds) * 100
-        distance_progress = (total_distance / self.total_target_miles) * 100
-        
-        # Calculate estimated completion
-        if total_running_time > 0:
-            avg_session_time = total_running_time / max(total_sessions, 1)
-            remaining_time = self.total_target_seconds - total_running_time
-            estimated_sessions_remaining = remaining_time / avg_session_time if avg_session_time > 0 else 0
-        else:
-            estimated_sessions_remaining = 0
-        
-        return {
-            "total_sessions": total_sessions,
-            "total_running_time": total_running_time,
-            "total_distance": total_distance,
-            "target_time": self.total_target_seconds,
-            "target_distance": self.total_target_miles,
-            "time_progress_percent": time_progress,
-            "distance_progress_percent": distance_progress,
-            "estimated_sessions_remaining": estimated_sessions_remaining,
-            "time_remaining": self.total_target_seconds - total_running_time,
-            "distance_remaining": self.total_target_miles - total_distance
-        }
-    
-    def get_monthly_data(self, year: int, month: int) -> Dict:
-        """Get aggregated data for a specific month"""
-        sessions = self.load_all_sessions()
-        monthly_sessions = []
-        
-        for session in sessions:
-            session_date = datetime.datetime.fromisoformat(session["start_time"])
-            if session_date.year == year and session_date.month == month:
-                monthly_sessions.append(session)
-        
-        if not monthly_sessions:
-            return {
-                "year": year,
-                "month": month,
-                "sessions": [],
-                "total_distance": 0,
-                "total_time": 0,
-                "total_sessions": 0,
-                "daily_averages": {}
-            }
-        
-        # Calculate daily aggregations
-        daily_data = {}
-        for session in monthly_sessions:
-            session_date = datetime.datetime.fromisoformat(session["start_time"]).date()
-            day_key = session_date.day
-            
-            if day_key not in daily_data:
-                daily_data[day_key] = {
-                    "distance": 0,
-                    "time": 0,
-                    "sessions": 0,
-                    "calories": 0
-                }
-            
-            daily_data[day_key]["distance"] += session.get("distance_miles", 0)
-            daily_data[day_key]["time"] += session.get("running_time", 0)
-            daily_data[day_key]["sessions"] += 1
-            daily_data[day_key]["calories"] += session.get("calories", 0)
-        
-        total_distance = sum(session.get("distance_miles", 0) for session in monthly_sessions)
-        total_time = sum(session.get("running_time", 0) for session in monthly_sessions)
-        
-        return {
-            "year": year,
-            "month": month,
-            "sessions": monthly_sessions,
-            "total_distance": total_distance,
-            "total_time": total_time,
-            "total_sessions": len(monthly_sessions),
-            "daily_data": daily_data
-        }
-    
-    def _save_session(self, session: Session) -> None:
-        """Save session to JSON file"""
-        sessions = self.load_all_sessions()
-        
-        # Convert session to dict
-        session_dict = {
-            "session_id": session.session_id,
-            "start_time": session.start_time.isoformat(),
-            "end_time": session.end_time.isoformat() if session.end_time else None,
-            "breaks": session.breaks,
-            "total_break_time": session.total_break_time,
-            "running_time": session.running_time,
-            "distance_miles": session.distance_miles,
-            "calories": session.calories
-        }
-        
-        sessions.append(session_dict)
-        
-        # Save to file
-        with open(self.sessions_file, 'w') as f:
-            json.dump(sessions, f, indent=2)
-    
-    def load_all_sessions(self) -> List[Dict]:
-        """Load all sessions from JSON file"""
-        if not os.path.exists(self.sessions_file):
-            return []
-        
-        try:
-            with open(self.sessions_file, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            return []
-    
-    def format_time(self, seconds: int) -> str:
-        """Format seconds into HH:MM:SS"""
-        hours = seconds // 3600
-        minutes = (seconds % 3600) // 60
-        secs = seconds % 60
-        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
-    
-    def format_duration(self, seconds: int) -> str:
-        """Format seconds into human-readable duration"""
-        if seconds < 60:
-            return f"{seconds} seconds"
-        elif seconds < 3600:
-            minutes = seconds // 60
-            return f"{minutes} minutes"
-        else:
-            hours = seconds // 3600
-            minutes = (seconds % 3600) // 60
-            return f"{hours} hours, {minutes} minutes"
-
-# Global timer instance
-timer = ForrestGumpTimer()
+"""
+Forrest Gump Timer - Core Module
+Handles timer calculations and data management
+"""
+
+import base64
+import json
+import math
+import re
+import time
+import datetime
+import functools
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import os
+
+from session_records import Session, Break, session_to_record, session_from_record
+from session_storage import (SessionStorage, JsonLinesSessionStorage, CachedSessionStorage,
+                             create_storage)
+from session_archive import SessionArchive, SessionColumns
+from session_journal import SessionJournal
+from session_snapshot import SessionIndex
+from session_stream import SessionBroadcaster
+from session_lock import ProcessLock
+from session_cache import AggregateCache
+from session_range import DailyPrefixSums, bucket_boundaries
+from session_training import training_load
+from session_sketch import QuantileSketch, DEFAULT_QUANTILES, parse_month, percentile_summary
+import session_aggregate
+from session_aggregate import SessionAggregator
+
+def _synchronized(method):
+    """Run a ForrestGumpTimer method under that timer's own lock
+    
+    For a shared timer the lock is also held across processes, and the
+    active session is reloaded from the journal first if another process
+    changed it.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            if self.process_lock is None:
+                return method(self, *args, **kwargs)
+            with self.process_lock:
+                self._sync_shared_state()
+                try:
+                    return method(self, *args, **kwargs)
+                finally:
+                    self._journal_signature = self.journal.signature()
+    return wrapper
+
+class ForrestGumpTimer:
+    """Main timer class for tracking Forrest Gump's epic journey"""
+    
+    # Forrest's journey constants
+    TOTAL_YEARS = 3
+    TOTAL_MONTHS = 2
+    TOTAL_DAYS = 14
+    TOTAL_HOURS = 16
+    SPEED_MPH = 2.4
+    
+    # Largest list of operations apply_batch accepts in one call
+    MAX_BATCH_OPERATIONS = 1000
+    
+    # Sessions decoded per storage read in load_sessions()
+    LOAD_PAGE_SESSIONS = 5000
+    
+    def __init__(self, data_dir: str = "data", storage: Union[str, SessionStorage] = "partitioned",
+                 fsync_interval: float = 1.0, heartbeat_interval: float = 30.0, shared: bool = False,
+                 aggregate_cache: Optional[AggregateCache] = None):
+        """Initialize the timer with data directory and storage backend
+        
+        fsync_interval and heartbeat_interval tune the active-session journal:
+        at most one fsync per fsync_interval seconds, and a heartbeat event
+        every heartbeat_interval seconds while a session is running.
+        
+        shared=True is for several processes serving the same data directory
+        (e.g. the workers of a pre-fork server): session changes are
+        serialized by a lock file and the running session lives in the
+        journal, which every process reloads when another one has changed it.
+        
+        aggregate_cache holds computed month/range aggregates; pass one
+        instance to every runner's timer to bound them all together.
+        """
+        self.data_dir = data_dir
+        self.current_session = None
+        self.recovered_last_seen = None
+        
+        # Serializes changes to this timer's active session; each runner has its own
+        self.lock = threading.RLock()
+        self.sessions_file = os.path.join(data_dir, "sessions.json")
+        
+        # Create data directory if it doesn't exist
+        os.makedirs(data_dir, exist_ok=True)
+        
+        # Live stats pushed to stream subscribers (one computation per tick for all of them)
+        self.events = SessionBroadcaster(self)
+        
+        # Computed aggregates, keyed by this runner's data directory; set up
+        # before storage, since recovering a stopped session writes through it
+        self.aggregate_cache = aggregate_cache if aggregate_cache is not None else AggregateCache()
+        self._cache_runner = os.path.abspath(data_dir)
+        
+        # Held by every timer on this data directory, shared or not, around each
+        # storage write, so no other process's write lands inside one of ours
+        self.write_lock = ProcessLock(os.path.join(data_dir, "storage.lock"))
+        
+        # Cross-process lock for shared timers, held around every session change
+        self.process_lock = ProcessLock(os.path.join(data_dir, "active_session.lock")) if shared else None
+        self._journal_signature = None
+        if self.process_lock is not None:
+            self.process_lock.acquire()
+        try:
+            self._open_storage(data_dir, storage, fsync_interval, heartbeat_interval)
+        finally:
+            if self.process_lock is not None:
+                self.process_lock.release()
+        
+        # Calculate total target time and distance
+        self.total_target_seconds = self._calculate_total_target_seconds()
+        self.total_target_miles = self._calculate_total_target_miles()
+    
+    def _open_storage(self, data_dir: str, storage: Union[str, SessionStorage],
+                      fsync_interval: float, heartbeat_interval: float) -> None:
+        """Set up storage, index, archive and journal (migrating and recovering as needed)"""
+        
+        # Storage backend for finished sessions ("partitioned", "ndjson", "sqlite" or an instance)
+        if isinstance(storage, str):
+            storage = create_storage(storage, data_dir)
+        self.storage = storage
+        
+        # Move any earlier history into the chosen backend
+        self._migrate_legacy_sessions()
+        
+        # Serve repeat reads from memory until the data changes on disk
+        self.storage = CachedSessionStorage(self.storage)
+        
+        # Session-id index and per-day totals: loaded from the latest snapshot
+        # plus the log tail on first use, never by re-reading all history
+        self.index = SessionIndex(self.storage, os.path.join(data_dir, "snapshot.json"))
+        self._index_version = None
+        
+        # Prefix sums over the index's per-day totals, rebuilt when the data changes
+        self._prefix_sums: Optional[DailyPrefixSums] = None
+        self._prefix_sums_version = None
+        
+        # Columnar copy of finished sessions, created on first use by get_session_columns()
+        self.archive = SessionArchive(os.path.join(data_dir, "archive"))
+        
+        # Write-ahead journal of the running session; pick up any session a
+        # previous process left open
+        self.journal = SessionJournal(os.path.join(data_dir, "active_session.journal"),
+                                      fsync_interval, heartbeat_interval)
+        self._recover_active_session()
+        self._journal_signature = self.journal.signature()
+    
+    def _calculate_total_target_seconds(self) -> int:
+        """Calculate total seconds for Forrest's journey"""
+        total_days = (self.TOTAL_YEARS * 365) + (self.TOTAL_MONTHS * 30) + self.TOTAL_DAYS
+        total_hours = (total_days * 24) + self.TOTAL_HOURS
+        return total_hours * 3600
+    
+    def _calculate_total_target_miles(self) -> float:
+        """Calculate total miles for Forrest's journey"""
+        total_hours = self.total_target_seconds / 3600
+        return total_hours * self.SPEED_MPH
+    
+    @_synchronized
+    def start_session(self, timestamp: Optional[float] = None) -> str:
+        """Start a new running session (now, or at a client-supplied epoch time)"""
+        session = self._begin_session(time.time() if timestamp is None else timestamp)
+        self.journal.record_start(session)
+        self.events.publish("start", {"session_id": session.session_id})
+        return session.session_id
+    
+    @_synchronized
+    def add_break(self, minutes: int, seconds: int, timestamp: Optional[float] = None) -> None:
+        """Add break time to current session"""
+        break_data = self._record_break(minutes, seconds, time.time() if timestamp is None else timestamp)
+        self.journal.record_break(break_data)
+        self.events.publish("break", {
+            "minutes": minutes,
+            "seconds": seconds,
+            "breaks_count": len(self.current_session.breaks)
+        })
+    
+    @_synchronized
+    def stop_session(self, timestamp: Optional[float] = None) -> Dict:
+        """Stop current session and calculate final statistics"""
+        session_data = self._finish_session(time.time() if timestamp is None else timestamp)
+        
+        # Save session
+        self._save_session(self.current_session)
+        
+        # Clear current session
+        self.current_session = None
+        self.events.publish("stop", session_data)
+        
+        return session_data
+    
+    @_synchronized
+    def apply_batch(self, operations: List[Dict]) -> List[Dict]:
+        """Apply an ordered list of timer operations recorded by an offline client
+        
+        Each operation is {"op": "start" | "break" | "stop", "timestamp": ...}
+        (plus "minutes" and "seconds" for a break); timestamps are epoch
+        seconds or ISO strings and default to now. Operations are applied in
+        order and each gets its own result, so one bad operation does not
+        undo the others; but when a start fails, the breaks and stop that
+        follow it belong to that session and are skipped rather than applied
+        to whatever session is open. Every session finished by the batch is
+        written in a single storage commit; a stop whose session is already
+        stored (a batch sent again after a lost response) is reported as a
+        duplicate and not stored twice.
+        """
+        if not isinstance(operations, list):
+            raise ValueError("Expected a list of operations")
+        if len(operations) > self.MAX_BATCH_OPERATIONS:
+            raise ValueError(f"At most {self.MAX_BATCH_OPERATIONS} operations per batch")
+        
+        open_before = self.current_session
+        breaks_before = len(open_before.breaks) if open_before else 0
+        finished: List[Dict] = []
+        events = []
+        results = []
+        start_failed = False
+        for operation in operations:
+            op = operation.get("op") if isinstance(operation, dict) else None
+            if start_failed and op in ("break", "stop"):
+                result = {"success": False, "error": "Skipped: the start of this session failed"}
+                start_failed = op == "break"
+            else:
+                try:
+                    result = self._apply_operation(operation, finished, events)
+                except (ValueError, TypeError, KeyError) as e:
+                    result = {"success": False, "error": str(e)}
+                if op == "start":
+                    start_failed = not result["success"]
+            results.append({"op": op, **result})
+        
+        if finished:
+            self._store_records(finished)
+        
+        # Bring the journal in line with whatever session the batch left open
+        session = self.current_session
+        if session is None:
+            if open_before is not None or finished:
+                self.journal.clear()
+        elif session is not open_before:
+            self.journal.record_start(session)
+            for break_data in session.breaks:
+                self.journal.record_break(break_data)
+        else:
+            for break_data in session.breaks[breaks_before:]:
+                self.journal.record_break(break_data)
+        
+        for event, data in events:
+            self.events.publish(event, data)
+        return results
+    
+    def _apply_operation(self, operation: Dict, finished: List[Dict], events: List) -> Dict:
+        if not isinstance(operation, dict) or "op" not in operation:
+            raise ValueError("Each operation must be an object with an \"op\"")
+        op = operation["op"]
+        timestamp = _parse_timestamp(operation.get("timestamp"))
+        if op == "start":
+            session = self._begin_session(timestamp)
+            events.append(("start", {"session_id": session.session_id}))
+            return {"success": True, "session_id": session.session_id}
+        if op == "break":
+            minutes = int(operation.get("minutes", 0))
+            seconds = int(operation.get("seconds", 0))
+            self._record_break(minutes, seconds, timestamp)
+            events.append(("break", {
+                "minutes": minutes,
+                "seconds": seconds,
+                "breaks_count": len(self.current_session.breaks)
+            }))
+            return {"success": True, "breaks_count": len(self.current_session.breaks)}
+        if op == "stop":
+            session_data = self._finish_session(timestamp)
+            session_id = session_data["session_id"]
+            duplicate = (self.has_session(session_id)
+                         or any(record["session_id"] == session_id for record in finished))
+            if not duplicate:
+                finished.append(session_to_record(self.current_session))
+                events.append(("stop", session_data))
+            self.current_session = None
+            return {"success": True, "data": session_data, "duplicate": duplicate}
+        raise ValueError(f"Unknown operation: {op}")
+    
+    def _begin_session(self, start_ts: float) -> Session:
+        if self.current_session:
+            raise ValueError("Session already active")
+        
+        session_id = datetime.datetime.fromtimestamp(start_ts).isoformat()
+        self.current_session = Session(session_id, start_ts)
+        return self.current_session
+    
+    def _record_break(self, minutes: int, seconds: int, timestamp: float) -> Break:
+        if not self.current_session:
+            raise ValueError("No active session")
+        if timestamp < self.current_session.start_ts:
+            raise ValueError("Break time is before the session start")
+        
+        break_data = Break(minutes, seconds, timestamp)
+        
+        self.current_session.breaks.append(break_data)
+        self.current_session.total_break_time += break_data.total_seconds
+        return break_data
+    
+    def _finish_session(self, end_ts: float) -> Dict:
+        """Fill in the current session's end time and statistics; returns the summary"""
+        if not self.current_session:
+            raise ValueError("No active session")
+        if end_ts < self.current_session.start_ts:
+            raise ValueError("Stop time is before the session start")
+        if any(end_ts < break_data.timestamp for break_data in self.current_session.breaks):
+            raise ValueError("Stop time is before a break")
+        
+        # Set end time
+        self.current_session.end_ts = end_ts
+        
+        # Calculate session statistics
+        total_duration = self.current_session.end_ts - self.current_session.start_ts
+        self.current_session.running_time = total_duration - self.current_session.total_break_time
+        
+        # Calculate distance and calories
+        running_hours = self.current_session.running_time / 3600
+        self.current_session.distance_miles = running_hours * self.SPEED_MPH
+        self.current_session.calories = int(self.current_session.distance_miles * 100)  # ~100 cal/mile
+        
+        # Prepare return data
+        return {
+            "session_id": self.current_session.session_id,
+            "total_duration": total_duration,
+            "running_time": self.current_session.running_time,
+            "break_time": self.current_session.total_break_time,
+            "distance_miles": self.current_session.distance_miles,
+            "calories": self.current_session.calories,
+            "breaks_count": len(self.current_session.breaks)
+        }
+    
+    @_synchronized
+    def get_session_stats(self) -> Dict:
+        """Get real-time stats for current session"""
+        if not self.current_session:
+            return {"error": "No active session"}
+        
+        total_duration = time.time() - self.current_session.start_ts
+        running_time = total_duration - self.current_session.total_break_time
+        
+        # Calculate current distance
+        running_hours = running_time / 3600
+        current_distance = running_hours * self.SPEED_MPH
+        current_calories = int(current_distance * 100)
+        
+        return {
+            "session_time": int(total_duration),
+            "running_time": int(running_time),
+            "break_time": self.current_session.total_break_time,
+            "distance_miles": current_distance,
+            "calories": current_calories,
+            "breaks_count": len(self.current_session.breaks)
+        }
+    
+    def get_overall_progress(self, verify: bool = False) -> Dict:
+        """Get overall progress toward Forrest's goal
+        
+        Totals are maintained incrementally by the storage backend, and the
+        rolling training load and completion forecast by the session index,
+        so no stored session is reread. The index does first catch up on
+        the log tail written since its last use (see get_session_index),
+        which costs time in the number of new sessions, usually none. With
+        verify=True the totals are first recomputed from every stored
+        session (see verify_totals).
+        """
+        if verify:
+            totals = self.verify_totals()["totals"]
+        else:
+            totals = self.storage.get_totals()
+        
+        total_running_time = totals["total_running_time"]
+        total_distance = totals["total_distance"]
+        total_sessions = totals["total_sessions"]
+        
+        # Calculate progress percentages
+        time_progress = (total_running_time / self.total_target_seconds) * 100
+        distance_progress = (total_distance / self.total_target_miles) * 100
+        
+        return {
+            "total_sessions": total_sessions,
+            "total_running_time": total_running_time,
+            "total_distance": total_distance,
+            "total_calories": totals["total_calories"],
+            "total_breaks": totals["total_breaks"],
+            "total_break_time": totals["total_break_time"],
+            "target_time": self.total_target_seconds,
+            "target_distance": self.total_target_miles,
+            "time_progress_percent": time_progress,
+            "distance_progress_percent": distance_progress,
+            "time_remaining": self.total_target_seconds - total_running_time,
+            "distance_remaining": self.total_target_miles - total_distance,
+            "training_load": self.get_training_load(),
+            "forecast": self.get_completion_forecast(total_distance)
+        }
+    
+    def get_completion_forecast(self, total_distance: Optional[float] = None,
+                                today: Optional[datetime.date] = None) -> Dict:
+        """Projected date Forrest's total distance is reached, with 90% bounds
+        
+        Based on an exponentially weighted daily mileage (28-day half-life),
+        its spread and the recent linear trend of daily mileage, all kept
+        online by the session index; see CompletionForecaster.forecast().
+        """
+        today = today or datetime.date.today()
+        if total_distance is None:
+            total_distance = self.storage.get_totals()["total_distance"]
+        return self.get_session_index().forecast(self.total_target_miles - total_distance, today)
+    
+    def get_training_load(self, today: Optional[datetime.date] = None) -> Dict:
+        """Rolling 7/28/365-day mileage and acute/chronic load up to today
+        
+        Read from ring buffers of daily totals that the session index updates
+        as sessions are stored, so the cost does not grow with the history.
+        """
+        today = today or datetime.date.today()
+        windows = self.get_session_index().rolling_totals(today.toordinal())
+        return training_load(windows, today)
+    
+    def get_monthly_totals(self) -> Dict[str, Dict]:
+        """Totals for every month with sessions, keyed "YYYY-MM"
+        
+        Served from the partition manifest, so multi-month views never open
+        the session data itself.
+        """
+        return self.storage.get_monthly_totals()
+    
+    def verify_totals(self) -> Dict:
+        """Recompute the running totals from scratch and report any drift
+        
+        The recomputed totals replace the persisted ones, so drift is repaired
+        as a side effect. Float sums are compared with a small tolerance.
+        """
+        stored = self.storage.get_totals()
+        recomputed = self.storage.rebuild_totals()
+        
+        drift = {}
+        for key, value in recomputed.items():
+            if not math.isclose(stored.get(key, 0), value, rel_tol=1e-9, abs_tol=1e-6):
+                drift[key] = value - stored.get(key, 0)
+        
+        return {
+            "consistent": not drift,
+            "drift": drift,
+            "totals": recomputed
+        }
+    
+    def get_monthly_data(self, year: int, month: int) -> Dict:
+        """Get aggregated data for a specific month
+        
+        Served from the aggregate cache until a session in that month is
+        stored; the result is shared and must not be mutated.
+        """
+        month_start = datetime.datetime(year, month, 1)
+        if month == 12:
+            month_end = datetime.datetime(year + 1, 1, 1)
+        else:
+            month_end = datetime.datetime(year, month + 1, 1)
+        
+        return self._cached_aggregate("month", month_start, month_end,
+                                      lambda: self._compute_monthly_data(year, month, month_start, month_end))
+    
+    def get_range_data(self, start: Union[datetime.date, str], end: Optional[Union[datetime.date, str]] = None,
+                       granularity: str = "day") -> Dict:
+        """Totals and a bucketed series for sessions starting in [start, end)
+        
+        start and end are dates (or ISO date strings); end defaults to
+        tomorrow, so the range runs through today. granularity is "day",
+        "week", "month" or "year". Answered from day-level prefix sums: the
+        totals cost two lookups, the series one lookup per bucket. Raises
+        ValueError for a missing start, a bad range or granularity.
+        """
+        if start is None:
+            raise ValueError("Missing start date (YYYY-MM-DD)")
+        start = _parse_date(start)
+        end = datetime.date.today() + datetime.timedelta(days=1) if end is None else _parse_date(end)
+        boundaries = bucket_boundaries(start, end, granularity)
+        range_start = datetime.datetime.combine(start, datetime.time())
+        range_end = datetime.datetime.combine(end, datetime.time())
+        return self._cached_aggregate(f"range-{granularity}", range_start, range_end,
+                                      lambda: self._compute_range_data(boundaries, granularity))
+    
+    def get_monthly_sketches(self, start_month: Optional[str] = None,
+                             end_month: Optional[str] = None) -> Dict[str, Dict[str, QuantileSketch]]:
+        """Distance, duration and break quantile sketches per "YYYY-MM" month
+        
+        Maintained by the storage backend as sessions are stored; months are
+        limited to [start_month, end_month]. The sketches are copies and can
+        be merged across months and runners.
+        """
+        return self.storage.get_monthly_sketches(parse_month(start_month), parse_month(end_month))
+    
+    def get_percentiles(self, start_month: Optional[str] = None, end_month: Optional[str] = None,
+                        quantiles: Tuple[float, ...] = DEFAULT_QUANTILES, by_month: bool = False) -> Dict:
+        """Quantiles of session distance, duration and break length over a range of months
+        
+        Merged from the monthly sketches (no session is read or sorted) and
+        served from the aggregate cache until a session in the range is
+        stored. Raises ValueError for a month that is not "YYYY-MM".
+        """
+        start_month, end_month = parse_month(start_month), parse_month(end_month)
+        range_start = datetime.datetime.strptime(start_month, "%Y-%m") if start_month else datetime.datetime.min
+        if end_month:
+            year, month = map(int, end_month.split("-"))
+            range_end = datetime.datetime(year + 1, 1, 1) if month == 12 else datetime.datetime(year, month + 1, 1)
+        else:
+            range_end = datetime.datetime.max
+        
+        def compute() -> Dict:
+            result = percentile_summary([self.get_monthly_sketches(start_month, end_month)], quantiles, by_month)
+            return {"start_month": start_month, "end_month": end_month, **result}
+        
+        return self._cached_aggregate(f"percentiles-{quantiles}-{by_month}", range_start, range_end, compute)
+    
+    def _compute_range_data(self, boundaries: List[datetime.date], granularity: str) -> Dict:
+        prefix_sums = self.get_daily_prefix_sums()
+        ordinals = [day.toordinal() for day in boundaries]
+        distance, time_total, sessions, calories = prefix_sums.totals(ordinals[0], ordinals[-1])
+        return {
+            "start": boundaries[0].isoformat(),
+            "end": boundaries[-1].isoformat(),
+            "granularity": granularity,
+            "total_distance": distance,
+            "total_time": time_total,
+            "total_sessions": sessions,
+            "total_calories": calories,
+            "buckets": [
+                {"start": bucket_start.isoformat(), "distance": values[0], "time": values[1],
+                 "sessions": values[2], "calories": values[3]}
+                for bucket_start, values in zip(boundaries, prefix_sums.series(ordinals))
+            ]
+        }
+    
+    def get_daily_prefix_sums(self) -> DailyPrefixSums:
+        """Prefix sums of the per-day totals, current with the stored sessions"""
+        index = self.get_session_index()
+        version = self._index_version
+        prefix_sums = self._prefix_sums
+        if prefix_sums is None or self._prefix_sums_version != version:
+            prefix_sums = DailyPrefixSums(index.daily_totals())
+            self._prefix_sums, self._prefix_sums_version = prefix_sums, version
+        return prefix_sums
+    
+    def _cached_aggregate(self, name: str, start: datetime.datetime, end: datetime.datetime,
+                          compute) -> Dict:
+        """Aggregate over sessions starting in [start, end), through the aggregate cache"""
+        return self.aggregate_cache.get(self._cache_runner, (name, start, end),
+                                        self.storage.refresh(), compute)
+    
+    def _compute_monthly_data(self, year: int, month: int, month_start: datetime.datetime,
+                              month_end: datetime.datetime) -> Dict:
+        # Only the requested month is read from storage
+        monthly_sessions = self.storage.load_range(month_start, month_end)
+        
+        if not monthly_sessions:
+            return {
+                "year": year,
+                "month": month,
+                "sessions": [],
+                "total_distance": 0,
+                "total_time": 0,
+                "total_sessions": 0,
+                "daily_averages": {}
+            }
+        
+        # Calculate daily aggregations (vectorized over the month's rows when numpy is installed)
+        if session_aggregate.available():
+            aggregator = SessionAggregator.from_sessions(monthly_sessions)
+            first_day, end_day = month_start.toordinal(), month_end.toordinal()
+            daily_data = {day.day: values for day, values in aggregator.daily_totals(first_day, end_day).items()}
+            totals = aggregator.totals()
+        else:
+            daily_data = self.storage.get_daily_totals(month_start, month_end)
+            totals = self.storage.get_range_totals(month_start, month_end)
+        total_distance = totals["total_distance"]
+        total_time = totals["total_running_time"]
+        
+        return {
+            "year": year,
+            "month": month,
+            "sessions": monthly_sessions,
+            "total_distance": total_distance,
+            "total_time": total_time,
+            "total_sessions": len(monthly_sessions),
+            "daily_data": daily_data
+        }
+    
+    def _save_session(self, session: Session) -> None:
+        """Persist a finished session through the storage backend"""
+        session_dict = session_to_record(session)
+        
+        # Journal the finished record first so a crash mid-write is recoverable
+        self.journal.record_stop(session_dict)
+        self._store_records([session_dict])
+        self.journal.clear()
+    
+    @_synchronized
+    def import_records(self, session_dicts: Iterable[Dict]) -> None:
+        """Store finished sessions from a bulk import in one storage commit
+        
+        session_dicts may be a lazy iterator; the backends write it a chunk at
+        a time. The columnar archive is rebuilt on its next use rather than
+        appended to here.
+        """
+        with self.write_lock:
+            old_version = self.storage.refresh()
+            try:
+                self.storage.append_many(session_dicts)
+            finally:
+                # Too many sessions to match against cached periods one by one
+                self.aggregate_cache.written(self._cache_runner, None, old_version, self.storage.refresh())
+    
+    def _store_records(self, session_dicts: List[Dict]) -> None:
+        """Write finished sessions to storage in one commit
+        
+        Under the write lock, refresh() picks up whatever other processes
+        stored before us and nothing else can be stored until we are done, so
+        the version step from old_version is this write alone and the cached
+        periods it does not touch can be carried over.
+        """
+        with self.write_lock:
+            old_version = self.storage.refresh()
+            try:
+                self.storage.append_many(session_dicts)
+            finally:
+                # Only the cached periods holding the new sessions go stale
+                start_times = [datetime.datetime.fromisoformat(record["start_time"]) for record in session_dicts]
+                self.aggregate_cache.written(self._cache_runner, start_times, old_version, self.storage.refresh())
+        
+        # Keep the columnar archive in step once something has started using it
+        if self.archive.exists():
+            self.archive.append(session_dicts)
+    
+    def _recover_active_session(self) -> None:
+        """Restore the session a previous process was running when it died"""
+        recovered = self.journal.recover()
+        
+        finished = recovered["finished_record"]
+        if finished is not None:
+            # Stopped, but the process may have died before storage saw it
+            if not self.has_session(finished["session_id"]):
+                self._store_records([finished])
+            self.journal.clear()
+        elif recovered["session"] is not None and self.has_session(recovered["session"].session_id):
+            # Already stored by a batch whose journal update never happened
+            self.journal.clear()
+        elif recovered["session"] is not None:
+            self.current_session = recovered["session"]
+            self.recovered_last_seen = recovered["last_seen"]
+            self.journal.resume()
+        else:
+            self.current_session = None
+            self.journal.close()
+    
+    def _sync_shared_state(self) -> None:
+        """Reload the running session if another process changed the journal since we last saw it"""
+        if self.journal.signature() != self._journal_signature:
+            self._recover_active_session()
+    
+    def get_session_columns(self) -> SessionColumns:
+        """All finished sessions as memory-mapped column arrays
+        
+        Aggregations over large histories should use these instead of
+        load_all_sessions(): no per-session dicts are built. The archive is
+        (re)built from storage whenever its row count disagrees with the
+        stored session count.
+        """
+        if self.archive.count() != self.storage.get_totals()["total_sessions"]:
+            self.archive.rebuild(self.storage.load_all())
+        return self.archive.columns()
+    
+    def get_session_index(self) -> SessionIndex:
+        """Session index brought up to date with anything stored since it was last used"""
+        version = self.storage.refresh()
+        if version != self._index_version:
+            self.index.catch_up()
+            self._index_version = version
+        return self.index
+    
+    def has_session(self, session_id: str) -> bool:
+        """True if a session with this id is already stored"""
+        return session_id in self.get_session_index()
+    
+    def load_sessions(self) -> List[Session]:
+        """Load all sessions as Session records (epoch timestamps), in storage order
+        
+        Decoded page by page straight from the storage files rather than
+        from the cached dicts of load_all_sessions(), so only the slotted
+        records are kept: about a third of the memory of the dicts.
+        """
+        sessions: List[Session] = []
+        position = None
+        while True:
+            page, position = self.storage.read_page(position, self.LOAD_PAGE_SESSIONS)
+            sessions.extend(map(session_from_record, page))
+            if position is None:
+                return sessions
+    
+    def load_all_sessions(self) -> List[Dict]:
+        """Load all sessions from storage (cached until the data changes)"""
+        return self.storage.load_all()
+    
+    def read_sessions_page(self, cursor: Optional[str] = None,
+                           limit: int = 1000) -> Tuple[List[Dict], Optional[str]]:
+        """One page of stored sessions and the cursor for the next page (None at the end)
+        
+        Cursors are opaque URL-safe strings; pages come straight from the
+        storage files, so paging through everything keeps memory flat.
+        Raises ValueError for a malformed or stale cursor.
+        """
+        position = None
+        if cursor:
+            try:
+                position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            except (ValueError, TypeError):
+                raise ValueError("Invalid cursor")
+            if not isinstance(position, dict) or position.pop("backend", None) != self.storage.name:
+                raise ValueError("Invalid cursor")
+        
+        sessions, position = self.storage.read_page(position, max(1, limit))
+        if position is None:
+            return sessions, None
+        position["backend"] = self.storage.name
+        return sessions, base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+    
+    @property
+    def data_version(self) -> int:
+        """Counter that increases whenever the stored sessions change"""
+        return self.storage.refresh()
+    
+    @property
+    def data_tag(self) -> str:
+        """Fingerprint of the stored sessions (stat-based, same in every process)"""
+        return self.storage.tag()
+    
+    @property
+    def data_last_modified(self) -> Optional[float]:
+        """Epoch time of the latest write to the stored sessions, or None"""
+        return self.storage.last_modified()
+    
+    @property
+    def progress_tag(self) -> str:
+        """data_tag plus today's date: the rolling training-load windows move at midnight"""
+        return f"{self.storage.tag()}-{datetime.date.today().isoformat()}"
+    
+    @property
+    def progress_last_modified(self) -> float:
+        """Latest write to the stored sessions or the last local midnight, whichever is later"""
+        midnight = datetime.datetime.combine(datetime.date.today(), datetime.time()).timestamp()
+        return max(self.storage.last_modified() or 0, midnight)
+    
+    def _migrate_legacy_sessions(self) -> None:
+        """One-time import of older on-disk history into an empty storage backend"""
+        if not self.storage.is_empty():
+            return
+        
+        # A session log left by the ndjson backend, or the original JSON array
+        legacy_log = JsonLinesSessionStorage(self.data_dir)
+        if not isinstance(self.storage, JsonLinesSessionStorage) and not legacy_log.is_empty():
+            source_file = legacy_log.path
+            sessions = legacy_log.load_all()
+        elif os.path.exists(self.sessions_file):
+            source_file = self.sessions_file
+            try:
+                with open(self.sessions_file, 'r') as f:
+                    sessions = json.load(f)
+            except (json.JSONDecodeError, FileNotFoundError):
+                sessions = []
+        else:
+            return
+        
+        self.storage.append_many(sessions)
+        
+        # Keep the original around as a backup rather than deleting it
+        os.replace(source_file, source_file + ".migrated")
+    
+    def format_time(self, seconds: int) -> str:
+        """Format seconds into HH:MM:SS"""
+        hours = seconds // 3600
+        minutes = (seconds % 3600) // 60
+        secs = seconds % 60
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+    
+    def format_duration(self, seconds: int) -> str:
+        """Format seconds into human-readable duration"""
+        if seconds < 60:
+            return f"{seconds} seconds"
+        elif seconds < 3600:
+            minutes = seconds // 60
+            return f"{minutes} minutes"
+        else:
+            hours = seconds // 3600
+            minutes = (seconds % 3600) // 60
+            return f"{hours} hours, {minutes} minutes"
+
+def _parse_timestamp(value: Union[None, int, float, str]) -> float:
+    """Epoch seconds for a client timestamp (epoch number or ISO string); None means now"""
+    if value is None:
+        return time.time()
+    if isinstance(value, str):
+        return datetime.datetime.fromisoformat(value).timestamp()
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise TypeError(f"Invalid timestamp: {value!r}")
+    return float(value)
+
+def _parse_date(value: Union[datetime.date, str]) -> datetime.date:
+    """Date from a date, datetime or ISO string (a datetime keeps only its day)"""
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    if isinstance(value, str):
+        return datetime.date.fromisoformat(value[:10])
+    raise TypeError(f"Invalid date: {value!r}")
+
+class UnknownRunnerError(LookupError):
+    """A runner ID with no stored data, asked for without create=True"""
+
+
+class RunnerRegistry:
+    """ForrestGumpTimer per runner ID, for one server shared by a group of runners
+    
+    Each runner gets its own timer under data/runners/<runner_id>/, so
+    histories, totals, journals and indexes never mix, and each timer's lock
+    only serializes calls for that runner. The registry lock is taken only
+    the first time a runner ID is seen. The default runner is the plain
+    single-runner timer living directly in the data directory.
+    """
+    
+    DEFAULT_RUNNER = "default"
+    RUNNER_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+    
+    def __init__(self, data_dir: str = "data", default_timer: Optional[ForrestGumpTimer] = None,
+                 **timer_options):
+        self.data_dir = data_dir
+        self.timer_options = timer_options
+        self._lock = threading.Lock()
+        self._timers: Dict[str, ForrestGumpTimer] = {}
+        if default_timer is not None:
+            self._timers[self.DEFAULT_RUNNER] = default_timer
+    
+    def get(self, runner_id: Optional[str] = None, create: bool = False) -> ForrestGumpTimer:
+        """Timer for a runner, loaded on first use
+        
+        A runner without a data directory is only set up with create=True
+        (starting a session, importing); otherwise UnknownRunnerError is
+        raised, so reads for made-up IDs leave nothing on disk or in memory.
+        The default runner always exists.
+        """
+        runner_id = runner_id or self.DEFAULT_RUNNER
+        runner_timer = self._timers.get(runner_id)
+        if runner_timer is not None:
+            return runner_timer
+        
+        if not self.RUNNER_ID_PATTERN.match(runner_id):
+            raise ValueError(f"Invalid runner ID: {runner_id!r}")
+        if not create and runner_id != self.DEFAULT_RUNNER and not os.path.isdir(self.runner_dir(runner_id)):
+            raise UnknownRunnerError(f"Unknown runner: {runner_id}")
+        with self._lock:
+            if runner_id not in self._timers:
+                self._timers[runner_id] = ForrestGumpTimer(self.runner_dir(runner_id), **self.timer_options)
+            return self._timers[runner_id]
+    
+    def runner_dir(self, runner_id: str) -> str:
+        if runner_id == self.DEFAULT_RUNNER:
+            return self.data_dir
+        return os.path.join(self.data_dir, "runners", runner_id)
+    
+    def runner_ids(self) -> List[str]:
+        """Runners with stored data or an active timer
+        
+        Entries under runners/ that are not valid runner IDs (stray files,
+        editor backups) are skipped, as get() would refuse them.
+        """
+        runners_dir = os.path.join(self.data_dir, "runners")
+        on_disk = [name for name in (os.listdir(runners_dir) if os.path.isdir(runners_dir) else [])
+                   if self.RUNNER_ID_PATTERN.match(name)]
+        return sorted(set(self._timers) | set(on_disk) | {self.DEFAULT_RUNNER})
+    
+    def get_percentiles(self, runner_ids: Optional[List[str]] = None, start_month: Optional[str] = None,
+                        end_month: Optional[str] = None, quantiles: Tuple[float, ...] = DEFAULT_QUANTILES,
+                        by_month: bool = False) -> Dict:
+        """ForrestGumpTimer.get_percentiles() over several runners (all known runners if None)
+        
+        Each runner's monthly sketches are merged, so the quantiles are those
+        of all their sessions together.
+        """
+        runner_ids = self.runner_ids() if runner_ids is None else runner_ids
+        start_month, end_month = parse_month(start_month), parse_month(end_month)
+        monthly_groups = [self.get(runner_id).get_monthly_sketches(start_month, end_month)
+                          for runner_id in runner_ids]
+        return {"runners": runner_ids, "start_month": start_month, "end_month": end_month,
+                **percentile_summary(monthly_groups, quantiles, by_month)}
+    
+    def active_sessions(self) -> Dict[str, Dict]:
+        """Live stats for every runner currently running"""
+        runner_ids = list(self._timers)
+        if self.timer_options.get("shared"):
+            # Another worker may have started a runner this process has not loaded yet
+            runner_ids += [runner_id for runner_id in self.runner_ids()
+                           if runner_id not in self._timers and os.path.exists(
+                               os.path.join(self.runner_dir(runner_id), "active_session.journal"))]
+        active = {}
+        for runner_id in runner_ids:
+            stats = self.get(runner_id).get_session_stats()
+            if "error" not in stats:
+                active[runner_id] = stats
+        return active
+
+# Set FORREST_MULTIPROCESS=1 when several server processes share the data
+# directory (gunicorn -w N, uvicorn --workers N)
+SHARED_STATE = os.environ.get("FORREST_MULTIPROCESS", "") not in ("", "0")
+
+# Global timer instance (the default runner) and the registry for named runners,
+# sharing one aggregate cache. Both are created on first access, so tools that
+# only use the classes (session_import, session_archive) never touch ./data
+aggregate_cache = AggregateCache()
+_globals_lock = threading.Lock()
+
+def __getattr__(name: str):
+    if name not in ("timer", "runners"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _globals_lock:
+        if "runners" not in globals():
+            default_timer = ForrestGumpTimer(shared=SHARED_STATE, aggregate_cache=aggregate_cache)
+            globals()["timer"] = default_timer
+            globals()["runners"] = RunnerRegistry(default_timer=default_timer, shared=SHARED_STATE,
+                                                  aggregate_cache=aggregate_cache)
+    return globals()[name]
@@ -1,78 +1,79 @@
-"""
-Google Drive Sync for Forrest Gump Timer
-Syncs local session data with Google Drive
-"""
-
-import os
-import json
-from datetime import datetime
-import sys
-
-# Simple Google Drive sync functionality
-# This is a placeholder - full implementation would require Google API setup
-
-class GoogleDriveSync:
-    def __init__(self):
-        self.credentials_file = "google_credentials.json"
-        self.sync_folder = "ForrestGumpTimer"
-        
-    def check_credentials(self):
-        """Check if Google Drive credentials are available"""
-        if not os.path.exists(self.credentials_file):
-            print("❌ Google Drive credentials not found")
-            print("📋 To setup Google Drive sync:")
-            print("1. Go to Google Cloud Console")
-            print("2. Enable Google Drive API")
-            print("3. Create credentials and download as 'google_credentials.json'")
-            print("4. Place in project directory")
-            return False
-        return True
-    
-    def upload_session_data(self, data_file):
-        """Upload session data to Google Drive"""
-        if not self.check_credentials():
-            return False
-            
-        print(f"📤 Uploading {data_file} to Google Drive...")
-        # Implementation would go here
-        print("✅ Upload completed (simulated)")
-        return True
-    
-    def download_session_data(self):
-        """Download session data from Google Drive"""
-        if not self.check_credentials():
-            return None
-            
-        print("📥 Downloading session data from Google Drive...")
-        # Implementation would go here
-        print("✅ Download completed (simulated)")
-        return None
-    
-    def sync_data(self):
-        """Sync local and cloud data"""
-        print("🔄 Starting Google Drive sync...")
-        
-        # Check for local data
-        local_data_file = "data/sessions.json"
-        if os.path.exists(local_data_file):
-            print(f"📁 Found local data: {local_data_file}")
-            self.upload_session_data(local_data_file)
-        else:
-            print("📁 No local data found")
-        
-        # Try to download cloud data
-        cloud_data = self.download_session_data()
-        if cloud_data:
-            print("☁️ Cloud data downloaded")
-        
-        print("✅ Sync completed")
-
-def main():
-    print("🚀 Forrest Gump Timer - Google Drive Sync")
-    print("=" * 50)
-    
-    sync = GoogleDriveSync()
-    sync.sync_data()
-
-if __name__ == "__main__":
-    main()
+"""
+Google Drive Sync for Forrest Gump Timer
+Syncs local session data with Google Drive
+"""
+
+import os
+import json
+from datetime import datetime
+import sys
+
+# Simple Google Drive sync functionality
+# This is a placeholder - full implementation would require Google API setup
+
+class GoogleDriveSync:
+    def __init__(self):
+        self.credentials_file = "google_credentials.json"
+        self.sync_folder = "ForrestGumpTimer"
+        
+    def check_credentials(self):
+        """Check if Google Drive credentials are available"""
+        if not os.path.exists(self.credentials_file):
+            print("❌ Google Drive credentials not found")
+            print("📋 To setup Google Drive sync:")
+            print("1. Go to Google Cloud Console")
+            print("2. Enable Google Drive API")
+            print("3. Create credentials and download as 'google_credentials.json'")
+            print("4. Place in project directory")
+            return False
+        return True
+    
+    def upload_session_data(self, data_file):
+        """Upload session data to Google Drive"""
+        if not self.check_credentials():
+            return False
+            
+        print(f"📤 Uploading {data_file} to Google Drive...")
+        # Implementation would go here
+        print("✅ Upload completed (simulated)")
+        return True
+    
+    def download_session_data(self):
+        """Download session data from Google Drive"""
+        if not self.check_credentials():
+            return None
+            
+        print("📥 Downloading session data from Google Drive...")
+        # Implementation would go here
+        print("✅ Download completed (simulated)")
+        return None
+    
+    def sync_data(self):
+        """Sync local and cloud data"""
+        print("🔄 Starting Google Drive sync...")
+        
+        # Check for local data (one log file per month)
+        local_data_dir = "data/sessions"
+        if os.path.isdir(local_data_dir):
+            print(f"📁 Found local data: {local_data_dir}")
+            for name in sorted(os.listdir(local_data_dir)):
+                self.upload_session_data(os.path.join(local_data_dir, name))
+        else:
+            print("📁 No local data found")
+        
+        # Try to download cloud data
+        cloud_data = self.download_session_data()
+        if cloud_data:
+            print("☁️ Cloud data downloaded")
+        
+        print("✅ Sync completed")
+
+def main():
+    print("🚀 Forrest Gump Timer - Google Drive Sync")
+    print("=" * 50)
+    
+    sync = GoogleDriveSync()
+    sync.sync_data()
+
+if __name__ == "__main__":
+    main()
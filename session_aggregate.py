@@ -0,0 +1,116 @@
+"""
+Forrest Gump Timer - Vectorized Aggregation
+Totals and per-day buckets computed over session column arrays
+"""
+
+import datetime
+from typing import Dict, List, Optional
+
+from session_archive import SessionColumns
+from session_storage import TOTAL_KEYS
+
+try:
+    import numpy as np
+except ImportError:  # numpy comes with pandas; without it the storage backends aggregate
+    np = None
+
+UNIX_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+def available() -> bool:
+    """True when numpy is installed and the vectorized engine can be used"""
+    return np is not None
+
+
+class SessionAggregator:
+    """Range filters, day bucketing and totals as numpy operations
+
+    Built from SessionColumns (the memory-mapped archive) with from_columns()
+    or from sessions already loaded as dicts with from_sessions(). Sums are
+    taken in storage order (bincount and cumsum add sequentially), which
+    makes the results equal, to the last bit, to folding the same sessions
+    one by one as the storage backends do. Days are local calendar days as
+    date.toordinal(); ranges are [start_day, end_day).
+    """
+
+    def __init__(self, day, distance, running, breaks, break_time, calories):
+        self.day = np.asarray(day, dtype=np.int64)
+        self.distance = np.asarray(distance, dtype=np.float64)
+        self.running = np.asarray(running, dtype=np.float64)
+        self.breaks = np.asarray(breaks, dtype=np.int64)
+        self.break_time = np.asarray(break_time, dtype=np.float64)
+        self.calories = np.asarray(calories, dtype=np.int64)
+
+    @classmethod
+    def from_columns(cls, columns: SessionColumns) -> "SessionAggregator":
+        """Engine over the archive's column arrays (no session dicts are built)"""
+        return cls(columns.day, columns.distance_miles, columns.running_seconds,
+                   columns.breaks, columns.break_seconds, columns.calories)
+
+    @classmethod
+    def from_sessions(cls, sessions: List[Dict]) -> "SessionAggregator":
+        """Engine over stored session dicts, e.g. the month get_monthly_data loaded
+
+        Start days are converted as one datetime64 array instead of parsing
+        each ISO timestamp.
+        """
+        count = len(sessions)
+        days = np.array([session["start_time"][:10] for session in sessions], dtype="datetime64[D]")
+        return cls(
+            days.astype(np.int64) + UNIX_EPOCH_ORDINAL,
+            np.fromiter((session.get("distance_miles", 0) for session in sessions), np.float64, count),
+            np.fromiter((session.get("running_time", 0) for session in sessions), np.float64, count),
+            np.fromiter((len(session.get("breaks") or ()) for session in sessions), np.int64, count),
+            np.fromiter((session.get("total_break_time", 0) for session in sessions), np.float64, count),
+            np.fromiter((session.get("calories", 0) for session in sessions), np.int64, count)
+        )
+
+    def totals(self, start_day: Optional[int] = None, end_day: Optional[int] = None) -> Dict:
+        """Totals as in SessionStorage.get_totals(), over sessions in the day range (all if None)"""
+        rows = self._rows(start_day, end_day)
+        return dict(zip(TOTAL_KEYS, (
+            int(len(self.day) if rows is None else np.count_nonzero(rows)),
+            _sequential_sum(self._pick(self.running, rows)),
+            _sequential_sum(self._pick(self.distance, rows)),
+            int(self._pick(self.calories, rows).sum()),
+            int(self._pick(self.breaks, rows).sum()),
+            _sequential_sum(self._pick(self.break_time, rows))
+        )))
+
+    def daily_totals(self, start_day: int, end_day: int) -> Dict[datetime.date, Dict]:
+        """Distance, time, sessions and calories per day with sessions, oldest first"""
+        rows = self._rows(start_day, end_day)
+        offsets = self.day[rows] - start_day
+        length = end_day - start_day
+        sessions = np.bincount(offsets, minlength=length)
+        distance = np.bincount(offsets, weights=self.distance[rows], minlength=length)
+        time = np.bincount(offsets, weights=self.running[rows], minlength=length)
+        calories = np.bincount(offsets, weights=self.calories[rows], minlength=length)
+        return {
+            datetime.date.fromordinal(start_day + offset): {
+                "distance": float(distance[offset]),
+                "time": float(time[offset]),
+                "sessions": int(sessions[offset]),
+                "calories": int(calories[offset])
+            }
+            for offset in np.flatnonzero(sessions).tolist()
+        }
+
+    def _rows(self, start_day: Optional[int], end_day: Optional[int]):
+        if start_day is None and end_day is None:
+            return None
+        rows = np.ones(len(self.day), dtype=bool)
+        if start_day is not None:
+            rows &= self.day >= start_day
+        if end_day is not None:
+            rows &= self.day < end_day
+        return rows
+
+    @staticmethod
+    def _pick(values, rows):
+        return values if rows is None else values[rows]
+
+
+def _sequential_sum(values) -> float:
+    # cumsum adds left to right like a Python loop; ndarray.sum() is pairwise
+    return float(np.cumsum(values)[-1]) if len(values) else 0
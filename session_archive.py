@@ -0,0 +1,300 @@
+"""
+Forrest Gump Timer - Columnar Session Archive
+Fixed-width, memory-mappable column files for finished sessions
+"""
+
+import array
+import datetime
+import json
+import mmap
+import os
+import sys
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from session_lock import ProcessLock
+from session_records import decode_record
+from session_storage import create_storage
+
+try:
+    import numpy as np
+except ImportError:  # numpy comes with pandas; without it columns are plain memoryviews
+    np = None
+
+# Column name -> array typecode. All values are fixed width, so row i of every
+# column sits at byte offset i * itemsize and nothing has to be parsed.
+COLUMNS = {
+    "start_epoch": "d",      # session start, POSIX seconds
+    "end_epoch": "d",        # session end, POSIX seconds (NaN if unknown)
+    "running_seconds": "d",
+    "break_seconds": "d",
+    "distance_miles": "d",
+    "calories": "q",
+    "breaks": "i",           # number of breaks taken
+    "day": "i",              # local calendar day of the start, as date.toordinal()
+}
+
+
+def session_to_row(session: Dict) -> Dict:
+    """Fixed-width column values for one stored session dict"""
+    start = datetime.datetime.fromisoformat(session["start_time"])
+    end_time = session.get("end_time")
+    return {
+        "start_epoch": start.timestamp(),
+        "end_epoch": datetime.datetime.fromisoformat(end_time).timestamp() if end_time else float("nan"),
+        "running_seconds": float(session.get("running_time", 0)),
+        "break_seconds": float(session.get("total_break_time", 0)),
+        "distance_miles": float(session.get("distance_miles", 0)),
+        "calories": int(session.get("calories", 0)),
+        "breaks": len(session.get("breaks") or ()),
+        "day": start.toordinal(),
+    }
+
+
+class SessionColumns:
+    """Read-only column arrays over a memory-mapped archive
+
+    Each attribute named after a COLUMNS key is a numpy array when numpy is
+    installed, otherwise a memoryview of the same typecode. Either way the data
+    stays in the page cache; no per-session objects are created.
+    """
+
+    def __init__(self, count: int, columns: Dict, maps: List[mmap.mmap]):
+        self.count = count
+        self._maps = maps  # keep the mappings alive as long as the views
+        for name, values in columns.items():
+            setattr(self, name, values)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def totals(self) -> Dict:
+        """Overall totals, as in SessionStorage.get_totals() minus the break count"""
+        return {
+            "total_sessions": self.count,
+            "total_running_time": _column_sum(self.running_seconds),
+            "total_distance": _column_sum(self.distance_miles),
+            "total_calories": int(_column_sum(self.calories)),
+            "total_break_time": _column_sum(self.break_seconds),
+        }
+
+    def daily_totals(self) -> Dict[datetime.date, Dict]:
+        """Distance, time, sessions and calories per local calendar day"""
+        daily = {}
+        if np is not None:
+            days, index = np.unique(self.day, return_inverse=True)
+            distance = np.bincount(index, weights=self.distance_miles, minlength=len(days))
+            time = np.bincount(index, weights=self.running_seconds, minlength=len(days))
+            calories = np.bincount(index, weights=self.calories, minlength=len(days))
+            sessions = np.bincount(index, minlength=len(days))
+            for i, day in enumerate(days.tolist()):
+                daily[datetime.date.fromordinal(day)] = {
+                    "distance": float(distance[i]),
+                    "time": float(time[i]),
+                    "sessions": int(sessions[i]),
+                    "calories": int(calories[i])
+                }
+            return daily
+
+        for i in range(self.count):
+            day = self.day[i]
+            if day not in daily:
+                daily[day] = {"distance": 0, "time": 0, "sessions": 0, "calories": 0}
+            daily[day]["distance"] += self.distance_miles[i]
+            daily[day]["time"] += self.running_seconds[i]
+            daily[day]["sessions"] += 1
+            daily[day]["calories"] += self.calories[i]
+        return {datetime.date.fromordinal(day): values for day, values in sorted(daily.items())}
+
+
+class SessionArchive:
+    """Append-only column files plus a small meta.json
+
+    Layout::
+
+        data/archive/meta.json            {"count": n, "byteorder": ..., "columns": {...}}
+        data/archive/start_epoch.col      n fixed-width native-order values, one file per column
+        ...
+
+    meta.json's count is the committed number of rows. Appends write the
+    column files first and the count last, so a crash in between only leaves
+    bytes past the count, which the next append truncates away. Rebuilds
+    write new column files under temporary names, move them into place and
+    write meta.json last. Writers and columns() take an archive.lock
+    ProcessLock, so no process maps a column while another rewrites it.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.meta_file = os.path.join(directory, "meta.json")
+        self.lock = ProcessLock(os.path.join(directory, "archive.lock"))
+
+    def exists(self) -> bool:
+        return self._read_meta() is not None
+
+    def count(self) -> int:
+        """Committed number of rows (0 if there is no archive)"""
+        meta = self._read_meta()
+        return meta["count"] if meta else 0
+
+    def column_path(self, name: str) -> str:
+        return os.path.join(self.directory, name + ".col")
+
+    def append(self, session_dicts: Iterable[Dict]) -> None:
+        """Add finished sessions to the end of every column"""
+        rows = [session_to_row(session) for session in session_dicts]
+        if not rows:
+            return
+        with self._locked():
+            if not self.exists():
+                self.rebuild([])
+            self._append_rows(rows)
+
+    def _append_rows(self, rows: List[Dict]) -> None:
+        count = self.count()
+        for name, typecode in COLUMNS.items():
+            values = array.array(typecode, (row[name] for row in rows))
+            committed_bytes = count * values.itemsize
+            with open(self.column_path(name), 'r+b') as f:
+                if os.fstat(f.fileno()).st_size != committed_bytes:
+                    f.truncate(committed_bytes)
+                f.seek(committed_bytes)
+                values.tofile(f)
+        self._write_meta(count + len(rows))
+
+    def rebuild(self, session_dicts: Iterable[Dict]) -> int:
+        """Replace the archive with the given sessions; returns the row count"""
+        buffers = {name: array.array(typecode) for name, typecode in COLUMNS.items()}
+        count = 0
+        for session in session_dicts:
+            row = session_to_row(session)
+            for name, values in buffers.items():
+                values.append(row[name])
+            count += 1
+
+        with self._locked():
+            tmp_files = {}
+            for name, values in buffers.items():
+                tmp_files[name] = tmp_file = _tmp_path(self.column_path(name))
+                with open(tmp_file, 'wb') as f:
+                    values.tofile(f)
+            # Drop the committed count first so a crash part way through the
+            # renames leaves no archive rather than mismatched columns
+            if os.path.exists(self.meta_file):
+                os.remove(self.meta_file)
+            for name, tmp_file in tmp_files.items():
+                os.replace(tmp_file, self.column_path(name))
+            self._write_meta(count)
+        return count
+
+    def columns(self) -> SessionColumns:
+        """Memory-map every column for reading"""
+        if not os.path.isdir(self.directory):
+            return self._map_columns(0)
+        # Map under the lock: the count and the files then belong to the same write
+        with self.lock:
+            return self._map_columns(self.count())
+
+    def _map_columns(self, count: int) -> SessionColumns:
+        columns = {}
+        maps = []
+        for name, typecode in COLUMNS.items():
+            itemsize = array.array(typecode).itemsize
+            if count == 0:
+                columns[name] = _empty_column(typecode)
+                continue
+            with open(self.column_path(name), 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), count * itemsize, access=mmap.ACCESS_READ)
+            maps.append(mapped)
+            if np is not None:
+                columns[name] = np.frombuffer(mapped, dtype=np.dtype(typecode), count=count)
+            else:
+                columns[name] = memoryview(mapped).cast(typecode)
+        return SessionColumns(count, columns, maps)
+
+    def _read_meta(self) -> Optional[Dict]:
+        try:
+            with open(self.meta_file, 'r') as f:
+                meta = json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            return None
+        # Written on another machine or with a different column set: not usable here
+        if meta.get("byteorder") != sys.byteorder or meta.get("columns") != COLUMNS:
+            return None
+        return meta
+
+    def _locked(self) -> ProcessLock:
+        os.makedirs(self.directory, exist_ok=True)
+        return self.lock
+
+    def _write_meta(self, count: int) -> None:
+        tmp_file = _tmp_path(self.meta_file)
+        with open(tmp_file, 'w') as f:
+            json.dump({"count": count, "byteorder": sys.byteorder, "columns": COLUMNS}, f)
+        os.replace(tmp_file, self.meta_file)
+
+
+def _tmp_path(path: str) -> str:
+    """Temporary name for a new version of path, unique to this process and thread"""
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def _empty_column(typecode: str):
+    if np is not None:
+        return np.empty(0, dtype=np.dtype(typecode))
+    return memoryview(array.array(typecode))
+
+
+def _column_sum(values) -> float:
+    if np is not None:
+        return float(values.sum())
+    return sum(values)
+
+
+# Files that show which storage backend a data directory uses, the timer's default first
+STORAGE_MARKERS = (("partitioned", "sessions"), ("ndjson", "sessions.ndjson"), ("sqlite", "sessions.db"))
+
+
+def convert(source: str, archive_dir: str, storage: Optional[str] = None) -> int:
+    """Build an archive from a sessions.json array, an NDJSON log or a data directory
+
+    For a data directory the sessions are read through its storage backend
+    (storage, or the one whose files are there).
+    """
+    if os.path.isdir(source):
+        if storage is None:
+            storage = next((kind for kind, name in STORAGE_MARKERS
+                            if os.path.exists(os.path.join(source, name))), None)
+            if storage is None:
+                raise ValueError(f"No stored sessions found in {source}")
+        sessions = create_storage(storage, source).load_all()
+    else:
+        with open(source, 'r') as f:
+            text = f.read()
+        if text.lstrip().startswith("["):
+            sessions = json.loads(text)
+        else:
+            sessions = [decode_record(line) for line in text.splitlines() if line.strip()]
+    return SessionArchive(archive_dir).rebuild(sessions)
+
+
+def main():
+    print("🚀 Forrest Gump Timer - Session Archive Converter")
+    print("=" * 50)
+
+    if len(sys.argv) < 2:
+        print("Usage: python session_archive.py <sessions.json | sessions.ndjson | data_dir> [archive_dir]")
+        return
+
+    source = sys.argv[1]
+    archive_dir = sys.argv[2] if len(sys.argv) > 2 else os.path.join("data", "archive")
+    try:
+        count = convert(source, archive_dir)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return
+    print(f"✅ Archived {count} sessions to {archive_dir}")
+
+
+if __name__ == "__main__":
+    main()
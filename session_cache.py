@@ -0,0 +1,105 @@
+"""
+Forrest Gump Timer - Aggregate Cache
+Bounded LRU of computed month and range aggregates
+"""
+
+import bisect
+import datetime
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+# A cached period: (name, start, end) covering sessions starting in [start, end)
+Period = Tuple[str, datetime.datetime, datetime.datetime]
+
+
+class AggregateCache:
+    """LRU cache of aggregates keyed by (runner, period, data version)
+
+    An entry is served only while its runner's data version is the one it
+    was computed at, so writes made elsewhere (another process, a file
+    replaced on disk) invalidate everything of that runner. Writes made
+    through the timer itself are more precise: written() drops only the
+    periods containing the new sessions and carries the rest over to the
+    new version. One cache can be shared by every runner of a server so
+    that max_entries bounds them all together.
+
+    Cached values are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[Hashable, Period], Tuple[int, object]]" = OrderedDict()
+
+    def get(self, runner: Hashable, period: Period, version: int, compute: Callable[[], object]):
+        """Cached value for the period at this data version, computing it on a miss"""
+        key = (runner, period)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        # Computed outside the lock so one slow aggregate does not block other lookups
+        value = compute()
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def written(self, runner: Hashable, start_times: Optional[Iterable[datetime.datetime]],
+                old_version: int, new_version: int) -> None:
+        """Account for sessions the runner just stored (start_times None: unknown, drop all)
+
+        Entries whose period holds one of the new sessions are dropped; the
+        others, if they were current at old_version, stay valid at new_version.
+        That holds only if the write was the one change in between: a version
+        that moved by more than one step also took in changes from elsewhere,
+        so then every entry of the runner is dropped.
+        """
+        if new_version != old_version + 1:
+            start_times = None
+        start_times = None if start_times is None else sorted(set(start_times))
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == runner]:
+                version, value = self._entries[key]
+                _, start, end = key[1]
+                if (version != old_version or start_times is None
+                        or _any_within(start_times, start, end)):
+                    del self._entries[key]
+                    self.invalidations += 1
+                else:
+                    self._entries[key] = (new_version, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Counters for tuning max_entries"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_ratio": self.hits / lookups if lookups else 0.0
+            }
+
+
+def _any_within(sorted_times: list, start: datetime.datetime, end: datetime.datetime) -> bool:
+    i = bisect.bisect_left(sorted_times, start)
+    return i < len(sorted_times) and sorted_times[i] < end
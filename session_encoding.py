@@ -0,0 +1,181 @@
+"""
+Forrest Gump Timer - Response Encoding
+Content negotiation between JSON and compact CBOR, and ?fields= selection
+"""
+
+import datetime
+import functools
+import struct
+import zlib
+from typing import Dict, Iterable, List, Optional
+
+CBOR_MIMETYPE = "application/cbor"
+CBOR_SEQ_MIMETYPE = "application/cbor-seq"
+
+# Fields of a stored session record that ?fields= can select
+SESSION_FIELDS = ("session_id", "start_time", "end_time", "breaks", "total_break_time",
+                  "running_time", "distance_miles", "calories")
+
+# ISO timestamps sent as integer epoch seconds in CBOR responses
+TIMESTAMP_FIELDS = frozenset(("start_time", "end_time", "timestamp", "export_date"))
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """"cbor" if the Accept header prefers application/cbor to JSON, else "json"
+
+    Browsers (Accept: */* or text/html,...) keep getting JSON; CBOR is only
+    sent to clients that ask for it by name.
+    """
+    if not accept:
+        return "json"
+    quality = {}
+    for part in accept.split(","):
+        media_type, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        quality[media_type.strip().lower()] = q
+    cbor_q = quality.get(CBOR_MIMETYPE, 0.0)
+    if cbor_q > 0 and cbor_q >= quality.get("application/json", 0.0):
+        return "cbor"
+    return "json"
+
+
+def parse_fields(value: Optional[str]) -> Optional[List[str]]:
+    """Session fields named by ?fields=a,b,c (None: all); raises ValueError for unknown ones"""
+    if not value:
+        return None
+    fields = [name.strip() for name in value.split(",") if name.strip()]
+    for name in fields:
+        if name not in SESSION_FIELDS:
+            raise ValueError(f"Unknown field: {name} (choose from {', '.join(SESSION_FIELDS)})")
+    return fields or None
+
+
+def select_fields(sessions: List[Dict], fields: Optional[List[str]]) -> List[Dict]:
+    """The sessions cut down to the requested fields"""
+    if fields is None:
+        return sessions
+    return [{name: session[name] for name in fields if name in session} for session in sessions]
+
+
+def representation_tag(encoding: str, fields: Optional[List[str]]) -> str:
+    """Suffix that keeps ETags of differently encoded or filtered responses apart"""
+    tag = "" if encoding == "json" else f"-{encoding}"
+    if fields is not None:
+        tag += "-" + format(zlib.crc32(",".join(fields).encode()), "08x")
+    return tag
+
+
+def compact(value):
+    """Copy of a response payload with ISO timestamps turned into epoch seconds"""
+    if isinstance(value, dict):
+        return {key: _epoch_int(item) if key in TIMESTAMP_FIELDS else compact(item)
+                for key, item in value.items()}
+    if isinstance(value, list):
+        return [compact(item) for item in value]
+    return value
+
+
+def _epoch_int(value):
+    if not isinstance(value, str):
+        return compact(value)
+    try:
+        return round(datetime.datetime.fromisoformat(value).timestamp())
+    except ValueError:
+        return value
+
+
+def encode_cbor(value) -> bytes:
+    """CBOR (RFC 8949) encoding of JSON-like data; floats use the shortest exact width"""
+    out = bytearray()
+    _encode(value, out)
+    return bytes(out)
+
+
+def encode_cbor_items(values: Iterable) -> bytes:
+    """Several values back to back (the items of an indefinite array, or a CBOR sequence)"""
+    out = bytearray()
+    for value in values:
+        _encode(value, out)
+    return bytes(out)
+
+
+def cbor_head(major: int, length: int) -> bytes:
+    """Initial byte(s) of a CBOR item: major type and length/value argument"""
+    if length < 24:
+        return bytes((major << 5 | length,))
+    if length < 0x100:
+        return struct.pack(">BB", major << 5 | 24, length)
+    if length < 0x10000:
+        return struct.pack(">BH", major << 5 | 25, length)
+    if length < 0x100000000:
+        return struct.pack(">BI", major << 5 | 26, length)
+    return struct.pack(">BQ", major << 5 | 27, length)
+
+
+# Indefinite-length array start and "break" stop code, for streamed arrays
+CBOR_ARRAY_START = b"\x9f"
+CBOR_BREAK = b"\xff"
+
+
+def _encode(value, out: bytearray) -> None:
+    if value is None:
+        out.append(0xf6)
+    elif value is True:
+        out.append(0xf5)
+    elif value is False:
+        out.append(0xf4)
+    elif isinstance(value, int):
+        if not -2**64 <= value < 2**64:
+            raise ValueError(f"Integer out of CBOR range: {value}")
+        out += cbor_head(0, value) if value >= 0 else cbor_head(1, -1 - value)
+    elif isinstance(value, float):
+        _encode_float(value, out)
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        out += cbor_head(3, len(data))
+        out += data
+    elif isinstance(value, (bytes, bytearray)):
+        out += cbor_head(2, len(value))
+        out += value
+    elif isinstance(value, (list, tuple)):
+        out += cbor_head(4, len(value))
+        for item in value:
+            _encode(item, out)
+    elif isinstance(value, dict):
+        out += cbor_head(5, len(value))
+        for key, item in value.items():
+            if isinstance(key, str):
+                out += _encoded_key(key)
+            else:
+                _encode(key, out)
+            _encode(item, out)
+    else:
+        raise TypeError(f"Cannot encode {type(value).__name__} as CBOR")
+
+
+@functools.lru_cache(maxsize=256)
+def _encoded_key(key: str) -> bytes:
+    # The same few field names repeat in every session
+    data = key.encode("utf-8")
+    return cbor_head(3, len(data)) + data
+
+
+def _encode_float(value: float, out: bytearray) -> None:
+    for marker, fmt in ((0xf9, ">e"), (0xfa, ">f")):
+        try:
+            packed = struct.pack(fmt, value)
+        except OverflowError:
+            continue
+        if struct.unpack(fmt, packed)[0] == value or value != value:
+            out.append(marker)
+            out += packed
+            return
+    out.append(0xfb)
+    out += struct.pack(">d", value)
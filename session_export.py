@@ -0,0 +1,116 @@
+"""
+Forrest Gump Timer - Session Export
+Streamed, paginated export of the stored sessions, shared by the web servers
+"""
+
+import json
+import zlib
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from session_records import encode_record
+from session_encoding import (CBOR_MIMETYPE, CBOR_SEQ_MIMETYPE, CBOR_ARRAY_START, CBOR_BREAK,
+                              cbor_head, compact, encode_cbor, encode_cbor_items, select_fields)
+
+MAX_EXPORT_PAGE = 10000
+EXPORT_CHUNK_SESSIONS = 1000
+
+
+def prepare_export(runner, export_format: str, cursor: Optional[str], limit: Optional[int],
+                   encoding: str = "json", fields: Optional[List[str]] = None
+                   ) -> Tuple[Iterator[Union[str, bytes]], str, Optional[str]]:
+    """Chunks, mimetype and next cursor of an export
+
+    Chunks are text, or bytes for encoding="cbor" (epoch timestamps; the json
+    format becomes one CBOR map, ndjson a CBOR sequence of sessions). fields
+    limits each session to the named fields. The first page is read here, so
+    a bad cursor or format raises before any response is started.
+    """
+    if export_format not in ("json", "ndjson"):
+        raise ValueError(f"Unknown export format: {export_format}")
+
+    if limit is None:
+        # Everything from the cursor on, one storage page at a time
+        sessions, page_cursor = runner.read_sessions_page(cursor, EXPORT_CHUNK_SESSIONS)
+        pages = export_pages(runner, sessions, page_cursor)
+        next_cursor = None
+    else:
+        # The one bounded page, so its cursor can go in the headers
+        sessions, next_cursor = runner.read_sessions_page(cursor, min(max(limit, 1), MAX_EXPORT_PAGE))
+        pages = iter([sessions])
+
+    if fields is not None:
+        pages = (select_fields(page, fields) for page in pages)
+
+    if encoding == "cbor":
+        if export_format == "ndjson":
+            return (encode_cbor_items(compact(page)) for page in pages), CBOR_SEQ_MIMETYPE, next_cursor
+        return export_cbor_chunks(runner, pages, next_cursor, limit is not None), CBOR_MIMETYPE, next_cursor
+    if export_format == "ndjson":
+        chunks = ("".join(encode_record(session) + "\n" for session in page) for page in pages)
+        return chunks, "application/x-ndjson", next_cursor
+    return export_json_chunks(runner, pages, next_cursor, limit is not None), "application/json", next_cursor
+
+
+def export_pages(runner, sessions: List[Dict], cursor: Optional[str]) -> Iterator[List[Dict]]:
+    """The first page, then the following pages up to the end of the stored data"""
+    yield sessions
+    while cursor is not None:
+        sessions, cursor = runner.read_sessions_page(cursor, EXPORT_CHUNK_SESSIONS)
+        yield sessions
+
+
+def export_json_chunks(runner, pages: Iterable[List[Dict]], next_cursor: Optional[str],
+                       paginated: bool) -> Iterator[str]:
+    """The export object as text chunks, with the sessions array written page by page"""
+    progress = runner.get_overall_progress()
+    head = {
+        "export_date": datetime.now().isoformat(),
+        "total_sessions": progress["total_sessions"],
+        "overall_progress": progress
+    }
+    yield '{"success":true,"data":' + json.dumps(head)[:-1] + ',"sessions":['
+    first = True
+    for page in pages:
+        if not page:
+            continue
+        yield ("" if first else ",") + ",".join(encode_record(session) for session in page)
+        first = False
+    if paginated:
+        yield '],"next_cursor":' + json.dumps(next_cursor) + "}}"
+    else:
+        yield "]}}"
+
+
+def export_cbor_chunks(runner, pages: Iterable[List[Dict]], next_cursor: Optional[str],
+                       paginated: bool) -> Iterator[bytes]:
+    """The export object in CBOR, with the sessions in an indefinite-length array written page by page"""
+    progress = runner.get_overall_progress()
+    head = compact({
+        "export_date": datetime.now().isoformat(),
+        "total_sessions": progress["total_sessions"],
+        "overall_progress": progress
+    })
+    yield (cbor_head(5, 2) + encode_cbor("success") + encode_cbor(True) + encode_cbor("data")
+           + cbor_head(5, len(head) + 1 + paginated)
+           + b"".join(encode_cbor(key) + encode_cbor(value) for key, value in head.items())
+           + encode_cbor("sessions") + CBOR_ARRAY_START)
+    for page in pages:
+        if page:
+            yield encode_cbor_items(compact(page))
+    if paginated:
+        yield CBOR_BREAK + encode_cbor("next_cursor") + encode_cbor(next_cursor)
+    else:
+        yield CBOR_BREAK
+
+
+def gzip_chunks(chunks: Iterable[Union[str, bytes]]) -> Iterator[bytes]:
+    """gzip-compress a stream of text or bytes chunks, flushing after each one"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
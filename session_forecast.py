@@ -0,0 +1,218 @@
+"""
+Forrest Gump Timer - Completion Forecast
+Online statistics of daily mileage and a projected finish date
+"""
+
+import datetime
+import math
+from typing import Dict, List, Optional, Tuple
+
+# Half-life of the exponentially weighted daily rate, in days
+HALF_LIFE_DAYS = 28
+DECAY = 0.5 ** (1 / HALF_LIFE_DAYS)
+
+# Half-life of the weights the trend is fitted with, in days: the trend is
+# that of the last few months, not of the whole history
+TREND_HALF_LIFE_DAYS = 90
+TREND_DECAY = 0.5 ** (1 / TREND_HALF_LIFE_DAYS)
+
+# Days ahead the trend is extrapolated; after that the daily rate stays put
+TREND_HORIZON_DAYS = 90
+
+# Two-sided 90% interval of a normal distribution
+CONFIDENCE = 0.9
+Z_SCORE = 1.645
+
+# Days of history needed before the linear trend is used
+MIN_TREND_DAYS = 28
+
+# Finish dates further out than this are reported as None
+MAX_FORECAST_DAYS = 100 * 365
+
+
+class CompletionForecaster:
+    """Exponentially weighted rate, its spread and a recent linear trend of daily miles
+
+    Every calendar day since the first session counts, rest days as zero.
+    The weighted mean and mean square are decayed in closed form when days
+    pass, and a session on an earlier day is added with that day's weight,
+    so the order sessions arrive in does not matter. The trend is a
+    weighted least squares line (TREND_HALF_LIFE_DAYS) kept the same way:
+    only the mileage sums are stored, the sums over day numbers have closed
+    forms. Every update and every forecast is O(1). Days are
+    date.toordinal() values.
+    """
+
+    def __init__(self):
+        self.first_day: Optional[int] = None
+        self.last_day: Optional[int] = None
+        self.level = 0.0
+        self.square = 0.0
+        # Trend-weighted sums of mileage, age-weighted mileage and squared
+        # daily mileage, ages counted back from last_day
+        self.trend_y = 0.0
+        self.trend_ay = 0.0
+        self.trend_yy = 0.0
+
+    @classmethod
+    def from_daily(cls, daily: Dict[int, List]) -> "CompletionForecaster":
+        """Build from SessionIndex.daily ({day: [distance, time, sessions, calories]})"""
+        forecaster = cls()
+        for day in sorted(daily):
+            forecaster.add(day, daily[day][0])
+        return forecaster
+
+    def add(self, day: int, distance: float, day_before: float = 0.0) -> None:
+        """Fold one session's distance into the statistics
+
+        day_before is the distance already recorded on that day, which the
+        mean squares need since they are taken over daily totals.
+        """
+        if self.first_day is None:
+            self.first_day = self.last_day = day
+        elif day < self.first_day:
+            self.first_day = day
+        elif day > self.last_day:
+            elapsed = day - self.last_day
+            decay = DECAY ** elapsed
+            self.level *= decay
+            self.square *= decay
+            self.trend_y, self.trend_ay, self.trend_yy = _age_trend_sums(
+                self.trend_y, self.trend_ay, self.trend_yy, elapsed)
+            self.last_day = day
+
+        age = self.last_day - day
+        added_square = (day_before + distance) ** 2 - day_before ** 2
+        weight = (1 - DECAY) * DECAY ** age
+        self.level += weight * distance
+        self.square += weight * added_square
+        trend_weight = TREND_DECAY ** age
+        self.trend_y += trend_weight * distance
+        self.trend_ay += trend_weight * age * distance
+        self.trend_yy += trend_weight * added_square
+
+    def statistics(self, today: int) -> Dict:
+        """Weighted daily rate and trend, with their standard errors, as of today
+
+        daily_rate_std is the day-to-day spread of the mileage;
+        daily_rate_se and trend_per_day_se are the uncertainty of the
+        estimated rate and trend themselves.
+        """
+        if self.first_day is None:
+            return {"daily_rate": 0.0, "daily_rate_std": 0.0, "daily_rate_se": 0.0,
+                    "trend_per_day": 0.0, "trend_per_day_se": 0.0, "days": 0}
+        end = max(today, self.last_day)
+        days = end - self.first_day + 1
+        decay = DECAY ** (end - self.last_day)
+        # Weights of the days seen so far sum to 1 - DECAY ** days; normalize early on
+        weight_total = 1 - DECAY ** days
+        rate = self.level * decay / weight_total
+        variance = max(self.square * decay / weight_total - rate ** 2, 0.0)
+        # Standard error of a weighted mean: sum(w^2) / sum(w)^2 of the variance
+        rate_se = math.sqrt(variance * _power_sums(DECAY ** 2, days)[0]
+                            / _power_sums(DECAY, days)[0] ** 2)
+
+        trend = trend_se = 0.0
+        if days >= MIN_TREND_DAYS:
+            y, ay, yy = _age_trend_sums(self.trend_y, self.trend_ay, self.trend_yy, end - self.last_day)
+            w0, w1, w2 = _power_sums(TREND_DECAY, days)
+            mean_age = w1 / w0
+            s_aa = w2 - w1 * mean_age
+            s_ay = ay - mean_age * y
+            # Ages run backwards in time, so the slope over age is minus the trend
+            trend = -s_ay / s_aa
+            residual = max((yy - y * y / w0 - s_ay * s_ay / s_aa) / w0, 0.0)
+            v0, v1, v2 = _power_sums(TREND_DECAY ** 2, days)
+            trend_se = math.sqrt(residual * (v2 - 2 * mean_age * v1 + mean_age ** 2 * v0)) / s_aa
+        return {"daily_rate": rate, "daily_rate_std": math.sqrt(variance), "daily_rate_se": rate_se,
+                "trend_per_day": trend, "trend_per_day_se": trend_se, "days": days}
+
+    def forecast(self, remaining: float, today: datetime.date) -> Dict:
+        """Projected date the remaining distance is covered, with a CONFIDENCE interval
+
+        The daily rate follows the trend for at most TREND_HORIZON_DAYS
+        (and never below zero), then stays constant. The bounds add and
+        subtract Z_SCORE standard deviations of the k-day total, which
+        include the day-to-day spread and the standard errors of the rate
+        and the trend. Dates are None beyond MAX_FORECAST_DAYS, e.g. when
+        the projected rate is zero.
+        """
+        stats = self.statistics(today.toordinal())
+        result = {
+            "daily_rate": stats["daily_rate"],
+            "daily_rate_std": stats["daily_rate_std"],
+            "trend_per_day": stats["trend_per_day"],
+            "confidence": CONFIDENCE
+        }
+        if remaining <= 0:
+            finish = {"days_remaining": 0, "projected_finish_date": today.isoformat(),
+                      "finish_date_earliest": today.isoformat(), "finish_date_latest": today.isoformat()}
+            return {**result, **finish}
+
+        days = _days_to_cover(remaining, stats, 0.0)
+        earliest = _days_to_cover(remaining, stats, Z_SCORE)
+        latest = _days_to_cover(remaining, stats, -Z_SCORE)
+        return {
+            **result,
+            "days_remaining": days,
+            "projected_finish_date": _date_after(today, days),
+            "finish_date_earliest": _date_after(today, earliest),
+            "finish_date_latest": _date_after(today, latest)
+        }
+
+
+def _age_trend_sums(y: float, ay: float, yy: float, elapsed: int) -> Tuple[float, float, float]:
+    """Trend sums re-based on a last day elapsed days later (every age grows by elapsed)"""
+    if not elapsed:
+        return y, ay, yy
+    decay = TREND_DECAY ** elapsed
+    return y * decay, (ay + elapsed * y) * decay, yy * decay
+
+
+def _power_sums(x: float, n: int) -> Tuple[float, float, float]:
+    """Sums of x^a, a*x^a and a^2*x^a for a = 0 .. n-1 (0 < x < 1), in closed form"""
+    xn = x ** n
+    q = 1 - x
+    s0 = (1 - xn) / q
+    s1 = (x - n * xn + (n - 1) * xn * x) / q ** 2
+    s2 = x * (1 + x - n * n * xn / x + (2 * n * n - 2 * n - 1) * xn - (n - 1) ** 2 * xn * x) / q ** 3
+    return s0, s1, s2
+
+
+def _days_to_cover(remaining: float, stats: Dict, z: float) -> Optional[int]:
+    """First whole day k where the k-day total, plus z standard deviations, reaches remaining; or None"""
+    rate, trend = stats["daily_rate"], stats["trend_per_day"]
+    # Days the trend applies for: the horizon, or until it takes the rate to zero
+    horizon = TREND_HORIZON_DAYS
+    if trend < 0:
+        horizon = min(horizon, rate / -trend)
+    final_rate = rate + trend * horizon
+
+    def covered(k: float) -> float:
+        trended = min(k, horizon)
+        expected = rate * trended + trend * trended ** 2 / 2 + final_rate * (k - trended)
+        if not z:
+            return expected
+        trend_days = min(k, TREND_HORIZON_DAYS)
+        trend_effect = trend_days ** 2 / 2 + TREND_HORIZON_DAYS * (k - trend_days)
+        variance = (stats["daily_rate_std"] ** 2 * k + (stats["daily_rate_se"] * k) ** 2
+                    + (stats["trend_per_day_se"] * trend_effect) ** 2)
+        return expected + z * math.sqrt(variance)
+
+    # Doubling to bracket the first crossing, then bisection: a fixed number of steps
+    low, high = 0.0, 1.0
+    while covered(high) < remaining:
+        if high >= MAX_FORECAST_DAYS:
+            return None
+        low, high = high, min(high * 2, MAX_FORECAST_DAYS)
+    for _ in range(40):
+        middle = (low + high) / 2
+        if covered(middle) >= remaining:
+            high = middle
+        else:
+            low = middle
+    return math.ceil(high)
+
+
+def _date_after(today: datetime.date, days: Optional[int]) -> Optional[str]:
+    return None if days is None else (today + datetime.timedelta(days=days)).isoformat()
@@ -0,0 +1,467 @@
+"""
+Forrest Gump Timer - Bulk Session Import
+Streams runs exported from other apps (CSV, NDJSON, GPX) into session storage
+
+Usage: python session_import.py <file>... [--data-dir DIR] [--runner NAME]
+                                [--format csv|ndjson|gpx] [--dry-run]
+
+CSV columns (header names are case-insensitive; only a start time is required):
+
+    start_time / start / date        ISO date-time of the start
+    end_time / end                   ISO date-time of the end
+    running_time / duration          seconds, or H:MM:SS / MM:SS
+    total_break_time / break_time    seconds
+    distance_miles / distance        miles
+    distance_km                      kilometres
+    calories
+    session_id / id
+
+NDJSON files hold one session per line in the storage/export format. GPX files
+give one session per <trk>, from the first and last track point times, with the
+distance summed along the track. Whatever is missing is derived the way the
+timer does it: running time from start, end and breaks; distance at the
+timer's SPEED_MPH; calories at ~100 per mile.
+"""
+
+import argparse
+import array
+import csv
+import datetime
+import itertools
+import math
+import os
+import xml.etree.ElementTree as ElementTree
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from session_records import encode_record, decode_record
+
+try:
+    import numpy as np
+except ImportError:  # numpy comes with pandas; without it batches are checked row by row
+    np = None
+
+CALORIES_PER_MILE = 100
+KM_PER_MILE = 1.609344
+EARTH_RADIUS_MILES = 3958.8
+
+# Rows validated together; also bounds the memory an import needs
+BATCH_SIZE = 50000
+MAX_REPORTED_ERRORS = 20
+
+CSV_COLUMNS = {
+    "start_time": ("start_time", "start", "start_date", "date"),
+    "end_time": ("end_time", "end"),
+    "running_time": ("running_time", "duration"),
+    "total_break_time": ("total_break_time", "break_time"),
+    "distance_miles": ("distance_miles", "distance"),
+    "distance_km": ("distance_km",),
+    "calories": ("calories",),
+    "session_id": ("session_id", "id"),
+}
+
+# Reasons a row is rejected, by code (0 = valid)
+REJECT_REASONS = {
+    1: "missing or unreadable start time",
+    2: "unreadable number",
+    3: "running time is negative or unknown",
+    4: "ends before it starts",
+    5: "negative distance, calories or break time",
+    6: "malformed breaks",
+}
+
+
+class ImportedRow:
+    """One input row, reduced to plain values before batch validation"""
+
+    __slots__ = ("line", "start", "end", "running", "breaks", "distance", "calories",
+                 "session_id", "break_list", "bad_number", "bad_breaks")
+
+    def __init__(self, line: int):
+        self.line = line
+        self.start: Optional[datetime.datetime] = None
+        self.end: Optional[datetime.datetime] = None
+        self.running = math.nan
+        self.breaks = math.nan
+        self.distance = math.nan
+        self.calories = math.nan
+        self.session_id: Optional[str] = None
+        self.break_list: List[Dict] = []
+        self.bad_number = False
+        self.bad_breaks = False
+
+
+def parse_time(value) -> Optional[datetime.datetime]:
+    """Naive local datetime for an ISO string (UTC offsets converted), or None"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.datetime.fromisoformat(str(value).strip())
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def _number(row: ImportedRow, value) -> float:
+    """Float for a numeric field; NaN if empty, flagging the row if unreadable"""
+    if value is None or value == "":
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        row.bad_number = True
+        return math.nan
+
+
+def _duration(row: ImportedRow, value) -> float:
+    """Seconds for a duration given in seconds or as H:MM:SS / MM:SS"""
+    if isinstance(value, str) and ":" in value:
+        try:
+            seconds = 0.0
+            for part in value.strip().split(":"):
+                seconds = seconds * 60 + float(part)
+            return seconds
+        except ValueError:
+            row.bad_number = True
+            return math.nan
+    return _number(row, value)
+
+
+def _breaks(row: ImportedRow, value) -> List[Dict]:
+    """Breaks of an NDJSON record, flagging the row unless they are in the storage format"""
+    if value is None:
+        return []
+    if not isinstance(value, list) or not all(isinstance(break_data, dict) for break_data in value):
+        row.bad_breaks = True
+        return []
+    for break_data in value:
+        for field in ("minutes", "seconds", "total_seconds"):
+            number = break_data.get(field, 0)
+            if (isinstance(number, bool) or not isinstance(number, (int, float))
+                    or not 0 <= number < math.inf):
+                row.bad_breaks = True
+        timestamp = break_data.get("timestamp")
+        if timestamp is not None and (not isinstance(timestamp, str) or parse_time(timestamp) is None):
+            row.bad_breaks = True
+    return value
+
+
+# Readers: each yields ImportedRow objects one at a time
+
+def read_csv(path: str) -> Iterator[ImportedRow]:
+    with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = [name.strip().lower() for name in next(reader, [])]
+        index = {}
+        for field, names in CSV_COLUMNS.items():
+            for name in names:
+                if name in header:
+                    index[field] = header.index(name)
+                    break
+
+        def cell(values: List[str], field: str) -> Optional[str]:
+            i = index.get(field)
+            return values[i].strip() if i is not None and i < len(values) else None
+
+        for line, values in enumerate(reader, start=2):
+            if not values:
+                continue
+            row = ImportedRow(line)
+            row.start = parse_time(cell(values, "start_time"))
+            row.end = parse_time(cell(values, "end_time"))
+            row.running = _duration(row, cell(values, "running_time"))
+            row.breaks = _number(row, cell(values, "total_break_time"))
+            row.distance = _number(row, cell(values, "distance_miles"))
+            if math.isnan(row.distance):
+                row.distance = _number(row, cell(values, "distance_km")) / KM_PER_MILE
+            row.calories = _number(row, cell(values, "calories"))
+            row.session_id = cell(values, "session_id") or None
+            yield row
+
+
+def read_ndjson(path: str) -> Iterator[ImportedRow]:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line, text in enumerate(f, start=1):
+            text = text.strip()
+            if not text:
+                continue
+            row = ImportedRow(line)
+            try:
+                record = decode_record(text)
+            except ValueError:
+                record = None
+            if not isinstance(record, dict):
+                yield row  # rejected below as having no start time
+                continue
+            row.start = parse_time(record.get("start_time"))
+            row.end = parse_time(record.get("end_time"))
+            row.running = _number(row, record.get("running_time"))
+            row.breaks = _number(row, record.get("total_break_time"))
+            row.distance = _number(row, record.get("distance_miles"))
+            row.calories = _number(row, record.get("calories"))
+            row.session_id = record.get("session_id")
+            row.break_list = _breaks(row, record.get("breaks"))
+            yield row
+
+
+def read_gpx(path: str) -> Iterator[ImportedRow]:
+    """One row per track; elements are cleared as they are read, so file size does not matter
+
+    A track with a point lacking a readable lat/lon is rejected as an
+    unreadable number.
+    """
+    track = 0
+    first_time = last_time = None
+    previous = None
+    distance = 0.0
+    bad_point = False
+    for _, element in ElementTree.iterparse(path, events=("end",)):
+        tag = element.tag.rsplit("}", 1)[-1]
+        if tag == "trkpt":
+            try:
+                point = (float(element.get("lat")), float(element.get("lon")))
+            except (TypeError, ValueError):
+                bad_point = True
+                point = None
+            when = None
+            for child in element:
+                if child.tag.rsplit("}", 1)[-1] == "time":
+                    when = parse_time(child.text)
+            if when is not None:
+                first_time = first_time or when
+                last_time = when
+            if point is not None:
+                if previous is not None:
+                    distance += haversine_miles(previous, point)
+                previous = point
+            element.clear()
+        elif tag == "trkseg":
+            element.clear()
+        elif tag == "trk":
+            track += 1
+            row = ImportedRow(track)
+            row.start = first_time
+            row.end = last_time
+            row.distance = distance
+            row.bad_number = bad_point
+            yield row
+            first_time = last_time = previous = None
+            distance = 0.0
+            bad_point = False
+            element.clear()
+
+
+def haversine_miles(a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+    h = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(h))
+
+
+READERS = {"csv": read_csv, "ndjson": read_ndjson, "gpx": read_gpx}
+EXTENSIONS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson", ".gpx": "gpx"}
+
+
+def detect_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXTENSIONS:
+        raise ValueError(f"Cannot tell the format of {path}; pass --format")
+    return EXTENSIONS[extension]
+
+
+# Batch validation and derivation
+
+def derive_batch(rows: List[ImportedRow], speed_mph: float) -> Tuple[Dict, List[int]]:
+    """Fill in missing values and check every row of a batch at once
+
+    Returns the completed columns (start/end epochs, running and break
+    seconds, distance, calories) and a reject code per row (see
+    REJECT_REASONS, 0 = valid).
+    """
+    count = len(rows)
+    start = array.array("d", (row.start.timestamp() if row.start else math.nan for row in rows))
+    end = array.array("d", (row.end.timestamp() if row.end else math.nan for row in rows))
+    running = array.array("d", (row.running for row in rows))
+    breaks = array.array("d", (row.breaks for row in rows))
+    distance = array.array("d", (row.distance for row in rows))
+    calories = array.array("d", (row.calories for row in rows))
+    bad_number = array.array("b", (row.bad_number for row in rows))
+    bad_breaks = array.array("b", (row.bad_breaks for row in rows))
+    if np is not None:
+        return _derive_numpy(start, end, running, breaks, distance, calories, bad_number, bad_breaks,
+                             speed_mph)
+
+    reasons = [0] * count
+    for i in range(count):
+        if math.isnan(breaks[i]):
+            breaks[i] = 0.0
+        if math.isnan(running[i]):
+            running[i] = end[i] - start[i] - breaks[i]
+        if math.isnan(end[i]):
+            end[i] = start[i] + running[i] + breaks[i]
+        if math.isnan(distance[i]):
+            distance[i] = running[i] / 3600 * speed_mph
+        if math.isnan(calories[i]):
+            calories[i] = math.floor(distance[i] * CALORIES_PER_MILE)
+
+        if math.isnan(start[i]):
+            reasons[i] = 1
+        elif bad_number[i]:
+            reasons[i] = 2
+        elif not running[i] >= 0 or math.isinf(running[i]):
+            reasons[i] = 3
+        elif end[i] < start[i]:
+            reasons[i] = 4
+        elif distance[i] < 0 or calories[i] < 0 or breaks[i] < 0:
+            reasons[i] = 5
+        elif bad_breaks[i]:
+            reasons[i] = 6
+    columns = {"start": start, "end": end, "running": running, "breaks": breaks,
+               "distance": distance, "calories": calories}
+    return columns, reasons
+
+
+def _derive_numpy(start, end, running, breaks, distance, calories, bad_number, bad_breaks,
+                  speed_mph: float) -> Tuple[Dict, List[int]]:
+    start, end, running, breaks, distance, calories = (
+        np.frombuffer(column, dtype=np.float64).copy()
+        for column in (start, end, running, breaks, distance, calories))
+    bad_number = np.frombuffer(bad_number, dtype=np.int8).astype(bool)
+    bad_breaks = np.frombuffer(bad_breaks, dtype=np.int8).astype(bool)
+
+    breaks = np.where(np.isnan(breaks), 0.0, breaks)
+    running = np.where(np.isnan(running), end - start - breaks, running)
+    end = np.where(np.isnan(end), start + running + breaks, end)
+    distance = np.where(np.isnan(distance), running / 3600 * speed_mph, distance)
+    calories = np.where(np.isnan(calories), np.floor(distance * CALORIES_PER_MILE), calories)
+
+    with np.errstate(invalid="ignore"):
+        reasons = np.select(
+            [np.isnan(start),
+             bad_number,
+             ~(running >= 0) | np.isinf(running),
+             end < start,
+             (distance < 0) | (calories < 0) | (breaks < 0),
+             bad_breaks],
+            [1, 2, 3, 4, 5, 6], default=0)
+    columns = {"start": start, "end": end, "running": running, "breaks": breaks,
+               "distance": distance, "calories": calories}
+    return columns, reasons.tolist()
+
+
+def build_records(rows: List[ImportedRow], columns: Dict, reasons: List[int]) -> Iterator[Tuple[int, Dict]]:
+    """(reject code, storage record or None) per row of a validated batch"""
+    fromtimestamp = datetime.datetime.fromtimestamp
+    for i, row in enumerate(rows):
+        if reasons[i]:
+            yield reasons[i], None
+            continue
+        start_time = row.start.isoformat()
+        end_time = row.end.isoformat() if row.end else fromtimestamp(float(columns["end"][i])).isoformat()
+        yield 0, {
+            "session_id": str(row.session_id) if row.session_id else start_time,
+            "start_time": start_time,
+            "end_time": end_time,
+            "breaks": row.break_list,
+            "total_break_time": _break_seconds(float(columns["breaks"][i])),
+            "running_time": float(columns["running"][i]),
+            "distance_miles": float(columns["distance"][i]),
+            "calories": int(columns["calories"][i])
+        }
+
+
+def _break_seconds(value: float) -> Union[int, float]:
+    """Break seconds as stored: whole seconds as an int, like the live timer's, else the exact value
+
+    running_time was derived with the exact value, so rounding it here
+    would lose time from the session.
+    """
+    return int(value) if value.is_integer() else value
+
+
+def import_files(timer, paths: Iterable[str], import_format: Optional[str] = None,
+                 batch_size: int = BATCH_SIZE, dry_run: bool = False) -> Dict:
+    """Validate, de-duplicate and store the sessions in some files
+
+    Files are streamed and validated batch_size rows at a time; accepted
+    sessions are spooled to a temporary NDJSON file next to the data, then
+    written through the storage layer in a single append_many() call (one
+    transaction with the SQLite backend), so a file that fails halfway leaves
+    storage untouched. Sessions whose session_id is already stored, or that
+    appear twice in the input, are skipped. Returns counts plus the first
+    few rejected rows. With dry_run nothing is stored and "imported" counts
+    the sessions that would have been.
+    """
+    report = {"read": 0, "imported": 0, "duplicates": 0, "invalid": 0, "errors": []}
+    known = timer.get_session_index()
+    seen = set()
+    spool_path = os.path.join(timer.data_dir, f"import.{os.getpid()}.spool")
+
+    try:
+        with open(spool_path, 'w') as spool:
+            for path in paths:
+                rows = READERS[import_format or detect_format(path)](path)
+                while True:
+                    batch = list(itertools.islice(rows, batch_size))
+                    if not batch:
+                        break
+                    report["read"] += len(batch)
+                    columns, reasons = derive_batch(batch, timer.SPEED_MPH)
+                    lines = []
+                    for (reason, record), row in zip(build_records(batch, columns, reasons), batch):
+                        if reason:
+                            report["invalid"] += 1
+                            if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                                report["errors"].append(f"{path}:{row.line}: {REJECT_REASONS[reason]}")
+                            continue
+                        session_id = record["session_id"]
+                        if session_id in seen or session_id in known:
+                            report["duplicates"] += 1
+                            continue
+                        seen.add(session_id)
+                        lines.append(encode_record(record) + "\n")
+                    spool.write("".join(lines))
+                    report["imported"] += len(lines)
+
+        if report["imported"] and not dry_run:
+            timer.import_records(_read_spool(spool_path))
+    finally:
+        if os.path.exists(spool_path):
+            os.remove(spool_path)
+    return report
+
+
+def _read_spool(path: str) -> Iterator[Dict]:
+    with open(path, 'r') as f:
+        for line in f:
+            yield decode_record(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import runs from other apps into the Forrest Gump Timer")
+    parser.add_argument("files", nargs="+", help="CSV, NDJSON or GPX files")
+    parser.add_argument("--data-dir", default="data", help="data directory (default: data)")
+    parser.add_argument("--runner", help="import into this runner's history instead of the default")
+    parser.add_argument("--format", choices=sorted(READERS), help="input format (default: from the extension)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="validate only, store nothing")
+    args = parser.parse_args()
+
+    print("🚀 Forrest Gump Timer - Bulk Import")
+    print("=" * 50)
+
+    from forrest_timer import RunnerRegistry
+    timer = RunnerRegistry(args.data_dir).get(args.runner, create=True)
+
+    report = import_files(timer, args.files, args.format, args.batch_size, args.dry_run)
+    print(f"📄 Rows read:   {report['read']:,}")
+    print(f"✅ Imported:    {report['imported']:,}" + (" (dry run)" if args.dry_run else ""))
+    print(f"🔁 Duplicates:  {report['duplicates']:,}")
+    print(f"⚠️  Invalid:     {report['invalid']:,}")
+    for error in report["errors"]:
+        print(f"   {error}")
+
+
+if __name__ == "__main__":
+    main()
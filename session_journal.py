@@ -0,0 +1,208 @@
+"""
+Forrest Gump Timer - Active Session Journal
+Write-ahead journal that lets an in-flight session survive a crash
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from session_records import Session, Break, encode_record, decode_record
+
+
+class SessionJournal:
+    """Append-only journal of the events of the session in progress
+
+    Each event is one JSON line:
+
+        {"event": "start", "session_id": ..., "start_ts": ...}
+        {"event": "break", "minutes": ..., "seconds": ..., "timestamp": ...}
+        {"event": "heartbeat", "ts": ...}
+        {"event": "stop", "record": {...finished session record...}}
+
+    Every event is flushed to the OS right away, which is enough to survive
+    the process dying. fsync() (surviving a power cut) is group-committed: at
+    most one per fsync_interval, issued by a background thread that also
+    writes a heartbeat every heartbeat_interval while a session is open.
+    The journal is deleted once the finished session is in storage.
+    """
+
+    def __init__(self, path: str, fsync_interval: float = 1.0, heartbeat_interval: float = 30.0):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.fsync_count = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self._dirty = False
+        self._last_fsync = 0.0
+        self._last_heartbeat = 0.0
+        # Bytes of whole events found by the last recover(); a torn tail starts there
+        self._intact_size: Optional[int] = None
+        self._closing = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record_start(self, session: Session) -> None:
+        """Begin a new journal for a session that just started"""
+        self._open('w')
+        self._append({"event": "start", "session_id": session.session_id, "start_ts": session.start_ts})
+
+    def record_break(self, break_data: Break) -> None:
+        self._append({
+            "event": "break",
+            "minutes": break_data.minutes,
+            "seconds": break_data.seconds,
+            "total_seconds": break_data.total_seconds,
+            "timestamp": break_data.timestamp
+        })
+
+    def record_stop(self, record: Dict) -> None:
+        """Log the finished session before it is written to storage"""
+        self._append({"event": "stop", "record": record})
+
+    def heartbeat(self) -> None:
+        self._append({"event": "heartbeat", "ts": time.time()})
+
+    def resume(self) -> None:
+        """Keep journaling a session recovered from an existing journal
+
+        A torn event left by the crash is cut off first, so the events
+        written from here on start on a line of their own.
+        """
+        if self._intact_size is not None:
+            with open(self.path, 'rb+') as f:
+                f.truncate(self._intact_size)
+                if self._intact_size:
+                    f.seek(self._intact_size - 1)
+                    if f.read(1) != b"\n":
+                        f.write(b"\n")
+        self._open('a')
+
+    def clear(self) -> None:
+        """Close and delete the journal once its session is safely stored"""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def close(self) -> None:
+        """Stop journaling in this process, leaving the file as it is (and synced)"""
+        self._closing.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+        with self._lock:
+            if self._file is not None:
+                if self._dirty:
+                    self._fsync_locked()
+                self._file.close()
+                self._file = None
+            self._dirty = False
+
+    def signature(self) -> Optional[tuple]:
+        """(mtime, size, inode) of the journal file, None if there is none"""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def recover(self) -> Dict:
+        """Replay the journal left by a previous process
+
+        Returns {"session": Session or None, "finished_record": dict or None,
+        "last_seen": epoch of the last event or None}. A finished_record means
+        the session was stopped but may not have reached storage yet.
+        """
+        result = {"session": None, "finished_record": None, "last_seen": None}
+        for event in self._read_events():
+            kind = event.get("event")
+            if kind == "start":
+                result["session"] = Session(event["session_id"], event["start_ts"])
+                result["last_seen"] = event["start_ts"]
+            elif result["session"] is None:
+                continue
+            elif kind == "break":
+                break_data = Break(event["minutes"], event["seconds"], event["timestamp"],
+                                   event.get("total_seconds"))
+                result["session"].breaks.append(break_data)
+                result["session"].total_break_time += break_data.total_seconds
+                result["last_seen"] = event["timestamp"]
+            elif kind == "heartbeat":
+                result["last_seen"] = event["ts"]
+            elif kind == "stop":
+                result["finished_record"] = event["record"]
+        if result["finished_record"] is not None:
+            result["session"] = None
+        return result
+
+    def _read_events(self) -> List[Dict]:
+        events = []
+        self._intact_size = 0
+        try:
+            with open(self.path, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        try:
+                            events.append(decode_record(line.decode('utf-8').strip()))
+                        except ValueError:
+                            # Torn final event from the crash; everything before it is intact
+                            break
+                    self._intact_size += len(line)
+        except FileNotFoundError:
+            pass
+        return events
+
+    def _open(self, mode: str) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+            if mode == 'w':
+                open(self.path, 'w').close()
+            # Always append, so events written by other processes sharing the
+            # journal are never overwritten
+            self._file = open(self.path, 'a')
+            self._last_heartbeat = time.time()
+        self._closing.clear()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._background, name="session-journal", daemon=True)
+            self._thread.start()
+
+    def _append(self, event: Dict) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(encode_record(event) + "\n")
+            self._file.flush()
+            self._dirty = True
+            if event["event"] == "heartbeat":
+                self._last_heartbeat = event["ts"]
+            if time.time() - self._last_fsync >= self.fsync_interval:
+                self._fsync_locked()
+
+    def _fsync_locked(self) -> None:
+        os.fsync(self._file.fileno())
+        self._dirty = False
+        self._last_fsync = time.time()
+        self.fsync_count += 1
+
+    def _background(self) -> None:
+        while True:
+            with self._lock:
+                now = time.time()
+                if self._dirty:
+                    wait = max(0.0, self._last_fsync + self.fsync_interval - now)
+                else:
+                    wait = self.fsync_interval
+                wait = min(wait, max(0.0, self._last_heartbeat + self.heartbeat_interval - now))
+            if self._closing.wait(wait):
+                return
+
+            if time.time() - self._last_heartbeat >= self.heartbeat_interval:
+                self.heartbeat()
+            with self._lock:
+                if (self._file is not None and self._dirty
+                        and time.time() - self._last_fsync >= self.fsync_interval):
+                    self._fsync_locked()
@@ -0,0 +1,248 @@
+"""
+Forrest Gump Timer - Request Metrics
+Per-endpoint latency histograms, request/error counts and storage-read time,
+rendered in the Prometheus text format for /api/metrics
+"""
+
+import bisect
+import contextvars
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from session_storage import CachedSessionStorage
+
+# Upper bounds (seconds) of the latency buckets
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Storage-read seconds accumulated by the request running in this context
+_request_storage: contextvars.ContextVar[Optional[List[float]]] = contextvars.ContextVar(
+    "request_storage", default=None)
+
+
+class Histogram:
+    """Fixed-bucket histogram (per-bucket counts, made cumulative when rendered)"""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RequestMetrics:
+    """Counters and histograms for the web server's requests
+
+    Recording a request costs two clock reads and a few dict updates under
+    one lock, so it can stay on in production. Storage time is measured by
+    CachedSessionStorage (see instrument_storage) and charged both to the
+    storage operation and to the request it ran for.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._requests: Dict[Tuple[str, str, int], int] = {}
+        self._errors: Dict[Tuple[str, str], int] = {}
+        self._durations: Dict[str, Histogram] = {}
+        self._request_storage: Dict[str, Histogram] = {}
+        self._storage_reads: Dict[str, Histogram] = {}
+        self._collectors: List[Callable[[], List[Tuple[str, str, str, float]]]] = []
+
+    def start_request(self) -> Tuple[float, List[float], contextvars.Token]:
+        """Begin timing the current request; pass the result to finish_request"""
+        storage = [0.0]
+        return time.perf_counter(), storage, _request_storage.set(storage)
+
+    def finish_request(self, started: Tuple[float, List[float], contextvars.Token],
+                       method: str, endpoint: str, status: int) -> None:
+        start_time, storage, token = started
+        duration = time.perf_counter() - start_time
+        try:
+            _request_storage.reset(token)
+        except ValueError:
+            # Finished from a different context than it started in; nothing to undo
+            pass
+        with self._lock:
+            key = (method, endpoint, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            if status >= 400:
+                error_key = (method, endpoint)
+                self._errors[error_key] = self._errors.get(error_key, 0) + 1
+            self._histogram(self._durations, endpoint).observe(duration)
+            self._histogram(self._request_storage, endpoint).observe(storage[0])
+
+    def observe_storage_read(self, operation: str, seconds: float) -> None:
+        """Record one storage read (called by CachedSessionStorage)"""
+        storage = _request_storage.get()
+        if storage is not None:
+            storage[0] += seconds
+        with self._lock:
+            self._histogram(self._storage_reads, operation).observe(seconds)
+
+    def add_collector(self, collector: Callable[[], List[Tuple[str, str, str, float]]]) -> None:
+        """Extra samples read at render time: collector() -> [(name, type, help, value)]"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            requests = dict(self._requests)
+            errors = dict(self._errors)
+            durations = {name: _copy(h) for name, h in self._durations.items()}
+            request_storage = {name: _copy(h) for name, h in self._request_storage.items()}
+            storage_reads = {name: _copy(h) for name, h in self._storage_reads.items()}
+
+        lines = [
+            "# HELP forrest_http_requests_total Requests handled, by endpoint and status.",
+            "# TYPE forrest_http_requests_total counter"
+        ]
+        for (method, endpoint, status), count in sorted(requests.items()):
+            lines.append(f'forrest_http_requests_total{{method="{method}",endpoint="{endpoint}",'
+                         f'status="{status}"}} {count}')
+        lines += [
+            "# HELP forrest_http_request_errors_total Requests answered with a 4xx or 5xx status.",
+            "# TYPE forrest_http_request_errors_total counter"
+        ]
+        for (method, endpoint), count in sorted(errors.items()):
+            lines.append(f'forrest_http_request_errors_total{{method="{method}",endpoint="{endpoint}"}} {count}')
+        lines += _render_histograms("forrest_http_request_duration_seconds",
+                                    "Time spent in the request handler.", "endpoint", durations)
+        lines += _render_histograms("forrest_http_request_storage_seconds",
+                                    "Storage-read time per request.", "endpoint", request_storage)
+        lines += _render_histograms("forrest_storage_read_seconds",
+                                    "Time of each storage read, by operation.", "operation", storage_reads)
+        for collector in self._collectors:
+            for name, kind, help_text, value in collector():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {_number(value)}"]
+        return "\n".join(lines) + "\n"
+
+    def _histogram(self, histograms: Dict[str, Histogram], name: str) -> Histogram:
+        histogram = histograms.get(name)
+        if histogram is None:
+            histogram = histograms[name] = Histogram(self.buckets)
+        return histogram
+
+
+class MetricsMiddleware:
+    """WSGI middleware recording every request, including failed and streamed ones
+
+    Requests are timed until the server closes the response body, so a
+    streamed export or live stream counts for as long as it was being sent,
+    not just the time to its headers. A request whose app or body iterator
+    raises is counted as a 500. The endpoint is read from ENDPOINT_KEY in the
+    WSGI environ, which the app sets once it has routed the request.
+    """
+
+    ENDPOINT_KEY = "forrest.endpoint"
+
+    def __init__(self, app, metrics: RequestMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    def __call__(self, environ, start_response):
+        started = self.metrics.start_request()
+        status = [500]
+
+        def recording_start_response(status_line, headers, exc_info=None):
+            status[0] = int(status_line.split(" ", 1)[0])
+            return start_response(status_line, headers, exc_info)
+
+        def finish(failed: bool) -> None:
+            self.metrics.finish_request(started, environ.get("REQUEST_METHOD", "GET"),
+                                        environ.get(self.ENDPOINT_KEY, "unmatched"),
+                                        500 if failed else status[0])
+
+        try:
+            body = self.app(environ, recording_start_response)
+        except BaseException:
+            finish(True)
+            raise
+        return _TimedBody(body, finish)
+
+
+class _TimedBody:
+    """Response iterable calling finish(failed) once, when the server closes it"""
+
+    def __init__(self, body, finish: Callable[[bool], None]):
+        self.body = body
+        self.finish = finish
+        self.failed = False
+        self.finished = False
+
+    def __iter__(self):
+        try:
+            yield from self.body
+        except GeneratorExit:
+            # The server stopped reading (client went away); not an error
+            raise
+        except BaseException:
+            self.failed = True
+            raise
+
+    def close(self) -> None:
+        try:
+            close = getattr(self.body, "close", None)
+            if close is not None:
+                close()
+        finally:
+            if not self.finished:
+                self.finished = True
+                self.finish(self.failed)
+
+
+def instrument_storage(metrics: RequestMetrics) -> None:
+    """Time every read CachedSessionStorage makes from its backend, in all timers"""
+    CachedSessionStorage.read_observer = metrics.observe_storage_read
+
+
+def aggregate_cache_collector(cache) -> Callable[[], List[Tuple[str, str, str, float]]]:
+    """Collector exposing an AggregateCache's counters"""
+    def collect():
+        stats = cache.stats()
+        return [
+            ("forrest_aggregate_cache_hits_total", "counter", "Aggregate cache hits.", stats["hits"]),
+            ("forrest_aggregate_cache_misses_total", "counter", "Aggregate cache misses.", stats["misses"]),
+            ("forrest_aggregate_cache_evictions_total", "counter", "Aggregate cache LRU evictions.",
+             stats["evictions"]),
+            ("forrest_aggregate_cache_entries", "gauge", "Aggregates currently cached.", stats["entries"])
+        ]
+    return collect
+
+
+def _copy(histogram: Histogram) -> Histogram:
+    copy = Histogram(histogram.buckets)
+    copy.counts = list(histogram.counts)
+    copy.sum = histogram.sum
+    copy.count = histogram.count
+    return copy
+
+
+def _render_histograms(name: str, help_text: str, label: str, histograms: Dict[str, Histogram]) -> List[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for value, histogram in sorted(histograms.items()):
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{label}="{value}",le="{_number(bound)}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{label}="{value}",le="+Inf"}} {histogram.count}')
+        lines.append(f'{name}_sum{{{label}="{value}"}} {histogram.sum:.6f}')
+        lines.append(f'{name}_count{{{label}="{value}"}} {histogram.count}')
+    return lines
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# Shared by the Flask and ASGI servers (one per process)
+metrics = RequestMetrics()
@@ -0,0 +1,103 @@
+"""
+Forrest Gump Timer - Range Aggregation
+Prefix sums over the per-day totals, for any date range and bucket size
+"""
+
+import datetime
+from itertools import accumulate
+from typing import Dict, List
+
+# Bucket sizes get_range_data accepts
+GRANULARITIES = ("day", "week", "month", "year")
+
+# Most buckets one range query may return
+MAX_RANGE_BUCKETS = 5000
+
+
+class DailyPrefixSums:
+    """Cumulative distance, time, sessions and calories per calendar day
+
+    Built from SessionIndex.daily ({day ordinal: [distance, time, sessions,
+    calories]}) as one dense array per value covering every day from the
+    first session to the last, so the totals of any range of days are two
+    lookups and a subtraction, and a series of buckets costs one lookup per
+    bucket boundary.
+    """
+
+    def __init__(self, daily: Dict[int, List]):
+        self.first_day = min(daily) if daily else 0
+        self.span = max(daily) - self.first_day + 1 if daily else 0
+        per_day = [[0.0, 0.0, 0, 0] for _ in range(self.span)]
+        for day, values in daily.items():
+            per_day[day - self.first_day] = values
+        # prefix[field][k] = sum over the first k days
+        self.prefix = [[0] + list(accumulate(values[field] for values in per_day)) for field in range(4)]
+
+    def totals(self, start_day: int, end_day: int) -> List:
+        """[distance, time, sessions, calories] for day ordinals in [start_day, end_day)"""
+        i = self._offset(start_day)
+        j = self._offset(end_day)
+        return [column[j] - column[i] for column in self.prefix]
+
+    def series(self, boundaries: List[int]) -> List[List]:
+        """Totals between each pair of consecutive day ordinals in boundaries"""
+        offsets = [self._offset(day) for day in boundaries]
+        return [[column[j] - column[i] for column in self.prefix]
+                for i, j in zip(offsets, offsets[1:])]
+
+    def _offset(self, day: int) -> int:
+        return min(max(day - self.first_day, 0), self.span)
+
+
+def bucket_boundaries(start: datetime.date, end: datetime.date, granularity: str) -> List[datetime.date]:
+    """start, every calendar bucket start inside (start, end), then end
+
+    Weeks start on Monday; months and years on their first day. The first
+    and last buckets are cut to the range. Raises ValueError for an unknown
+    granularity, an empty range or more than MAX_RANGE_BUCKETS buckets.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity: {granularity} (choose from {', '.join(GRANULARITIES)})")
+    if end <= start:
+        raise ValueError("end must be after start")
+
+    if granularity == "day":
+        count = (end - start).days
+    elif granularity == "week":
+        count = (end - start).days // 7 + 2
+    elif granularity == "month":
+        count = (end.year - start.year) * 12 + end.month - start.month + 1
+    else:
+        count = end.year - start.year + 1
+    if count > MAX_RANGE_BUCKETS:
+        raise ValueError(f"Too many {granularity} buckets (at most {MAX_RANGE_BUCKETS})")
+
+    boundaries = [start]
+    bucket = _bucket_start(start, granularity)
+    while True:
+        bucket = _next_bucket(bucket, granularity)
+        if bucket >= end:
+            break
+        boundaries.append(bucket)
+    boundaries.append(end)
+    return boundaries
+
+
+def _bucket_start(day: datetime.date, granularity: str) -> datetime.date:
+    if granularity == "week":
+        return day - datetime.timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    if granularity == "year":
+        return day.replace(month=1, day=1)
+    return day
+
+
+def _next_bucket(day: datetime.date, granularity: str) -> datetime.date:
+    if granularity == "day":
+        return day + datetime.timedelta(days=1)
+    if granularity == "week":
+        return day + datetime.timedelta(days=7)
+    if granularity == "month":
+        return day.replace(year=day.year + 1, month=1) if day.month == 12 else day.replace(month=day.month + 1)
+    return day.replace(year=day.year + 1)
@@ -0,0 +1,126 @@
+"""
+Forrest Gump Timer - Session Records
+Slotted Session/Break records and the codec used to store them
+"""
+
+import datetime
+import json
+from typing import Dict, List, Optional
+
+
+class Break:
+    """A single break taken during a session"""
+
+    __slots__ = ("minutes", "seconds", "total_seconds", "timestamp")
+
+    def __init__(self, minutes: int, seconds: int, timestamp: float,
+                 total_seconds: Optional[int] = None):
+        self.minutes = minutes
+        self.seconds = seconds
+        self.total_seconds = minutes * 60 + seconds if total_seconds is None else total_seconds
+        self.timestamp = timestamp  # epoch seconds when the break was recorded
+
+    def __repr__(self) -> str:
+        return f"Break(minutes={self.minutes}, seconds={self.seconds}, timestamp={self.timestamp})"
+
+
+class Session:
+    """Represents a single running session
+
+    Times are kept as epoch seconds (floats); start_time and end_time give the
+    local datetimes for code that wants them.
+    """
+
+    __slots__ = ("session_id", "start_ts", "end_ts", "breaks", "total_break_time",
+                 "running_time", "distance_miles", "calories")
+
+    def __init__(self, session_id: str, start_ts: float, end_ts: Optional[float] = None,
+                 breaks: Optional[List[Break]] = None, total_break_time: int = 0,
+                 running_time: float = 0, distance_miles: float = 0.0, calories: int = 0):
+        self.session_id = session_id
+        self.start_ts = start_ts
+        self.end_ts = end_ts
+        self.breaks = [] if breaks is None else breaks
+        self.total_break_time = total_break_time  # seconds
+        self.running_time = running_time  # seconds
+        self.distance_miles = distance_miles
+        self.calories = calories
+
+    @property
+    def start_time(self) -> datetime.datetime:
+        return datetime.datetime.fromtimestamp(self.start_ts)
+
+    @property
+    def end_time(self) -> Optional[datetime.datetime]:
+        return None if self.end_ts is None else datetime.datetime.fromtimestamp(self.end_ts)
+
+    def __repr__(self) -> str:
+        return (f"Session(session_id={self.session_id!r}, start_ts={self.start_ts}, "
+                f"end_ts={self.end_ts}, breaks={len(self.breaks)}, running_time={self.running_time})")
+
+
+# Storage records keep the original JSON shape (ISO local times) so existing
+# session files, exports and API clients keep working; only the in-memory
+# records are epoch based.
+
+_fromtimestamp = datetime.datetime.fromtimestamp
+_fromisoformat = datetime.datetime.fromisoformat
+_encoder = json.JSONEncoder(separators=(",", ":"), check_circular=False)
+_decoder = json.JSONDecoder()
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    return None if ts is None else _fromtimestamp(ts).isoformat()
+
+
+def _epoch(iso: Optional[str]) -> Optional[float]:
+    return None if iso is None else _fromisoformat(iso).timestamp()
+
+
+def session_to_record(session: Session) -> Dict:
+    """Storage record (plain dict) for a Session"""
+    return {
+        "session_id": session.session_id,
+        "start_time": _iso(session.start_ts),
+        "end_time": _iso(session.end_ts),
+        "breaks": [
+            {
+                "minutes": b.minutes,
+                "seconds": b.seconds,
+                "total_seconds": b.total_seconds,
+                "timestamp": _iso(b.timestamp)
+            }
+            for b in session.breaks
+        ],
+        "total_break_time": session.total_break_time,
+        "running_time": session.running_time,
+        "distance_miles": session.distance_miles,
+        "calories": session.calories
+    }
+
+
+def session_from_record(record: Dict) -> Session:
+    """Session for a storage record; missing fields take their defaults"""
+    get = record.get
+    return Session(
+        record["session_id"],
+        _epoch(record["start_time"]),
+        _epoch(get("end_time")),
+        [Break(b.get("minutes", 0), b.get("seconds", 0), _epoch(b.get("timestamp")),
+               b.get("total_seconds"))
+         for b in get("breaks") or ()],
+        get("total_break_time", 0),
+        get("running_time", 0),
+        get("distance_miles", 0.0),
+        get("calories", 0)
+    )
+
+
+def encode_record(record: Dict) -> str:
+    """One compact JSON line (without the newline) for a storage record"""
+    return _encoder.encode(record)
+
+
+def decode_record(line: str) -> Dict:
+    """Storage record from one JSON line; raises json.JSONDecodeError if torn"""
+    return _decoder.decode(line)
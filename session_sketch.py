@@ -0,0 +1,241 @@
+"""
+Forrest Gump Timer - Quantile Sketches
+Mergeable, bounded-size sketches for session distance, duration and break percentiles
+"""
+
+import datetime
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Sketched values: miles per session, running seconds per session, seconds per break
+SKETCH_FIELDS = ("distance", "duration", "break")
+
+# Quantiles reported when none are asked for
+DEFAULT_QUANTILES = (0.5, 0.9)
+
+# Estimates are within 1% of the true value at the same rank
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+LOG_GAMMA = math.log(GAMMA)
+
+# Most buckets one sketch keeps; beyond that the lowest ones are folded together
+MAX_BINS = 1024
+
+
+class QuantileSketch:
+    """Log-bucketed quantile sketch (DDSketch) with a bounded number of buckets
+
+    A value v > 0 is counted in bucket ceil(log(v) / log(GAMMA)), so every
+    bucket spans values within RELATIVE_ACCURACY of its midpoint; zero and
+    negative values share one extra counter. Merging adds bucket counts,
+    which gives exactly the sketch of the combined values whatever the
+    order, so monthly sketches merge into ranges and across runners without
+    losing accuracy. Past MAX_BINS buckets the lowest ones are folded
+    together, trading accuracy at the bottom for a fixed size.
+    """
+
+    def __init__(self):
+        self.bins: Dict[int, int] = {}
+        self.zero = 0
+        self.count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Count a value (count times)"""
+        if value > 0:
+            index = math.ceil(math.log(value) / LOG_GAMMA)
+            self.bins[index] = self.bins.get(index, 0) + count
+            if len(self.bins) > MAX_BINS:
+                self._collapse()
+        else:
+            self.zero += count
+        self.count += count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Add another sketch's counts to this one; returns self"""
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        if len(self.bins) > MAX_BINS:
+            self._collapse()
+        self.zero += other.zero
+        self.count += other.count
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated value at quantile q (0 to 1), or None for an empty sketch"""
+        if not self.count:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        rank = q * (self.count - 1)
+        seen = self.zero
+        if rank < seen:
+            return min(max(0.0, self.min), self.max)
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank < seen:
+                estimate = 2 * GAMMA ** index / (GAMMA + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable form: bucket counts as a dense list from bucket index offset"""
+        offset = min(self.bins) if self.bins else 0
+        counts = [0] * (max(self.bins) - offset + 1) if self.bins else []
+        for index, count in self.bins.items():
+            counts[index - offset] = count
+        return {"count": self.count, "zero": self.zero, "min": self.min, "max": self.max,
+                "offset": offset, "counts": counts}
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "QuantileSketch":
+        sketch = cls()
+        sketch.count = state["count"]
+        sketch.zero = state["zero"]
+        sketch.min = state["min"]
+        sketch.max = state["max"]
+        offset = state["offset"]
+        sketch.bins = {offset + i: count for i, count in enumerate(state["counts"]) if count}
+        return sketch
+
+    def _collapse(self) -> None:
+        indexes = sorted(self.bins)
+        excess = indexes[:len(indexes) - MAX_BINS + 1]
+        folded = sum(self.bins.pop(index) for index in excess)
+        lowest = indexes[len(excess)]
+        self.bins[lowest] += folded
+
+
+def empty_sketches() -> Dict[str, QuantileSketch]:
+    """One empty sketch per SKETCH_FIELDS entry"""
+    return {field: QuantileSketch() for field in SKETCH_FIELDS}
+
+
+def add_session(sketches: Dict[str, QuantileSketch], session: Dict) -> None:
+    """Count one stored session (and each of its breaks) in the sketches"""
+    sketches["distance"].add(session.get("distance_miles", 0))
+    sketches["duration"].add(session.get("running_time", 0))
+    for break_data in session.get("breaks") or []:
+        sketches["break"].add(break_data.get("total_seconds", 0))
+
+
+def fold_monthly_sketches(state: Dict[str, Dict], sessions: Iterable[Dict]) -> Dict[str, Dict]:
+    """Serialized monthly sketches ({"YYYY-MM": {field: dict}}) with the sessions added
+
+    Only the months the sessions fall in are deserialized and rewritten.
+    """
+    touched: Dict[str, Dict[str, QuantileSketch]] = {}
+    for session in sessions:
+        month = session["start_time"][:7]
+        sketches = touched.get(month)
+        if sketches is None:
+            sketches = touched[month] = load_sketches(state.get(month))
+        add_session(sketches, session)
+    if not touched:
+        return state
+    state = dict(state)
+    for month, sketches in touched.items():
+        state[month] = dump_sketches(sketches)
+    return state
+
+
+def load_monthly_sketches(state: Dict[str, Dict], start_month: Optional[str] = None,
+                          end_month: Optional[str] = None) -> Dict[str, Dict[str, QuantileSketch]]:
+    """Deserialized monthly sketches for months in [start_month, end_month] ("YYYY-MM"), oldest first"""
+    return {month: load_sketches(sketches) for month, sketches in sorted(state.items())
+            if month_in_range(month, start_month, end_month)}
+
+
+def load_sketches(state: Optional[Dict]) -> Dict[str, QuantileSketch]:
+    """Sketches from their serialized form (empty ones for None)"""
+    if state is None:
+        return empty_sketches()
+    return {field: QuantileSketch.from_dict(state[field]) for field in SKETCH_FIELDS}
+
+
+def dump_sketches(sketches: Dict[str, QuantileSketch]) -> Dict:
+    """JSON-serializable form of a set of sketches, as load_sketches() reads it"""
+    return {field: sketch.to_dict() for field, sketch in sketches.items()}
+
+
+def merge_sketches(groups: Iterable[Dict[str, QuantileSketch]]) -> Dict[str, QuantileSketch]:
+    """New sketches holding the counts of every group (e.g. months or runners)"""
+    merged = empty_sketches()
+    for sketches in groups:
+        for field, sketch in sketches.items():
+            merged[field].merge(sketch)
+    return merged
+
+
+def summarize(sketches: Dict[str, QuantileSketch], quantiles: Tuple[float, ...] = DEFAULT_QUANTILES) -> Dict:
+    """Count, min, max and the requested quantiles ("p50", "p90", ...) per field"""
+    summary = {}
+    for field, sketch in sketches.items():
+        stats = {"count": sketch.count, "min": sketch.min, "max": sketch.max}
+        for q in quantiles:
+            stats[quantile_label(q)] = sketch.quantile(q)
+        summary[field] = stats
+    return summary
+
+
+def percentile_summary(monthly_groups: Iterable[Dict[str, Dict[str, QuantileSketch]]],
+                       quantiles: Tuple[float, ...] = DEFAULT_QUANTILES, by_month: bool = False) -> Dict:
+    """summarize() over monthly sketches of one or more runners, merged
+
+    With by_month=True a "months" entry adds the summary of each month.
+    """
+    by_month_groups: Dict[str, List[Dict[str, QuantileSketch]]] = {}
+    for monthly in monthly_groups:
+        for month, sketches in monthly.items():
+            by_month_groups.setdefault(month, []).append(sketches)
+    result = {
+        "quantiles": list(quantiles),
+        "stats": summarize(merge_sketches(sketches for groups in by_month_groups.values() for sketches in groups),
+                           quantiles)
+    }
+    if by_month:
+        result["months"] = {month: summarize(merge_sketches(groups), quantiles)
+                            for month, groups in sorted(by_month_groups.items())}
+    return result
+
+
+def quantile_label(q: float) -> str:
+    """"p90" for 0.9, "p99.9" for 0.999"""
+    return f"p{round(q * 100, 6):g}"
+
+
+def parse_month(value: Optional[str]) -> Optional[str]:
+    """Canonical "YYYY-MM" for a month parameter (None stays None); raises ValueError for bad ones"""
+    if not value:
+        return None
+    try:
+        month = datetime.datetime.strptime(value, "%Y-%m")
+    except ValueError:
+        raise ValueError(f"Invalid month: {value} (use YYYY-MM)") from None
+    return f"{month.year:04d}-{month.month:02d}"
+
+
+def month_in_range(month: str, start_month: Optional[str], end_month: Optional[str]) -> bool:
+    """True if a "YYYY-MM" month lies in [start_month, end_month] (None: unbounded)"""
+    return (start_month is None or month >= start_month) and (end_month is None or month <= end_month)
+
+
+def parse_quantiles(value: Optional[str]) -> Tuple[float, ...]:
+    """Quantiles from ?q=0.5,0.9 (DEFAULT_QUANTILES if empty); raises ValueError for bad ones"""
+    if not value:
+        return DEFAULT_QUANTILES
+    quantiles: List[float] = []
+    for part in value.split(","):
+        q = float(part)
+        if not 0 <= q <= 1:
+            raise ValueError(f"Quantile out of range: {part} (use 0 to 1)")
+        quantiles.append(q)
+    return tuple(quantiles)
@@ -0,0 +1,169 @@
+"""
+Forrest Gump Timer - Session Index Snapshots
+Compacted snapshot of derived session state plus replay of the log tail
+"""
+
+import datetime
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from session_storage import SessionStorage
+from session_training import RollingTotals
+from session_forecast import CompletionForecaster
+
+SNAPSHOT_VERSION = 1
+
+# Per-day values kept in the index, in this order
+DAY_FIELDS = ("distance", "time", "sessions", "calories")
+
+
+def day_ordinal(start_time: str) -> int:
+    """Local calendar day of an ISO start_time as date.toordinal()"""
+    return datetime.date.fromisoformat(start_time[:10]).toordinal()
+
+
+class SessionIndex:
+    """Session-id index and per-day totals, kept current from a snapshot
+
+    The state is derived from the stored sessions but never rebuilt from them
+    at startup: the latest snapshot (data/snapshot.json) is loaded and only
+    the sessions stored after the snapshot's storage position are replayed.
+    Once compact_every sessions have been replayed on top of a snapshot, a
+    fresh one is written by a background thread. Rolling 7/28/365-day
+    totals and the completion forecaster's statistics are rebuilt from the
+    daily values on load and then updated by every session applied.
+    """
+
+    def __init__(self, storage: SessionStorage, path: str, compact_every: int = 1000):
+        self.storage = storage
+        self.path = path
+        self.compact_every = compact_every
+        self.session_ids = set()
+        self.daily: Dict[int, List] = {}
+        self.rolling = RollingTotals()
+        self.forecaster = CompletionForecaster()
+        self.position: Optional[Dict] = None
+        self.replayed_since_snapshot = 0
+        self.snapshot_count = 0
+        self.last_load_seconds = 0.0
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._compactor: Optional[threading.Thread] = None
+
+    def load(self) -> None:
+        """Load the latest snapshot and replay the log tail after it"""
+        started = time.perf_counter()
+        with self._lock:
+            self._reset()
+            snapshot = self._read_snapshot()
+            if snapshot is not None:
+                self.session_ids = set(snapshot["session_ids"])
+                self.daily = {int(day): values for day, values in snapshot["daily"].items()}
+                self.position = snapshot["position"]
+                self.rolling = RollingTotals.from_daily(self.daily)
+                self.forecaster = CompletionForecaster.from_daily(self.daily)
+            self._loaded = True
+            self.catch_up()
+        self.last_load_seconds = time.perf_counter() - started
+
+    def catch_up(self) -> int:
+        """Apply sessions stored since the last call; returns how many were new"""
+        with self._lock:
+            if not self._loaded:
+                self.load()
+                return 0
+            result = self.storage.read_since(self.position)
+            if result is None:
+                # Storage was replaced underneath us: rebuild from the beginning
+                self._reset()
+                result = self.storage.read_since(None)
+            sessions, self.position = result
+            for session in sessions:
+                self.apply(session)
+            self.replayed_since_snapshot += len(sessions)
+
+        if self.replayed_since_snapshot >= self.compact_every:
+            self.compact_in_background()
+        return len(sessions)
+
+    def apply(self, session: Dict) -> None:
+        """Fold one stored session into the index"""
+        self.session_ids.add(session["session_id"])
+        day = day_ordinal(session["start_time"])
+        values = self.daily.get(day)
+        if values is None:
+            values = self.daily[day] = [0.0, 0.0, 0, 0]
+        self.forecaster.add(day, session.get("distance_miles", 0), values[0])
+        values[0] += session.get("distance_miles", 0)
+        values[1] += session.get("running_time", 0)
+        values[2] += 1
+        values[3] += session.get("calories", 0)
+        self.rolling.add(day, session.get("distance_miles", 0), session.get("running_time", 0))
+
+    def daily_totals(self) -> Dict[int, List]:
+        """Copy of the per-day values ({day ordinal: [distance, time, sessions, calories]})"""
+        with self._lock:
+            return {day: list(values) for day, values in self.daily.items()}
+
+    def rolling_totals(self, today: int) -> Dict[str, Dict]:
+        """Totals over the last 7, 28 and 365 days up to the day ordinal today"""
+        with self._lock:
+            return self.rolling.windows(today)
+
+    def forecast(self, remaining: float, today: datetime.date) -> Dict:
+        """CompletionForecaster.forecast() under the index lock"""
+        with self._lock:
+            return self.forecaster.forecast(remaining, today)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self.session_ids
+
+    def compact_in_background(self) -> None:
+        """Write a fresh snapshot on a daemon thread (one at a time)"""
+        with self._lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            self._compactor = threading.Thread(target=self.write_snapshot, name="snapshot-compactor",
+                                               daemon=True)
+            self._compactor.start()
+
+    def write_snapshot(self) -> None:
+        """Persist the current state and storage position"""
+        with self._lock:
+            # Copy under the lock; serializing happens outside it
+            state = {
+                "version": SNAPSHOT_VERSION,
+                "backend": self.storage.name,
+                "created": time.time(),
+                "position": self.position,
+                "session_ids": list(self.session_ids),
+                "daily": {str(day): list(values) for day, values in self.daily.items()}
+            }
+            self.replayed_since_snapshot = 0
+
+        tmp_file = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(state, f, separators=(",", ":"))
+        os.replace(tmp_file, self.path)
+        self.snapshot_count += 1
+
+    def _reset(self) -> None:
+        self.session_ids = set()
+        self.daily = {}
+        self.rolling = RollingTotals()
+        self.forecaster = CompletionForecaster()
+        self.position = None
+        self.replayed_since_snapshot = 0
+
+    def _read_snapshot(self) -> Optional[Dict]:
+        try:
+            with open(self.path, 'r') as f:
+                snapshot = json.load(f)
+        except (ValueError, FileNotFoundError):
+            return None
+        if snapshot.get("version") != SNAPSHOT_VERSION or snapshot.get("backend") != self.storage.name:
+            return None
+        return snapshot
@@ -0,0 +1,1196 @@
+"""
+Forrest Gump Timer - Session Storage
+Pluggable storage backends for finished running sessions
+"""
+
+import json
+import os
+import sqlite3
+import datetime
+import itertools
+import threading
+import time
+import zlib
+from contextlib import closing
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from session_records import encode_record, decode_record
+from session_sketch import (QuantileSketch, add_session, empty_sketches, fold_monthly_sketches,
+                            load_monthly_sketches, load_sketches, month_in_range)
+
+
+class SessionStorage:
+    """Base class for session storage backends
+
+    Sessions are exchanged as plain dicts in the same shape that
+    ForrestGumpTimer.load_all_sessions() has always returned. Backends only
+    need to implement append_many, load_all and load_range; the aggregate
+    queries fall back to summing in Python and can be overridden by backends
+    that can answer them more cheaply.
+    """
+
+    name = "base"
+
+    def append(self, session_dict: Dict) -> None:
+        """Persist a single finished session"""
+        self.append_many([session_dict])
+
+    def append_many(self, session_dicts: Iterable[Dict]) -> None:
+        """Persist several finished sessions in one write"""
+        raise NotImplementedError
+
+    def load_all(self) -> List[Dict]:
+        """Load every stored session, oldest first"""
+        raise NotImplementedError
+
+    def load_range(self, start: datetime.datetime, end: datetime.datetime) -> List[Dict]:
+        """Load sessions whose start_time falls in [start, end)"""
+        return [session for session in self.load_all()
+                if start <= datetime.datetime.fromisoformat(session["start_time"]) < end]
+
+    def is_empty(self) -> bool:
+        """True if no session has ever been stored"""
+        return not self.load_all()
+
+    def read_since(self, position: Optional[Dict]) -> Optional[Tuple[List[Dict], Dict]]:
+        """Sessions stored after a position returned by an earlier call
+
+        Returns (sessions, new_position); position None means from the
+        beginning. Returns None if the position no longer matches the stored
+        data (e.g. the files were replaced), in which case the caller should
+        start over from None. Positions are small JSON-serializable dicts.
+        """
+        sessions = self.load_all()
+        count = 0 if position is None else position.get("count", 0)
+        if count > len(sessions):
+            return None
+        return sessions[count:], {"count": len(sessions)}
+
+    def read_page(self, cursor: Optional[Dict], limit: int) -> Tuple[List[Dict], Optional[Dict]]:
+        """Up to limit sessions in storage order, starting at a cursor
+
+        Returns (sessions, next_cursor); cursor None means from the beginning
+        and next_cursor is None once the end of the stored data is reached.
+        Only the requested page is read, so walking the whole history page by
+        page keeps memory flat. Cursors are small JSON-serializable dicts;
+        raises ValueError for a cursor that no longer matches the stored data.
+        """
+        sessions = self.load_all()
+        count = 0 if cursor is None else cursor.get("count", 0)
+        if count > len(sessions):
+            raise ValueError("Stale cursor")
+        page = sessions[count:count + limit]
+        count += len(page)
+        return page, ({"count": count} if count < len(sessions) else None)
+
+    def signature(self) -> Tuple:
+        """Cheap fingerprint of the stored data that changes whenever it is written"""
+        return _stat_signature(self.files())
+
+    def files(self) -> List[str]:
+        """Files on disk that make up this backend"""
+        return []
+
+    def get_totals(self) -> Dict:
+        """Running totals (see TOTAL_KEYS) over all sessions"""
+        return self._sum_sessions(self.load_all())
+
+    def rebuild_totals(self) -> Dict:
+        """Recompute the totals from every stored session, repairing any persisted copy"""
+        return self._sum_sessions(self.load_all())
+
+    def get_range_totals(self, start: datetime.datetime, end: datetime.datetime) -> Dict:
+        """Running totals for sessions in [start, end)"""
+        return self._sum_sessions(self.load_range(start, end))
+
+    def get_monthly_totals(self) -> Dict[str, Dict]:
+        """Running totals per "YYYY-MM" month of start_time, oldest first"""
+        monthly = {}
+        for session in self.load_all():
+            key = session["start_time"][:7]
+            if key not in monthly:
+                monthly[key] = empty_totals()
+            add_to_totals(monthly[key], session)
+        return dict(sorted(monthly.items()))
+
+    def get_monthly_sketches(self, start_month: Optional[str] = None,
+                             end_month: Optional[str] = None) -> Dict[str, Dict[str, QuantileSketch]]:
+        """Quantile sketches (see session_sketch.SKETCH_FIELDS) per "YYYY-MM" month, oldest first
+
+        Only months in [start_month, end_month] are returned (None: unbounded).
+        The result belongs to the caller and may be merged into.
+        """
+        monthly = {}
+        for session in self.load_all():
+            key = session["start_time"][:7]
+            if month_in_range(key, start_month, end_month):
+                if key not in monthly:
+                    monthly[key] = empty_sketches()
+                add_session(monthly[key], session)
+        return dict(sorted(monthly.items()))
+
+    def get_daily_totals(self, start: datetime.datetime, end: datetime.datetime) -> Dict[int, Dict]:
+        """Per-day-of-month distance, time, sessions and calories for [start, end)"""
+        daily_data = {}
+        for session in self.load_range(start, end):
+            day_key = datetime.datetime.fromisoformat(session["start_time"]).day
+
+            if day_key not in daily_data:
+                daily_data[day_key] = {
+                    "distance": 0,
+                    "time": 0,
+                    "sessions": 0,
+                    "calories": 0
+                }
+
+            daily_data[day_key]["distance"] += session.get("distance_miles", 0)
+            daily_data[day_key]["time"] += session.get("running_time", 0)
+            daily_data[day_key]["sessions"] += 1
+            daily_data[day_key]["calories"] += session.get("calories", 0)
+
+        return daily_data
+
+    @staticmethod
+    def _sum_sessions(sessions: Iterable[Dict]) -> Dict:
+        totals = empty_totals()
+        for session in sessions:
+            add_to_totals(totals, session)
+        return totals
+
+
+# Sessions encoded per write when appending an iterable of sessions
+APPEND_CHUNK_SIZE = 10000
+
+TOTAL_KEYS = ("total_sessions", "total_running_time", "total_distance",
+              "total_calories", "total_breaks", "total_break_time")
+
+
+def empty_totals() -> Dict:
+    """Totals for a store with no sessions"""
+    return {key: 0 for key in TOTAL_KEYS}
+
+
+def add_to_totals(totals: Dict, session: Dict) -> None:
+    """Fold one session into a running totals dict"""
+    totals["total_sessions"] += 1
+    totals["total_running_time"] += session.get("running_time", 0)
+    totals["total_distance"] += session.get("distance_miles", 0)
+    totals["total_calories"] += session.get("calories", 0)
+    totals["total_breaks"] += len(session.get("breaks") or [])
+    totals["total_break_time"] += session.get("total_break_time", 0)
+
+
+class JsonLinesSessionStorage(SessionStorage):
+    """Append-only newline-delimited JSON log, one session per line"""
+
+    name = "ndjson"
+
+    def __init__(self, data_dir: str):
+        self.path = os.path.join(data_dir, "sessions.ndjson")
+        self.totals_file = os.path.join(data_dir, "sessions.totals.json")
+        self._totals_state: Optional[Dict] = None
+
+    def append_many(self, session_dicts: Iterable[Dict]) -> None:
+        """Append sessions to the log; only the new records are written
+
+        The sessions are encoded and written a chunk at a time, so an
+        iterator over a huge import never has to be held in memory.
+        """
+        chunks = _chunks(session_dicts, APPEND_CHUNK_SIZE)
+        first = next(chunks, None)
+        if first is None:
+            return
+
+        if not os.path.exists(self.path):
+            # Create the log under a temporary name so a crash never leaves half a history
+            tmp_file = self.path + ".tmp"
+            with open(tmp_file, 'w') as f:
+                _write_chunks(f, first, chunks)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.path)
+        else:
+            with open(self.path, 'a') as f:
+                _write_chunks(f, first, chunks)
+
+        self._update_totals()
+
+    def get_totals(self) -> Dict:
+        """Running totals, read from the sidecar file instead of the log"""
+        return dict(self._update_totals()["totals"])
+
+    def rebuild_totals(self) -> Dict:
+        state = {"inode": None, "offset": 0, "totals": empty_totals(), "sketches": {}}
+        return dict(self._update_totals(state)["totals"])
+
+    def get_monthly_sketches(self, start_month: Optional[str] = None,
+                             end_month: Optional[str] = None) -> Dict[str, Dict[str, QuantileSketch]]:
+        """Monthly sketches, kept in the sidecar file next to the totals"""
+        return load_monthly_sketches(self._update_totals()["sketches"], start_month, end_month)
+
+    def _update_totals(self, state: Optional[Dict] = None) -> Dict:
+        """Bring the persisted totals up to date with the end of the log
+
+        sessions.totals.json records the byte offset of the log it covers
+        (see _log_position) together with the totals and monthly quantile
+        sketches up to that offset. Normally the offset equals
+        the log size and nothing is read; after an append (by this or any other
+        process) only the new tail is parsed. The offset and totals are always
+        written together, so a stale sidecar just means re-reading a little
+        more of the tail, never double counting.
+        """
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return {"inode": None, "offset": 0, "totals": empty_totals(), "sketches": {}}
+
+        if state is None:
+            state = self._totals_state
+            if state is None or state["inode"] != st.st_ino or state["offset"] != st.st_size:
+                state = self._read_totals_file()
+
+        if state is None or not _log_position_valid(self.path, st, state):
+            # No sidecar yet, or the log was replaced or rewritten: start over from the beginning
+            state = {"inode": st.st_ino, "offset": 0, "totals": empty_totals(), "sketches": {}}
+
+        if state["offset"] < st.st_size or "mark" not in state:
+            state = _fold_log_tail(self.path, state, st)
+            self._write_totals_file(state)
+
+        self._totals_state = state
+        return state
+
+    def _read_totals_file(self) -> Optional[Dict]:
+        try:
+            with open(self.totals_file, 'r') as f:
+                state = json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            return None
+        if set(state.get("totals", {})) != set(TOTAL_KEYS) or "sketches" not in state:
+            return None
+        return state
+
+    def _write_totals_file(self, state: Dict) -> None:
+        # Also written from read paths without a lock, so every writer gets its own temp file
+        tmp_file = _tmp_path(self.totals_file)
+        with open(tmp_file, 'w') as f:
+            # One dumps() call runs the C encoder; dump() streams through the pure-Python one
+            f.write(json.dumps(state, separators=(",", ":")))
+        os.replace(tmp_file, self.totals_file)
+
+    def load_all(self) -> List[Dict]:
+        """Load all sessions from the session log"""
+        return _read_log(self.path)
+
+    def read_since(self, position: Optional[Dict]) -> Optional[Tuple[List[Dict], Dict]]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None if position else ([], {})
+        if position and not _log_position_valid(self.path, st, position):
+            return None
+        offset = position["offset"] if position else 0
+        sessions, offset = _read_log_tail(self.path, offset)
+        if position and offset == position["offset"]:
+            return sessions, position
+        return sessions, _log_position(self.path, st, offset)
+
+    def read_page(self, cursor: Optional[Dict], limit: int) -> Tuple[List[Dict], Optional[Dict]]:
+        """Page of the log from the cursor's byte offset (append order)"""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            if cursor:
+                raise ValueError("Stale cursor")
+            return [], None
+        if cursor and (cursor.get("inode") != st.st_ino or cursor.get("offset", 0) > st.st_size):
+            raise ValueError("Stale cursor")
+        sessions, offset = _read_log_page(self.path, cursor["offset"] if cursor else 0, limit)
+        # A short page means the end of the log (or a torn append still in progress)
+        more = len(sessions) == limit and offset < st.st_size
+        return sessions, ({"inode": st.st_ino, "offset": offset} if more else None)
+
+    def is_empty(self) -> bool:
+        return not os.path.exists(self.path)
+
+    def files(self) -> List[str]:
+        return [self.path]
+
+
+class SQLiteSessionStorage(SessionStorage):
+    """SQLite database with sessions and breaks in separate tables
+
+    start_time is stored as the same ISO string the JSON formats use, so an
+    index on it supports month and range scans by plain string comparison.
+    """
+
+    name = "sqlite"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            session_id TEXT PRIMARY KEY,
+            start_time TEXT NOT NULL,
+            end_time TEXT,
+            total_break_time INTEGER NOT NULL DEFAULT 0,
+            running_time REAL NOT NULL DEFAULT 0,
+            distance_miles REAL NOT NULL DEFAULT 0,
+            calories INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS idx_sessions_start_time ON sessions (start_time);
+        CREATE TABLE IF NOT EXISTS breaks (
+            session_id TEXT NOT NULL REFERENCES sessions (session_id),
+            position INTEGER NOT NULL,
+            minutes INTEGER NOT NULL,
+            seconds INTEGER NOT NULL,
+            total_seconds INTEGER NOT NULL,
+            timestamp TEXT,
+            PRIMARY KEY (session_id, position)
+        );
+        CREATE TABLE IF NOT EXISTS totals (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            total_sessions INTEGER NOT NULL,
+            total_running_time REAL NOT NULL,
+            total_distance REAL NOT NULL,
+            total_calories INTEGER NOT NULL,
+            total_breaks INTEGER NOT NULL,
+            total_break_time INTEGER NOT NULL
+        );
+        CREATE TRIGGER IF NOT EXISTS totals_session_insert AFTER INSERT ON sessions BEGIN
+            UPDATE totals SET
+                total_sessions = total_sessions + 1,
+                total_running_time = total_running_time + NEW.running_time,
+                total_distance = total_distance + NEW.distance_miles,
+                total_calories = total_calories + NEW.calories,
+                total_break_time = total_break_time + NEW.total_break_time
+            WHERE id = 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS totals_session_delete AFTER DELETE ON sessions BEGIN
+            UPDATE totals SET
+                total_sessions = total_sessions - 1,
+                total_running_time = total_running_time - OLD.running_time,
+                total_distance = total_distance - OLD.distance_miles,
+                total_calories = total_calories - OLD.calories,
+                total_break_time = total_break_time - OLD.total_break_time
+            WHERE id = 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS totals_break_insert AFTER INSERT ON breaks BEGIN
+            UPDATE totals SET total_breaks = total_breaks + 1 WHERE id = 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS totals_break_delete AFTER DELETE ON breaks BEGIN
+            UPDATE totals SET total_breaks = total_breaks - 1 WHERE id = 1;
+        END;
+        CREATE TABLE IF NOT EXISTS sketches (
+            month TEXT PRIMARY KEY,
+            sketches TEXT NOT NULL
+        );
+    """
+
+    TOTALS_QUERY = """
+        SELECT COUNT(*), COALESCE(SUM(running_time), 0), COALESCE(SUM(distance_miles), 0),
+               COALESCE(SUM(calories), 0),
+               (SELECT COUNT(*) FROM breaks JOIN sessions USING (session_id) {where}),
+               COALESCE(SUM(total_break_time), 0)
+        FROM sessions {where}
+    """
+
+    SESSION_COLUMNS = ("session_id", "start_time", "end_time", "total_break_time",
+                       "running_time", "distance_miles", "calories")
+    COLUMN_DEFAULTS = {"total_break_time": 0, "running_time": 0, "distance_miles": 0.0, "calories": 0}
+
+    def __init__(self, data_dir: str):
+        self.path = os.path.join(data_dir, "sessions.db")
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self.SCHEMA)
+            if conn.execute("SELECT 1 FROM totals").fetchone() is None:
+                # Databases created before the totals table: seed it once
+                self._write_totals(conn, self._totals_where(conn, "", ()))
+                conn.commit()
+            if (conn.execute("SELECT 1 FROM sketches LIMIT 1").fetchone() is None
+                    and conn.execute("SELECT 1 FROM sessions LIMIT 1").fetchone() is not None):
+                # Likewise for databases created before the sketches table
+                self._rebuild_sketches(conn)
+                conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        # A short-lived connection per call keeps the backend safe to use from
+        # Flask's request threads and the GUI's update thread alike
+        return sqlite3.connect(self.path, timeout=10)
+
+    def append_many(self, session_dicts: Iterable[Dict]) -> None:
+        """Insert sessions and their breaks in a single transaction
+
+        Rows are built and inserted a chunk at a time inside that one
+        transaction, so memory stays flat however many sessions are given.
+        The monthly sketches of the months written to are updated in the
+        same transaction.
+        """
+        with closing(self._connect()) as conn, conn:
+            for chunk in _chunks(session_dicts, APPEND_CHUNK_SIZE):
+                last_rowid = conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM sessions").fetchone()[0]
+                session_rows = [tuple(session.get(column, self.COLUMN_DEFAULTS.get(column))
+                                      for column in self.SESSION_COLUMNS) for session in chunk]
+
+                # Triggers keep the totals row in step inside the same transaction;
+                # a session_id that is already stored is left untouched
+                conn.executemany(
+                    "INSERT OR IGNORE INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?)", session_rows)
+
+                # Breaks go in only with a session row inserted just now (new rows
+                # get rowids past last_rowid), from the copy of it that was inserted
+                pending = {row[0] for row in conn.execute(
+                    "SELECT session_id FROM sessions WHERE rowid > ?", (last_rowid,))}
+                break_rows = []
+                for session in chunk:
+                    if session["session_id"] not in pending:
+                        continue
+                    pending.discard(session["session_id"])
+                    for position, break_data in enumerate(session.get("breaks") or []):
+                        break_rows.append((
+                            session["session_id"],
+                            position,
+                            break_data.get("minutes", 0),
+                            break_data.get("seconds", 0),
+                            break_data.get("total_seconds", 0),
+                            break_data.get("timestamp")
+                        ))
+                conn.executemany(
+                    "INSERT OR IGNORE INTO breaks VALUES (?, ?, ?, ?, ?, ?)", break_rows)
+                # Sketch only the rows actually inserted (ignored duplicates are already counted)
+                self._fold_sketches(conn, last_rowid)
+
+    def load_all(self) -> List[Dict]:
+        return self._load_where("", ())
+
+    def load_range(self, start: datetime.datetime, end: datetime.datetime) -> List[Dict]:
+        return self._load_where("WHERE start_time >= ? AND start_time < ?",
+                                (start.isoformat(), end.isoformat()))
+
+    def read_since(self, position: Optional[Dict]) -> Optional[Tuple[List[Dict], Dict]]:
+        # Rows are only ever inserted, so rowid order is arrival order
+        # The position also names the session at its rowid: rowids of deleted
+        # rows are handed out again, so a matching rowid alone proves nothing
+        last_rowid = position["rowid"] if position else 0
+        with closing(self._connect()) as conn:
+            max_rowid = conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM sessions").fetchone()[0]
+            if last_rowid > max_rowid:
+                return None
+            if position and position.get("session_id") is not None:
+                if self._session_id_at(conn, last_rowid) != position["session_id"]:
+                    return None
+            last_session_id = self._session_id_at(conn, max_rowid)
+        sessions = self._load_where("WHERE sessions.rowid > ? AND sessions.rowid <= ?",
+                                    (last_rowid, max_rowid))
+        return sessions, {"rowid": max_rowid, "session_id": last_session_id}
+
+    @staticmethod
+    def _session_id_at(conn: sqlite3.Connection, rowid: int) -> Optional[str]:
+        row = conn.execute("SELECT session_id FROM sessions WHERE rowid = ?", (rowid,)).fetchone()
+        return row[0] if row else None
+
+    def read_page(self, cursor: Optional[Dict], limit: int) -> Tuple[List[Dict], Optional[Dict]]:
+        """Page of sessions in insertion (rowid) order"""
+        last_rowid = cursor.get("rowid", 0) if cursor else 0
+        with closing(self._connect()) as conn:
+            rowids = [row[0] for row in conn.execute(
+                "SELECT rowid FROM sessions WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                (last_rowid, limit + 1))]
+        if not rowids:
+            return [], None
+        page_end = rowids[min(limit, len(rowids)) - 1]
+        sessions = self._load_where("WHERE sessions.rowid > ? AND sessions.rowid <= ?",
+                                    (last_rowid, page_end), order="sessions.rowid")
+        return sessions, ({"rowid": page_end} if len(rowids) > limit else None)
+
+    def is_empty(self) -> bool:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT 1 FROM sessions LIMIT 1").fetchone() is None
+
+    def files(self) -> List[str]:
+        # Committed writes land in the WAL first and reach the main file on checkpoint
+        return [self.path, self.path + "-wal"]
+
+    def get_totals(self) -> Dict:
+        with closing(self._connect()) as conn:
+            row = conn.execute(f"SELECT {', '.join(TOTAL_KEYS)} FROM totals").fetchone()
+        return dict(zip(TOTAL_KEYS, row))
+
+    def rebuild_totals(self) -> Dict:
+        with closing(self._connect()) as conn, conn:
+            totals = self._totals_where(conn, "", ())
+            self._write_totals(conn, totals)
+            self._rebuild_sketches(conn)
+        return totals
+
+    def get_monthly_sketches(self, start_month: Optional[str] = None,
+                             end_month: Optional[str] = None) -> Dict[str, Dict[str, QuantileSketch]]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT month, sketches FROM sketches "
+                "WHERE month >= COALESCE(?, month) AND month <= COALESCE(?, month) ORDER BY month",
+                (start_month, end_month)).fetchall()
+        return {month: load_sketches(json.loads(sketches)) for month, sketches in rows}
+
+    def get_range_totals(self, start: datetime.datetime, end: datetime.datetime) -> Dict:
+        with closing(self._connect()) as conn:
+            return self._totals_where(conn, "WHERE start_time >= ? AND start_time < ?",
+                                      (start.isoformat(), end.isoformat()))
+
+    def get_daily_totals(self, start: datetime.datetime, end: datetime.datetime) -> Dict[int, Dict]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT CAST(substr(start_time, 9, 2) AS INTEGER) AS day, "
+                "SUM(distance_miles), SUM(running_time), COUNT(*), SUM(calories) "
+                "FROM sessions WHERE start_time >= ? AND start_time < ? "
+                "GROUP BY day ORDER BY day",
+                (start.isoformat(), end.isoformat())).fetchall()
+
+        return {
+            day: {"distance": distance, "time": time, "sessions": count, "calories": calories}
+            for day, distance, time, count, calories in rows
+        }
+
+    def _totals_where(self, conn: sqlite3.Connection, where: str, params: tuple) -> Dict:
+        row = conn.execute(self.TOTALS_QUERY.format(where=where), params + params).fetchone()
+        return dict(zip(TOTAL_KEYS, row))
+
+    @staticmethod
+    def _fold_sketches(conn: sqlite3.Connection, after_rowid: int) -> None:
+        """Add the sessions with rowid > after_rowid to their months' sketches"""
+        sessions = {}
+        for session_id, start_time, running_time, distance in conn.execute(
+                "SELECT session_id, start_time, running_time, distance_miles FROM sessions "
+                "WHERE rowid > ?", (after_rowid,)):
+            sessions[session_id] = {"start_time": start_time, "running_time": running_time,
+                                    "distance_miles": distance, "breaks": []}
+        if not sessions:
+            return
+        for session_id, total_seconds in conn.execute(
+                "SELECT b.session_id, b.total_seconds FROM breaks b JOIN sessions USING (session_id) "
+                "WHERE sessions.rowid > ?", (after_rowid,)):
+            sessions[session_id]["breaks"].append({"total_seconds": total_seconds})
+
+        months = sorted({session["start_time"][:7] for session in sessions.values()})
+        stored = {}
+        for month, sketches in conn.execute(
+                f"SELECT month, sketches FROM sketches WHERE month IN ({', '.join('?' * len(months))})",
+                months):
+            stored[month] = json.loads(sketches)
+        folded = fold_monthly_sketches(stored, sessions.values())
+        conn.executemany("INSERT OR REPLACE INTO sketches VALUES (?, ?)",
+                         [(month, json.dumps(folded[month], separators=(",", ":"))) for month in months])
+
+    def _rebuild_sketches(self, conn: sqlite3.Connection) -> None:
+        conn.execute("DELETE FROM sketches")
+        self._fold_sketches(conn, 0)
+
+    @staticmethod
+    def _write_totals(conn: sqlite3.Connection, totals: Dict) -> None:
+        conn.execute(f"INSERT OR REPLACE INTO totals (id, {', '.join(TOTAL_KEYS)}) "
+                     "VALUES (1, ?, ?, ?, ?, ?, ?)", tuple(totals[key] for key in TOTAL_KEYS))
+
+    def _load_where(self, where: str, params: tuple, order: str = "start_time") -> List[Dict]:
+        with closing(self._connect()) as conn:
+            session_rows = conn.execute(
+                f"SELECT {', '.join(self.SESSION_COLUMNS)} FROM sessions {where} "
+                f"ORDER BY {order}", params).fetchall()
+            break_rows = conn.execute(
+                "SELECT b.session_id, b.minutes, b.seconds, b.total_seconds, b.timestamp "
+                f"FROM breaks b JOIN sessions USING (session_id) {where} "
+                "ORDER BY b.session_id, b.position", params).fetchall()
+
+        breaks_by_session = {}
+        for session_id, minutes, seconds, total_seconds, timestamp in break_rows:
+            breaks_by_session.setdefault(session_id, []).append({
+                "minutes": minutes,
+                "seconds": seconds,
+                "total_seconds": total_seconds,
+                "timestamp": timestamp
+            })
+
+        sessions = []
+        for row in session_rows:
+            session_id, start_time, end_time, total_break_time, running_time, distance, calories = row
+            sessions.append({
+                "session_id": session_id,
+                "start_time": start_time,
+                "end_time": end_time,
+                "breaks": breaks_by_session.get(session_id, []),
+                "total_break_time": total_break_time,
+                "running_time": running_time,
+                "distance_miles": distance,
+                "calories": calories
+            })
+        return sessions
+
+
+class PartitionedSessionStorage(SessionStorage):
+    """Session logs split by calendar month, plus a manifest of per-month totals
+
+    Layout::
+
+        data/sessions/2025-07.ndjson   one session per line, by start_time month
+        data/sessions/manifest.json    {"2025-07": {"inode", "offset", "totals", "sketches"}, ...}
+
+    A month query reads only that month's partition, and whole-month or
+    overall totals come straight from the manifest without opening any
+    partition. Manifest entries use the same byte-offset bookkeeping as the
+    single-log backend, so appends from other processes are folded in from
+    the partition tail.
+    """
+
+    name = "partitioned"
+
+    PARTITION_SUFFIX = ".ndjson"
+    MAX_CACHED_PARTITIONS = 12
+
+    def __init__(self, data_dir: str):
+        self.directory = os.path.join(data_dir, "sessions")
+        self.manifest_file = os.path.join(self.directory, "manifest.json")
+        self._manifest: Optional[Dict] = None
+        self._manifest_signature = None
+        self._partition_cache: Dict[str, Tuple] = {}
+
+    @staticmethod
+    def partition_key(start_time: str) -> str:
+        """Partition name ("YYYY-MM") for an ISO start_time, without parsing it"""
+        return start_time[:7]
+
+    def partition_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.PARTITION_SUFFIX)
+
+    def partition_keys(self) -> List[str]:
+        """Names of the partitions on disk, oldest first"""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name[:-len(self.PARTITION_SUFFIX)] for name in names
+                      if name.endswith(self.PARTITION_SUFFIX))
+
+    def append_many(self, session_dicts: Iterable[Dict]) -> None:
+        """Append each session to its month's partition
+
+        Sessions are grouped and written a chunk at a time, with each month's
+        file kept open across chunks, so a long import stays flat in memory
+        and opens every partition once.
+        """
+        chunks = _chunks(session_dicts, APPEND_CHUNK_SIZE)
+        first = next(chunks, None)
+        if first is None:
+            return
+
+        creating = not os.path.isdir(self.directory)
+        target = self.directory
+        if creating:
+            # First write (usually the migration): build the whole directory
+            # under a temporary name and rename it into place in one step
+            target = self.directory + ".tmp"
+            if os.path.isdir(target):
+                for name in os.listdir(target):
+                    os.remove(os.path.join(target, name))
+            os.makedirs(target, exist_ok=True)
+
+        files = {}
+        try:
+            for chunk in itertools.chain([first], chunks):
+                payloads: Dict[str, List[str]] = {}
+                for session in chunk:
+                    key = self.partition_key(session["start_time"])
+                    payloads.setdefault(key, []).append(encode_record(session) + "\n")
+                for key, lines in payloads.items():
+                    if key not in files:
+                        files[key] = open(os.path.join(target, key + self.PARTITION_SUFFIX), 'a')
+                    files[key].write("".join(lines))
+            if creating:
+                for f in files.values():
+                    f.flush()
+                    os.fsync(f.fileno())
+        finally:
+            for f in files.values():
+                f.close()
+
+        if creating:
+            os.rename(target, self.directory)
+        self._refresh_manifest(list(files))
+
+    def load_all(self) -> List[Dict]:
+        sessions = []
+        for key in self.partition_keys():
+            sessions.extend(self._read_partition(key))
+        return sessions
+
+    def load_range(self, start: datetime.datetime, end: datetime.datetime) -> List[Dict]:
+        """Read only the partitions that overlap [start, end)"""
+        first_key = start.strftime("%Y-%m")
+        last_key = (end - datetime.timedelta(microseconds=1)).strftime("%Y-%m")
+        sessions = []
+        for key in self.partition_keys():
+            if first_key <= key <= last_key:
+                sessions.extend(session for session in self._read_partition(key)
+                                if start <= datetime.datetime.fromisoformat(session["start_time"]) < end)
+        return sessions
+
+    def is_empty(self) -> bool:
+        return not os.path.isdir(self.directory)
+
+    def read_since(self, position: Optional[Dict]) -> Optional[Tuple[List[Dict], Dict]]:
+        """Tail of every partition past its recorded {inode, offset}"""
+        position = position or {}
+        keys = self.partition_keys()
+        if set(position) - set(keys):
+            return None
+
+        sessions = []
+        new_position = {}
+        for key in keys:
+            path = self.partition_path(key)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                return None
+            entry = position.get(key)
+            if entry and not _log_position_valid(path, st, entry):
+                return None
+            offset = entry["offset"] if entry else 0
+            if offset < st.st_size:
+                tail, offset = _read_log_tail(path, offset)
+                sessions.extend(tail)
+            new_position[key] = entry if entry and offset == entry["offset"] else _log_position(path, st, offset)
+        return sessions, new_position
+
+    def read_page(self, cursor: Optional[Dict], limit: int) -> Tuple[List[Dict], Optional[Dict]]:
+        """Page of sessions, partition by partition from the cursor's {key, inode, offset}
+
+        Partitions are read through _read_log_page rather than the partition
+        cache, so a full export never holds more than one page in memory.
+        """
+        keys = [key for key in self.partition_keys() if not cursor or key >= cursor["key"]]
+        sessions = []
+        for i, key in enumerate(keys):
+            path = self.partition_path(key)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                raise ValueError("Stale cursor")
+            offset = 0
+            if cursor and key == cursor["key"]:
+                if cursor.get("inode") != st.st_ino or cursor.get("offset", 0) > st.st_size:
+                    raise ValueError("Stale cursor")
+                offset = cursor["offset"]
+            elif cursor and i == 0:
+                raise ValueError("Stale cursor")  # the cursor's partition is gone
+
+            tail, offset = _read_log_page(path, offset, limit - len(sessions))
+            sessions.extend(tail)
+            if len(sessions) >= limit:
+                if offset < st.st_size or i + 1 < len(keys):
+                    return sessions, {"key": key, "inode": st.st_ino, "offset": offset}
+                break
+        return sessions, None
+
+    def files(self) -> List[str]:
+        return [self.partition_path(key) for key in self.partition_keys()]
+
+    def get_totals(self) -> Dict:
+        """Overall totals, summed over the manifest's per-month entries"""
+        totals = empty_totals()
+        for entry in self._refresh_manifest().values():
+            for key in TOTAL_KEYS:
+                totals[key] += entry["totals"][key]
+        return totals
+
+    def rebuild_totals(self) -> Dict:
+        self._write_manifest({})
+        self._manifest = None
+        return self.get_totals()
+
+    def get_range_totals(self, start: datetime.datetime, end: datetime.datetime) -> Dict:
+        if self._is_whole_months(start, end):
+            totals = empty_totals()
+            first_key, last_key = start.strftime("%Y-%m"), end.strftime("%Y-%m")
+            for key, entry in self._refresh_manifest().items():
+                if first_key <= key < last_key:
+                    for total_key in TOTAL_KEYS:
+                        totals[total_key] += entry["totals"][total_key]
+            return totals
+        return super().get_range_totals(start, end)
+
+    def get_monthly_totals(self) -> Dict[str, Dict]:
+        """Totals per "YYYY-MM" month, straight from the manifest"""
+        return {key: dict(entry["totals"]) for key, entry in sorted(self._refresh_manifest().items())}
+
+    def get_monthly_sketches(self, start_month: Optional[str] = None,
+                             end_month: Optional[str] = None) -> Dict[str, Dict[str, QuantileSketch]]:
+        """Monthly sketches, straight from the manifest"""
+        return {key: load_sketches(entry["sketches"].get(key))
+                for key, entry in sorted(self._refresh_manifest().items())
+                if month_in_range(key, start_month, end_month)}
+
+    @staticmethod
+    def _is_whole_months(start: datetime.datetime, end: datetime.datetime) -> bool:
+        return (start == datetime.datetime(start.year, start.month, 1)
+                and end == datetime.datetime(end.year, end.month, 1))
+
+    def _read_partition(self, key: str) -> List[Dict]:
+        # Recently read partitions are kept until their file changes, so a month
+        # view that asks for sessions and then daily totals parses it only once
+        path = self.partition_path(key)
+        signature = _stat_signature([path])
+        cached = self._partition_cache.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        sessions = _read_log(path)
+        if len(self._partition_cache) >= self.MAX_CACHED_PARTITIONS:
+            self._partition_cache.pop(next(iter(self._partition_cache)))
+        self._partition_cache[key] = (signature, sessions)
+        return sessions
+
+    def _refresh_manifest(self, keys: Optional[List[str]] = None) -> Dict:
+        """Fold any partition tails the manifest does not cover yet
+
+        keys limits the check to partitions this process just wrote; by
+        default every partition is stat()ed so writes by other processes
+        (and appends a crash left unaccounted) are picked up too.
+        """
+        manifest = self._load_manifest()
+        on_disk = self.partition_keys()
+        changed = False
+
+        for key in on_disk if keys is None else keys:
+            path = self.partition_path(key)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entry = manifest.get(key)
+            if (entry is not None and entry["inode"] == st.st_ino and entry["offset"] == st.st_size
+                    and entry.get("mtime") == st.st_mtime_ns):
+                continue
+            if entry is None or not _log_position_valid(path, st, entry):
+                entry = {"inode": st.st_ino, "offset": 0, "totals": empty_totals(), "sketches": {}}
+            manifest[key] = _fold_log_tail(path, entry, st)
+            changed = True
+
+        if keys is None:
+            for key in set(manifest) - set(on_disk):
+                del manifest[key]
+                changed = True
+
+        if changed:
+            self._write_manifest(manifest)
+        return manifest
+
+    def _load_manifest(self) -> Dict:
+        signature = _stat_signature([self.manifest_file])
+        if self._manifest is not None and signature == self._manifest_signature:
+            return self._manifest
+        try:
+            with open(self.manifest_file, 'r') as f:
+                manifest = json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            manifest = {}
+        # Entries from an older set of total keys (or without sketches) are recomputed from scratch
+        manifest = {key: entry for key, entry in manifest.items()
+                    if set(entry.get("totals", {})) == set(TOTAL_KEYS) and "sketches" in entry}
+        self._manifest = manifest
+        self._manifest_signature = signature
+        return manifest
+
+    def _write_manifest(self, manifest: Dict) -> None:
+        if not os.path.isdir(self.directory):
+            return
+        # Also written from read paths without a lock, so every writer gets its own temp file
+        tmp_file = _tmp_path(self.manifest_file)
+        with open(tmp_file, 'w') as f:
+            # Compact, so the C encoder handles the monthly sketches (indent= would not)
+            f.write(json.dumps(manifest, sort_keys=True, separators=(",", ":")))
+        os.replace(tmp_file, self.manifest_file)
+        self._manifest = manifest
+        self._manifest_signature = _stat_signature([self.manifest_file])
+
+
+class CachedSessionStorage(SessionStorage):
+    """Keeps the parsed sessions of another backend in memory
+
+    The cache is validated against the backend's file signature (mtime, size
+    and inode), so writes made by other processes - the GUI, the web app and
+    the dashboard all share one data directory - are picked up on the next
+    read. data_version increases every time the stored data changes.
+
+    Queries the wrapped backend answers itself (e.g. SQL aggregation) are
+    passed straight through; the generic fallbacks run over the cached list.
+    Every read from the backend is reported to read_observer(operation,
+    seconds) when one is set (see session_metrics.instrument_storage).
+    """
+
+    read_observer: Optional[Callable[[str, float], None]] = None
+
+    def __init__(self, backend: SessionStorage):
+        self.backend = backend
+        self.name = backend.name
+        self.data_version = 0
+        self._lock = threading.Lock()
+        self._signature = backend.signature()
+        self._sessions: Optional[List[Dict]] = None
+
+    def refresh(self) -> int:
+        """Drop the cached sessions if the files changed on disk; returns data_version"""
+        signature = self.backend.signature()
+        with self._lock:
+            if signature != self._signature:
+                self._signature = signature
+                self._sessions = None
+                self.data_version += 1
+            return self.data_version
+
+    def tag(self) -> str:
+        """Fingerprint of the stored data that is the same in every process"""
+        self.refresh()
+        return format(zlib.crc32(repr(self._signature).encode()), "08x")
+
+    def last_modified(self) -> Optional[float]:
+        """Epoch seconds of the most recent write to the stored data"""
+        self.refresh()
+        mtimes = [entry[0] for entry in self._signature if entry is not None]
+        return max(mtimes) / 1e9 if mtimes else None
+
+    def invalidate(self) -> None:
+        """Forget the cached sessions after a write made through this process"""
+        signature = self.backend.signature()
+        with self._lock:
+            self._signature = signature
+            self._sessions = None
+            self.data_version += 1
+
+    def append_many(self, session_dicts: Iterable[Dict]) -> None:
+        try:
+            self.backend.append_many(session_dicts)
+        finally:
+            self.invalidate()
+
+    def load_all(self) -> List[Dict]:
+        """Cached copy of all sessions; the session dicts are shared and must not be mutated"""
+        self.refresh()
+        with self._lock:
+            if self._sessions is None:
+                self._sessions = self._read("load_all")
+            return list(self._sessions)
+
+    def load_range(self, start: datetime.datetime, end: datetime.datetime) -> List[Dict]:
+        if self._backend_overrides("load_range"):
+            return self._read("load_range", start, end)
+        return super().load_range(start, end)
+
+    def is_empty(self) -> bool:
+        return self._read("is_empty")
+
+    def read_since(self, position: Optional[Dict]) -> Optional[Tuple[List[Dict], Dict]]:
+        return self._read("read_since", position)
+
+    def read_page(self, cursor: Optional[Dict], limit: int) -> Tuple[List[Dict], Optional[Dict]]:
+        # Straight from the backend: pages are meant to bypass the full in-memory copy
+        return self._read("read_page", cursor, limit)
+
+    def signature(self) -> Tuple:
+        return self.backend.signature()
+
+    def files(self) -> List[str]:
+        return self.backend.files()
+
+    def get_totals(self) -> Dict:
+        if self._backend_overrides("get_totals"):
+            return self._read("get_totals")
+        return super().get_totals()
+
+    def rebuild_totals(self) -> Dict:
+        # Always recomputed by the backend itself, never from the cached copy
+        return self._read("rebuild_totals")
+
+    def get_range_totals(self, start: datetime.datetime, end: datetime.datetime) -> Dict:
+        if self._backend_overrides("get_range_totals"):
+            return self._read("get_range_totals", start, end)
+        return super().get_range_totals(start, end)
+
+    def get_monthly_totals(self) -> Dict[str, Dict]:
+        if self._backend_overrides("get_monthly_totals"):
+            return self._read("get_monthly_totals")
+        return super().get_monthly_totals()
+
+    def get_monthly_sketches(self, start_month: Optional[str] = None,
+                             end_month: Optional[str] = None) -> Dict[str, Dict[str, QuantileSketch]]:
+        if self._backend_overrides("get_monthly_sketches"):
+            return self._read("get_monthly_sketches", start_month, end_month)
+        return super().get_monthly_sketches(start_month, end_month)
+
+    def get_daily_totals(self, start: datetime.datetime, end: datetime.datetime) -> Dict[int, Dict]:
+        if self._backend_overrides("get_daily_totals"):
+            return self._read("get_daily_totals", start, end)
+        return super().get_daily_totals(start, end)
+
+    def _read(self, operation: str, *args):
+        observer = type(self).read_observer
+        if observer is None:
+            return getattr(self.backend, operation)(*args)
+        started = time.perf_counter()
+        try:
+            return getattr(self.backend, operation)(*args)
+        finally:
+            observer(operation, time.perf_counter() - started)
+
+    def _backend_overrides(self, method: str) -> bool:
+        return getattr(type(self.backend), method) is not getattr(SessionStorage, method)
+
+
+def _tmp_path(path: str) -> str:
+    """Temporary name for a new version of path, unique to this process and thread"""
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[List]:
+    """Consecutive lists of up to size items"""
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _write_chunks(f, first: List[Dict], rest: Iterator[List[Dict]]) -> None:
+    """Write chunks of sessions to an open log, one encoded line each"""
+    for chunk in itertools.chain([first], rest):
+        f.write("".join(encode_record(session) + "\n" for session in chunk))
+
+
+def _read_log(path: str) -> List[Dict]:
+    """Parse a newline-delimited session log"""
+    sessions = []
+    try:
+        with open(path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    sessions.append(decode_record(line))
+                except json.JSONDecodeError:
+                    # A torn trailing line from an interrupted append
+                    continue
+    except FileNotFoundError:
+        return []
+
+    return sessions
+
+
+def _read_log_tail(path: str, offset: int) -> Tuple[List[Dict], int]:
+    """Complete session lines of a log from a byte offset, and the offset after them"""
+    sessions = []
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                # Incomplete append still in progress; pick it up next time
+                break
+            offset += len(line)
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                sessions.append(decode_record(line.decode("utf-8")))
+            except json.JSONDecodeError:
+                continue
+    return sessions, offset
+
+
+def _read_log_page(path: str, offset: int, limit: int) -> Tuple[List[Dict], int]:
+    """Up to limit complete session lines of a log from a byte offset, and the offset after them"""
+    sessions = []
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        while len(sessions) < limit:
+            line = f.readline()
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                sessions.append(decode_record(line.decode("utf-8")))
+            except json.JSONDecodeError:
+                continue
+    return sessions, offset
+
+
+# Bytes just before a log position whose checksum is recorded with it
+LOG_MARK_BYTES = 64
+
+
+def _log_mark(path: str, offset: int) -> int:
+    """Checksum of the bytes just before offset in a log"""
+    if offset <= 0:
+        return 0
+    with open(path, 'rb') as f:
+        f.seek(max(0, offset - LOG_MARK_BYTES))
+        return zlib.crc32(f.read(min(offset, LOG_MARK_BYTES)))
+
+
+def _log_position(path: str, st: os.stat_result, offset: int) -> Dict:
+    """Position after reading a log up to offset: {inode, offset, mark, mtime}"""
+    return {"inode": st.st_ino, "offset": offset, "mark": _log_mark(path, offset), "mtime": st.st_mtime_ns}
+
+
+def _log_position_valid(path: str, st: os.stat_result, position: Dict) -> bool:
+    """True if a position from _log_position() still points into the same log
+
+    The inode and length catch a replaced or shortened file; the mark also
+    catches one truncated and written again since, even once it has grown
+    back past the position. It is only re-read if the file was modified.
+    """
+    if position.get("inode") != st.st_ino or position.get("offset", 0) > st.st_size:
+        return False
+    if "mark" not in position or position.get("mtime") == st.st_mtime_ns:
+        # Untouched since, or recorded before marks were kept
+        return True
+    return position["mark"] == _log_mark(path, position["offset"])
+
+
+def _fold_log_tail(path: str, state: Dict, st: os.stat_result) -> Dict:
+    """Add the sessions past state["offset"] in a log to state["totals"] and state["sketches"]
+
+    The result is the log position reached (see _log_position) plus the
+    totals and sketches up to it.
+    """
+    totals = dict(state["totals"])
+    sessions, offset = _read_log_tail(path, state["offset"])
+    for session in sessions:
+        add_to_totals(totals, session)
+    sketches = fold_monthly_sketches(state["sketches"], sessions)
+    return {**_log_position(path, st, offset), "totals": totals, "sketches": sketches}
+
+
+def _stat_signature(paths: List[str]) -> Tuple:
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            signature.append((st.st_mtime_ns, st.st_size, st.st_ino))
+        except FileNotFoundError:
+            signature.append(None)
+    return tuple(signature)
+
+
+STORAGE_BACKENDS = {
+    JsonLinesSessionStorage.name: JsonLinesSessionStorage,
+    SQLiteSessionStorage.name: SQLiteSessionStorage,
+    PartitionedSessionStorage.name: PartitionedSessionStorage,
+}
+
+
+def create_storage(kind: str, data_dir: str) -> SessionStorage:
+    """Create a storage backend by name ("partitioned", "ndjson" or "sqlite")"""
+    if kind not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage backend: {kind}")
+    return STORAGE_BACKENDS[kind](data_dir)
@@ -0,0 +1,184 @@
+"""
+Forrest Gump Timer - Live Session Stream
+Server-Sent Events fan-out of session ticks, breaks and stop summaries
+"""
+
+import asyncio
+import json
+import queue
+import threading
+import time
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+
+
+def sse_frame(event: str, data: Dict) -> str:
+    """One Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+KEEPALIVE_FRAME = ": keep-alive\n\n"
+
+
+class Subscription:
+    """One connected client: a bounded queue of encoded SSE frames
+
+    A client that stops reading does not hold anyone else up: once its queue
+    is full the oldest frame is dropped (ticks are superseded by the next one
+    anyway).
+    """
+
+    def __init__(self, broadcaster: "SessionBroadcaster", max_queued: int):
+        self.broadcaster = broadcaster
+        self.frames = queue.Queue(maxsize=max_queued)
+        self.dropped = 0
+
+    def put(self, frame: str) -> None:
+        while True:
+            try:
+                self.frames.put_nowait(frame)
+                return
+            except queue.Full:
+                try:
+                    self.frames.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def __iter__(self) -> Iterator[str]:
+        """Frames as they arrive; unsubscribes when the client goes away"""
+        try:
+            while True:
+                yield self.frames.get()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self.broadcaster.unsubscribe(self)
+
+
+class AsyncSubscription(Subscription):
+    """Subscription read from an asyncio event loop instead of a thread
+
+    Frames are handed to the loop with call_soon_threadsafe, so a waiting
+    client costs no thread. Create it on the loop, then pass it to
+    SessionBroadcaster.subscribe().
+    """
+
+    def __init__(self, broadcaster: "SessionBroadcaster", max_queued: int,
+                 loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.broadcaster = broadcaster
+        self.loop = loop or asyncio.get_running_loop()
+        self.frames = asyncio.Queue(maxsize=max_queued)
+        self.dropped = 0
+
+    def put(self, frame: str) -> None:
+        try:
+            self.loop.call_soon_threadsafe(self._put_on_loop, frame)
+        except RuntimeError:
+            # The event loop has shut down: nobody is reading any more
+            self.close()
+
+    def _put_on_loop(self, frame: str) -> None:
+        if self.frames.full():
+            self.frames.get_nowait()
+            self.dropped += 1
+        self.frames.put_nowait(frame)
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        return self._frames()
+
+    async def _frames(self) -> AsyncIterator[str]:
+        try:
+            while True:
+                yield await self.frames.get()
+        finally:
+            self.close()
+
+
+class SessionBroadcaster:
+    """Pushes one timer's live stats to every subscriber
+
+    While anyone is subscribed, a single ticker thread calls
+    timer.get_session_stats() once per tick_interval, encodes the result once
+    and puts the same frame on every subscriber's queue, so the cost of a tick
+    does not grow with the number of clients. Break and stop events are
+    published by the timer itself as they happen. The thread exits when the
+    last subscriber leaves.
+
+    Events: "tick" (get_session_stats), "start" ({"session_id"}),
+    "break" ({"minutes", "seconds", "breaks_count"}) and "stop" (the summary
+    returned by stop_session). Idle streams get a keep-alive comment every
+    keepalive_interval seconds.
+    """
+
+    def __init__(self, timer, tick_interval: float = 1.0, keepalive_interval: float = 15.0,
+                 max_queued: int = 100):
+        self.timer = timer
+        self.tick_interval = tick_interval
+        self.keepalive_interval = keepalive_interval
+        self.max_queued = max_queued
+        self.tick_count = 0
+        self._lock = threading.Lock()
+        self._subscribers: List[Subscription] = []
+        self._thread: Optional[threading.Thread] = None
+        self._last_frame = 0.0
+
+    def subscribe(self, subscription: Optional[Subscription] = None) -> Subscription:
+        """Register a client (a new threaded Subscription unless one is given)"""
+        if subscription is None:
+            subscription = Subscription(self, self.max_queued)
+        with self._lock:
+            self._subscribers.append(subscription)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="session-stream", daemon=True)
+                self._thread.start()
+        # Send the current state straight away rather than after the first interval
+        stats = self.timer.get_session_stats()
+        if "error" not in stats:
+            subscription.put(sse_frame("tick", stats))
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event: str, data: Dict) -> None:
+        """Send an event to every subscriber (a no-op when nobody listens)"""
+        if self._subscribers:
+            self._broadcast(sse_frame(event, data))
+
+    def tick(self) -> None:
+        """Compute the live stats once and fan them out"""
+        # Asked even when no session is open here: a shared timer picks up
+        # a session another process started
+        stats = self.timer.get_session_stats()
+        if "error" not in stats:
+            self.tick_count += 1
+            self._broadcast(sse_frame("tick", stats))
+            return
+        if time.time() - self._last_frame >= self.keepalive_interval:
+            self._broadcast(KEEPALIVE_FRAME)
+
+    def _broadcast(self, frame: str) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.put(frame)
+        self._last_frame = time.time()
+
+    def _run(self) -> None:
+        next_tick = time.monotonic()
+        while True:
+            # Keep to the tick grid even when a tick runs long
+            next_tick += self.tick_interval
+            time.sleep(max(0.0, next_tick - time.monotonic()))
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+            self.tick()
@@ -0,0 +1,118 @@
+"""
+Forrest Gump Timer - Training Load
+Rolling 7/28/365-day mileage and acute/chronic load from a ring buffer of days
+"""
+
+import datetime
+from typing import Dict, List, Optional
+
+# Rolling windows reported, in days
+WINDOWS = (7, 28, 365)
+
+# Days kept in the ring buffer (the longest window)
+RING_DAYS = max(WINDOWS)
+
+# Acute and chronic load windows, in days
+ACUTE_DAYS = 7
+CHRONIC_DAYS = 28
+
+
+class RollingTotals:
+    """Distance, running time and sessions over the last 7, 28 and 365 days
+
+    One ring buffer slot per calendar day (slot = day ordinal % RING_DAYS)
+    and one running sum per window. Adding a session touches one slot and
+    the sums of the windows its day falls in; moving to a later day
+    subtracts the days that drop out of each window and clears their slots,
+    so keeping the windows current costs O(1) per session and per elapsed
+    day, never a pass over the history. Days are date.toordinal() values.
+    """
+
+    def __init__(self):
+        self.last_day: Optional[int] = None
+        self.slots: List[List] = [[0.0, 0.0, 0] for _ in range(RING_DAYS)]
+        self.sums: Dict[int, List] = {window: [0.0, 0.0, 0] for window in WINDOWS}
+
+    @classmethod
+    def from_daily(cls, daily: Dict[int, List]) -> "RollingTotals":
+        """Build from SessionIndex.daily ({day: [distance, time, sessions, calories]})"""
+        rolling = cls()
+        if daily:
+            last_day = max(daily)
+            rolling.last_day = last_day
+            for day in range(last_day - RING_DAYS + 1, last_day + 1):
+                values = daily.get(day)
+                if values is not None:
+                    rolling._add_in_window(day, values[0], values[1], values[2])
+        return rolling
+
+    def add(self, day: int, distance: float, time: float, sessions: int = 1) -> None:
+        """Fold one session (or day of sessions) into the windows"""
+        if self.last_day is None:
+            self.last_day = day
+        elif day > self.last_day:
+            self.advance(day)
+        elif day <= self.last_day - RING_DAYS:
+            return
+        self._add_in_window(day, distance, time, sessions)
+
+    def advance(self, day: int) -> None:
+        """Move the windows forward so they end on day"""
+        if self.last_day is None or day <= self.last_day:
+            return
+        if day - self.last_day >= RING_DAYS:
+            # Everything has dropped out of every window
+            self.slots = [[0.0, 0.0, 0] for _ in range(RING_DAYS)]
+            self.sums = {window: [0.0, 0.0, 0] for window in WINDOWS}
+            self.last_day = day
+            return
+        for current in range(self.last_day + 1, day + 1):
+            for window, sums in self.sums.items():
+                # The day leaving this window; still in the ring since window <= RING_DAYS
+                leaving = self.slots[(current - window) % RING_DAYS]
+                if leaving[2]:
+                    sums[0] -= leaving[0]
+                    sums[1] -= leaving[1]
+                    sums[2] -= leaving[2]
+                    if not sums[2]:
+                        # Empty window: drop the float residue of the subtractions
+                        sums[0] = sums[1] = 0.0
+            self.slots[current % RING_DAYS] = [0.0, 0.0, 0]
+        self.last_day = day
+
+    def windows(self, today: Optional[int] = None) -> Dict[str, Dict]:
+        """Totals per window ending on today (or the latest session day if later)"""
+        if today is not None:
+            self.advance(today)
+        return {f"{window}d": {"distance": sums[0], "time": sums[1], "sessions": sums[2]}
+                for window, sums in self.sums.items()}
+
+    def _add_in_window(self, day: int, distance: float, time: float, sessions: int) -> None:
+        slot = self.slots[day % RING_DAYS]
+        slot[0] += distance
+        slot[1] += time
+        slot[2] += sessions
+        age = self.last_day - day
+        for window, sums in self.sums.items():
+            if age < window:
+                sums[0] += distance
+                sums[1] += time
+                sums[2] += sessions
+
+
+def training_load(windows: Dict[str, Dict], as_of: datetime.date) -> Dict:
+    """Rolling mileage plus acute/chronic load from RollingTotals.windows()
+
+    Load is running time: acute is the last 7 days, chronic the weekly
+    average over the last 28. Their ratio is None until there is chronic
+    load to compare with.
+    """
+    acute = windows[f"{ACUTE_DAYS}d"]["time"]
+    chronic = windows[f"{CHRONIC_DAYS}d"]["time"] * ACUTE_DAYS / CHRONIC_DAYS
+    return {
+        "as_of": as_of.isoformat(),
+        "windows": windows,
+        "acute_load": acute,
+        "chronic_load": chronic,
+        "acute_chronic_ratio": acute / chronic if chronic > 0 else None
+    }
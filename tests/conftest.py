@@ -0,0 +1,20 @@
+"""
+Shared pytest setup for the Forrest Gump Timer tests
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The global timer (forrest_timer.timer, used by app.py) lives under ./data; keep it out of the checkout
+os.chdir(tempfile.mkdtemp(prefix="forrest_tests_"))
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """Empty data directory for one timer"""
+    return str(tmp_path / "data")
@@ -0,0 +1,110 @@
+"""
+Tests for the Flask API (app.py)
+"""
+
+import json
+import os
+from datetime import date, timedelta
+
+import pytest
+
+pytest.importorskip("flask")
+
+from app import app
+from forrest_timer import runners
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+def runner_dir_exists(runner_id: str) -> bool:
+    return os.path.isdir(runners.runner_dir(runner_id))
+
+
+@pytest.mark.parametrize("path", ["/api/overall_progress", "/api/session_stats", "/api/monthly_data/2024/1",
+                                  "/api/range?start=2024-01-01&end=2024-02-01", "/api/percentiles",
+                                  "/api/export_data", "/api/session_stream"])
+def test_reads_for_an_unknown_runner_are_404_and_create_nothing(client, path):
+    separator = "&" if "?" in path else "?"
+    with client.get(f"{path}{separator}runner=nobody") as response:
+        assert response.status_code == 404
+    with client.post("/api/stop_session", headers={"X-Runner-Id": "nobody"}) as response:
+        assert response.status_code == 404
+
+    assert not runner_dir_exists("nobody")
+    assert "nobody" not in runners.runner_ids()
+
+
+def test_start_session_and_batch_create_a_runner(client):
+    with client.post("/api/start_session?runner=newcomer") as response:
+        assert response.status_code == 200
+    with client.post("/api/stop_session?runner=newcomer") as response:
+        assert response.status_code == 200
+    with client.post("/api/batch?runner=offline", json={"operations": [
+            {"op": "start", "timestamp": 1_700_000_000}, {"op": "stop", "timestamp": 1_700_003_600}]}) as response:
+        assert response.status_code == 200
+
+    for runner_id in ("newcomer", "offline"):
+        assert runner_dir_exists(runner_id)
+        with client.get(f"/api/overall_progress?runner={runner_id}") as response:
+            assert response.status_code == 200
+            assert response.get_json()["data"]["total_sessions"] == 1
+
+
+def test_export_etag_follows_the_day_and_the_query(client):
+    with client.post("/api/batch?runner=exporter", json={"operations": [
+            {"op": "start", "timestamp": 1_700_000_000}, {"op": "stop", "timestamp": 1_700_003_600},
+            {"op": "start", "timestamp": 1_700_100_000}, {"op": "stop", "timestamp": 1_700_103_600}]}) as response:
+        assert response.status_code == 200
+    with client.get("/api/export_data?runner=exporter&limit=1") as response:
+        cursor = response.headers["X-Next-Cursor"]
+
+    etags = {}
+    for query in ("", "&format=ndjson", "&limit=1", "&limit=2", f"&limit=1&cursor={cursor}"):
+        with client.get(f"/api/export_data?runner=exporter{query}") as response:
+            assert response.status_code == 200
+            etags[query] = response.headers["ETag"]
+    with client.get("/api/overall_progress?runner=exporter") as response:
+        progress_etag = response.headers["ETag"]
+
+    assert len(set(etags.values())) == len(etags)
+    # Embeds overall_progress, so it goes stale with it (at midnight too)
+    assert etags[""] == progress_etag
+    with client.get("/api/export_data?runner=exporter&limit=1",
+                    headers={"If-None-Match": etags["&limit=1"]}) as response:
+        assert response.status_code == 304
+    with client.get("/api/export_data?runner=exporter&limit=2",
+                    headers={"If-None-Match": etags["&limit=1"]}) as response:
+        assert response.status_code == 200
+
+
+def test_range_without_end_runs_through_today_and_names_a_missing_start(client):
+    with client.get("/api/range?start=2025-01-01") as response:
+        assert response.status_code == 200
+        assert response.get_json()["data"]["end"] == (date.today() + timedelta(days=1)).isoformat()
+    with client.get("/api/range?end=2025-01-01") as response:
+        assert response.status_code == 400
+        assert response.get_json()["error"] == "Missing start date (YYYY-MM-DD)"
+
+
+def test_export_pages_through_link_headers_and_rejects_a_bad_limit(client):
+    with client.post("/api/batch?runner=pager", json={"operations": [
+            {"op": op, "timestamp": 1_700_000_000 + day * 86400 + (3600 if op == "stop" else 0)}
+            for day in range(5) for op in ("start", "stop")]}) as response:
+        assert response.status_code == 200
+
+    seen = []
+    url = "/api/export_data?runner=pager&limit=2&format=ndjson"
+    while url:
+        with client.get(url) as response:
+            assert response.status_code == 200
+            seen += [json.loads(line)["session_id"] for line in response.get_data(as_text=True).splitlines()]
+            url = response.headers.get("Link", "").partition(">")[0][1:]
+    assert len(seen) == len(set(seen)) == 5
+
+    for limit in ("abc", "2.5", ""):
+        with client.get(f"/api/export_data?runner=pager&limit={limit}") as response:
+            assert response.status_code == 400
+            assert response.get_json()["error"] == f"Invalid limit: {limit} (use a whole number)"
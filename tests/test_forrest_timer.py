@@ -0,0 +1,167 @@
+"""
+Tests for ForrestGumpTimer
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from forrest_timer import ForrestGumpTimer, RunnerRegistry, UnknownRunnerError
+from session_records import session_from_record, session_to_record
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# One of several processes sharing a timer: starts, breaks and stops (each of
+# which may find another process got there first) and sends offline batches;
+# prints the ids of the sessions it stopped
+SHARED_WRITER = """
+import json, sys
+sys.path.insert(0, {repo!r})
+from forrest_timer import ForrestGumpTimer
+timer = ForrestGumpTimer({data_dir!r}, storage={storage!r}, shared=True)
+stopped = []
+for i in range({rounds}):
+    start = 1_600_000_000 + ({worker} * {rounds} + i) * 7200
+    try:
+        timer.start_session(timestamp=start)
+    except ValueError:
+        pass
+    try:
+        timer.add_break(0, 5)
+    except ValueError:
+        pass
+    try:
+        stopped.append(timer.stop_session()["session_id"])
+    except ValueError:
+        pass
+    batch_start = start + 1_000_000_000
+    for result in timer.apply_batch([{{"op": "start", "timestamp": batch_start}},
+                                     {{"op": "stop", "timestamp": batch_start + 600}}]):
+        if result["op"] == "stop" and result["success"] and not result["duplicate"]:
+            stopped.append(result["data"]["session_id"])
+print(json.dumps(stopped))
+"""
+
+
+def test_recovers_session_stopped_but_not_stored(data_dir):
+    timer = ForrestGumpTimer(data_dir)
+    timer.start_session(timestamp=1_700_000_000)
+    timer._finish_session(1_700_003_600)
+    record = session_to_record(timer.current_session)
+    # The process dies between journaling the stop and writing to storage
+    timer.journal.record_stop(record)
+    timer.journal.close()
+
+    recovered = ForrestGumpTimer(data_dir)
+
+    assert recovered.current_session is None
+    assert recovered.has_session(record["session_id"])
+    assert recovered.get_overall_progress()["total_sessions"] == 1
+    assert not os.path.exists(recovered.journal.path)
+
+
+def test_batch_skips_breaks_and_stop_of_a_failed_start(data_dir):
+    timer = ForrestGumpTimer(data_dir)
+    open_id = timer.start_session(timestamp=1_700_100_000)
+
+    results = timer.apply_batch([
+        {"op": "start", "timestamp": 1_700_000_000},
+        {"op": "break", "minutes": 5, "timestamp": 1_700_000_600},
+        {"op": "stop", "timestamp": 1_700_003_600},
+        {"op": "break", "minutes": 1, "timestamp": 1_700_100_060},
+    ])
+
+    assert [result["success"] for result in results] == [False, False, False, True]
+    # The open session only got the break sent after the failed session's stop
+    assert timer.current_session.session_id == open_id
+    assert len(timer.current_session.breaks) == 1
+    assert timer.get_overall_progress()["total_sessions"] == 0
+
+
+def test_batch_rejects_breaks_outside_the_session(data_dir):
+    timer = ForrestGumpTimer(data_dir)
+
+    results = timer.apply_batch([
+        {"op": "start", "timestamp": 1_700_000_000},
+        {"op": "break", "minutes": 5, "timestamp": 1_699_999_000},
+        {"op": "break", "minutes": 5, "timestamp": 1_700_009_000},
+        {"op": "stop", "timestamp": 1_700_003_600},
+    ])
+
+    assert [result["success"] for result in results] == [True, False, True, False]
+    assert timer.current_session is not None
+    assert timer.get_overall_progress()["total_sessions"] == 0
+
+
+def test_runner_ids_skip_entries_that_are_not_runner_ids(data_dir):
+    registry = RunnerRegistry(data_dir)
+    registry.get("alice", create=True)
+    runners_dir = os.path.join(data_dir, "runners")
+    os.makedirs(os.path.join(runners_dir, "bob"))
+    os.makedirs(os.path.join(runners_dir, "bob.bak"))
+    open(os.path.join(runners_dir, ".DS_Store"), "w").close()
+
+    assert registry.runner_ids() == ["alice", "bob", "default"]
+    for runner_id in registry.runner_ids():
+        registry.get(runner_id)
+
+
+def test_unknown_runner_is_only_created_on_request(data_dir):
+    registry = RunnerRegistry(data_dir)
+
+    with pytest.raises(UnknownRunnerError):
+        registry.get("zzz")
+    assert registry.get().data_dir == data_dir
+    assert registry.runner_ids() == ["default"]
+    assert not os.path.exists(registry.runner_dir("zzz"))
+
+    registry.get("zzz", create=True).start_session(timestamp=1_700_000_000)
+    assert RunnerRegistry(data_dir).get("zzz").current_session is not None
+
+
+@pytest.mark.parametrize("storage", ["partitioned", "ndjson", "sqlite"])
+def test_load_sessions_pages_match_the_stored_dicts(data_dir, storage):
+    timer = ForrestGumpTimer(data_dir, storage=storage)
+    for i in range(7):
+        # Two months, so the partitioned pages cross a partition boundary
+        timer.start_session(timestamp=1_700_000_000 + i * 5 * 86400)
+        timer.add_break(1, 30, timestamp=1_700_000_600 + i * 5 * 86400)
+        timer.stop_session(timestamp=1_700_003_600 + i * 5 * 86400)
+    timer.LOAD_PAGE_SESSIONS = 3
+
+    records = sorted(timer.load_sessions(), key=lambda session: session.start_ts)
+    assert len(records) == 7
+
+    expected = sorted((session_from_record(record) for record in timer.load_all_sessions()),
+                      key=lambda session: session.start_ts)
+    assert [session_to_record(session) for session in records] == [
+        session_to_record(session) for session in expected]
+
+
+@pytest.mark.parametrize("storage", ["partitioned", "ndjson", "sqlite"])
+def test_shared_writers_lose_and_duplicate_nothing(data_dir, storage, tmp_path):
+    workers = [subprocess.Popen([sys.executable, "-c", SHARED_WRITER.format(
+        repo=REPO, data_dir=data_dir, storage=storage, rounds=15, worker=worker)],
+        cwd=str(tmp_path), stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True) for worker in range(4)]
+    stopped = []
+    for worker in workers:
+        out, err = worker.communicate(timeout=120)
+        assert worker.returncode == 0, err
+        stopped += json.loads(out)
+
+    timer = ForrestGumpTimer(data_dir, storage=storage, shared=True)
+    sessions = timer.load_all_sessions()
+    stored_ids = [session["session_id"] for session in sessions]
+
+    assert timer.current_session is None
+    assert len(stored_ids) == len(set(stored_ids))
+    assert sorted(stored_ids) == sorted(stopped)
+    assert len(stored_ids) >= 15
+    totals = timer.storage.get_totals()
+    assert totals["total_sessions"] == timer.storage.rebuild_totals()["total_sessions"] == len(sessions)
+    assert totals["total_distance"] == pytest.approx(sum(s["distance_miles"] for s in sessions), rel=1e-12)
+    assert totals["total_running_time"] == pytest.approx(sum(s["running_time"] for s in sessions), rel=1e-12)
+    assert timer.get_overall_progress()["total_sessions"] == len(sessions)
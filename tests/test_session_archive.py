@@ -0,0 +1,48 @@
+"""
+Tests for the columnar session archive
+"""
+
+import datetime
+import os
+
+from session_archive import SessionArchive, convert
+from session_storage import create_storage
+
+
+def make_sessions(n: int):
+    start = datetime.datetime(2024, 1, 1, 7)
+    return [{
+        "session_id": (start + datetime.timedelta(days=i)).isoformat(),
+        "start_time": (start + datetime.timedelta(days=i)).isoformat(),
+        "end_time": (start + datetime.timedelta(days=i, hours=1)).isoformat(),
+        "breaks": [],
+        "total_break_time": 0,
+        "running_time": 3600.0,
+        "distance_miles": 2.4 + i,
+        "calories": 240
+    } for i in range(n)]
+
+
+def test_rebuild_replaces_columns_while_older_mappings_stay_valid(tmp_path):
+    archive = SessionArchive(str(tmp_path / "archive"))
+    archive.rebuild(make_sessions(50))
+    old_columns = archive.columns()
+
+    archive.rebuild(make_sessions(10))
+    archive.append(make_sessions(12)[10:])
+
+    columns = archive.columns()
+    assert len(columns) == 12
+    assert list(columns.distance_miles) == [2.4 + i for i in range(12)]
+    # The earlier mapping still sees the files it mapped
+    assert list(old_columns.distance_miles) == [2.4 + i for i in range(50)]
+    assert not [name for name in os.listdir(archive.directory) if name.endswith(".tmp")]
+
+
+def test_convert_reads_a_data_directory_through_its_storage(tmp_path):
+    data_dir = str(tmp_path / "data")
+    os.makedirs(data_dir)
+    create_storage("sqlite", data_dir).append_many(make_sessions(20))
+
+    assert convert(data_dir, str(tmp_path / "archive")) == 20
+    assert SessionArchive(str(tmp_path / "archive")).columns().totals()["total_sessions"] == 20
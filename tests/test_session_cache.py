@@ -0,0 +1,122 @@
+"""
+Tests for the aggregate cache (AggregateCache) and how the timer keeps it current
+"""
+
+import datetime
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from forrest_timer import ForrestGumpTimer
+from session_cache import AggregateCache
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+JANUARY = 1_705_300_000  # mid-January 2024
+MARCH = 1_710_500_000    # mid-March 2024
+
+# Another process storing one January session once told to go on stdin
+OTHER_WRITER = """
+import sys
+sys.path.insert(0, {repo!r})
+from forrest_timer import ForrestGumpTimer
+timer = ForrestGumpTimer({data_dir!r}, storage={storage!r})
+print("ready", flush=True)
+sys.stdin.readline()
+timer.import_records([{record!r}])
+"""
+
+
+def period(month: int):
+    return ("month", datetime.datetime(2024, month, 1), datetime.datetime(2024, month + 1, 1))
+
+
+def stored_record(start: int) -> dict:
+    start_time = datetime.datetime.fromtimestamp(start)
+    return {"session_id": start_time.isoformat(), "start_time": start_time.isoformat(),
+            "end_time": (start_time + datetime.timedelta(hours=1)).isoformat(), "breaks": [],
+            "total_break_time": 0, "running_time": 3600.0, "distance_miles": 2.4, "calories": 240}
+
+
+def record_session(timer: ForrestGumpTimer, start: int) -> None:
+    timer.start_session(timestamp=start)
+    timer.stop_session(timestamp=start + 3600)
+
+
+def test_written_drops_only_the_periods_written_to():
+    cache = AggregateCache()
+    for month in (1, 3):
+        cache.get("alice", period(month), 1, lambda: month)
+    cache.get("bob", period(1), 1, lambda: "bob")
+
+    cache.written("alice", [datetime.datetime(2024, 3, 15)], 1, 2)
+
+    assert cache.get("alice", period(1), 2, lambda: "recomputed") == 1
+    assert cache.get("alice", period(3), 2, lambda: "recomputed") == "recomputed"
+    assert cache.get("bob", period(1), 1, lambda: "recomputed") == "bob"
+
+
+def test_written_drops_everything_when_the_version_skipped_a_step():
+    cache = AggregateCache()
+    cache.get("alice", period(1), 1, lambda: "old")
+
+    # Something besides this write changed the data (e.g. another process)
+    cache.written("alice", [datetime.datetime(2024, 3, 15)], 1, 3)
+
+    assert cache.get("alice", period(1), 3, lambda: "recomputed") == "recomputed"
+
+
+def test_lru_eviction_is_bounded():
+    cache = AggregateCache(max_entries=2)
+    for month in (1, 2, 3):
+        cache.get("alice", period(month), 1, lambda: month)
+
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["evictions"] == 1
+    assert cache.get("alice", period(1), 1, lambda: "recomputed") == "recomputed"
+
+
+@pytest.mark.parametrize("storage", ["partitioned", "ndjson", "sqlite"])
+def test_write_from_another_process_before_ours_is_not_carried_over(data_dir, storage):
+    timer = ForrestGumpTimer(data_dir, storage=storage)
+    record_session(timer, JANUARY)
+    assert timer.get_monthly_data(2024, 1)["total_sessions"] == 1
+
+    record_session(ForrestGumpTimer(data_dir, storage=storage, aggregate_cache=AggregateCache()), JANUARY + 86400)
+    record_session(timer, MARCH)
+
+    assert timer.get_monthly_data(2024, 1)["total_sessions"] == 2
+
+
+@pytest.mark.parametrize("storage", ["partitioned", "ndjson", "sqlite"])
+def test_write_from_another_process_during_ours_is_not_carried_over(data_dir, storage, tmp_path, monkeypatch):
+    timer = ForrestGumpTimer(data_dir, storage=storage)
+    record_session(timer, JANUARY)
+    assert timer.get_monthly_data(2024, 1)["total_sessions"] == 1
+
+    script = OTHER_WRITER.format(repo=REPO, data_dir=data_dir, storage=storage,
+                                 record=stored_record(JANUARY + 86400))
+    other = subprocess.Popen([sys.executable, "-c", script], cwd=str(tmp_path),
+                             stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    assert other.stdout.readline() == "ready\n"
+    backend = timer.storage.backend
+    append_many = backend.append_many
+
+    def append_many_racing(session_dicts):
+        # The other process stores its session while ours is being stored
+        other.stdin.write("go\n")
+        other.stdin.flush()
+        time.sleep(0.3)
+        append_many(session_dicts)
+
+    monkeypatch.setattr(backend, "append_many", append_many_racing)
+    record_session(timer, MARCH)
+    monkeypatch.undo()
+    other.communicate(timeout=60)
+    assert other.returncode == 0
+
+    assert timer.get_monthly_data(2024, 1)["total_sessions"] == 2
+    assert timer.get_monthly_data(2024, 3)["total_sessions"] == 1
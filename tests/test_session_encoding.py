@@ -0,0 +1,206 @@
+"""
+Tests for the CBOR encoder (encode_cbor), checked against an independent decoder
+"""
+
+import datetime
+import math
+import random
+import struct
+
+import pytest
+
+from forrest_timer import ForrestGumpTimer
+from session_encoding import CBOR_ARRAY_START, CBOR_BREAK, compact, encode_cbor, encode_cbor_items
+from session_export import prepare_export
+
+# RFC 8949 Appendix A: value and its preferred (shortest) encoding
+RFC_EXAMPLES = [
+    (0, "00"), (23, "17"), (24, "1818"), (100, "1864"), (1000, "1903e8"), (1000000, "1a000f4240"),
+    (1000000000000, "1b000000e8d4a51000"), (18446744073709551615, "1bffffffffffffffff"),
+    (-1, "20"), (-100, "3863"), (-1000, "3903e7"), (-18446744073709551616, "3bffffffffffffffff"),
+    (0.0, "f90000"), (-0.0, "f98000"), (1.0, "f93c00"), (1.1, "fb3ff199999999999a"), (1.5, "f93e00"),
+    (65504.0, "f97bff"), (100000.0, "fa47c35000"), (3.4028234663852886e+38, "fa7f7fffff"),
+    (1.0e+300, "fb7e37e43c8800759c"), (5.960464477539063e-8, "f90001"), (0.00006103515625, "f90400"),
+    (-4.0, "f9c400"), (-4.1, "fbc010666666666666"), (math.inf, "f97c00"), (math.nan, "f97e00"),
+    (-math.inf, "f9fc00"), (False, "f4"), (True, "f5"), (None, "f6"), ("", "60"), ("a", "6161"),
+    ("IETF", "6449455446"), ("ü", "62c3bc"), ("水", "63e6b0b4"), (b"\x01\x02\x03\x04", "4401020304"),
+    ([], "80"), ([1, [2, 3], [4, 5]], "8301820203820405"), ({}, "a0"),
+    ({"a": 1, "b": [2, 3]}, "a26161016162820203"), (["a", {"b": "c"}], "826161a161626163"),
+]
+
+
+def decode_cbor(data: bytes):
+    """The one CBOR item in data (written from RFC 8949, sharing no code with the encoder)"""
+    value, end = _decode(data, 0)
+    assert end == len(data), "trailing bytes"
+    return value
+
+
+def decode_cbor_sequence(data: bytes) -> list:
+    items, offset = [], 0
+    while offset < len(data):
+        item, offset = _decode(data, offset)
+        items.append(item)
+    return items
+
+
+def _decode(data: bytes, offset: int):
+    initial = data[offset]
+    major, info = initial >> 5, initial & 0x1f
+    offset += 1
+    if major == 7:
+        if info == 20:
+            return False, offset
+        if info == 21:
+            return True, offset
+        if info == 22:
+            return None, offset
+        if info in (25, 26, 27):
+            size = {25: 2, 26: 4, 27: 8}[info]
+            raw = data[offset:offset + size]
+            return (_half(raw) if size == 2 else struct.unpack(">f" if size == 4 else ">d", raw)[0]), offset + size
+        raise AssertionError(f"unexpected simple value {info}")
+    if info == 31:
+        return _decode_indefinite(data, offset, major)
+    if info < 24:
+        argument = info
+    else:
+        size = 1 << (info - 24)
+        argument = int.from_bytes(data[offset:offset + size], "big")
+        offset += size
+    if major == 0:
+        return argument, offset
+    if major == 1:
+        return -1 - argument, offset
+    if major == 2:
+        return bytes(data[offset:offset + argument]), offset + argument
+    if major == 3:
+        return data[offset:offset + argument].decode("utf-8"), offset + argument
+    if major == 4:
+        items = []
+        for _ in range(argument):
+            item, offset = _decode(data, offset)
+            items.append(item)
+        return items, offset
+    if major == 5:
+        mapping = {}
+        for _ in range(argument):
+            key, offset = _decode(data, offset)
+            mapping[key], offset = _decode(data, offset)
+        return mapping, offset
+    raise AssertionError(f"unexpected major type {major}")
+
+
+def _decode_indefinite(data: bytes, offset: int, major: int):
+    assert major == 4, "only indefinite arrays are written"
+    items = []
+    while data[offset] != 0xff:
+        item, offset = _decode(data, offset)
+        items.append(item)
+    return items, offset + 1
+
+
+def _half(raw: bytes) -> float:
+    half = int.from_bytes(raw, "big")
+    exponent, mantissa = (half >> 10) & 0x1f, half & 0x3ff
+    if exponent == 0:
+        value = math.ldexp(mantissa, -24)
+    elif exponent == 31:
+        value = math.inf if mantissa == 0 else math.nan
+    else:
+        value = math.ldexp(mantissa + 1024, exponent - 25)
+    return -value if half & 0x8000 else value
+
+
+def same(a, b) -> bool:
+    """Equality that tells floats from ints and -0.0 from 0.0, and matches NaN to NaN"""
+    if isinstance(a, float) and isinstance(b, float):
+        return (math.isnan(a) and math.isnan(b)) or (a == b and math.copysign(1, a) == math.copysign(1, b))
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, list):
+        return len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+    if isinstance(a, dict):
+        return list(a) == list(b) and all(same(a[key], b[key]) for key in a)
+    return a == b
+
+
+def random_value(rng: random.Random, depth: int = 0):
+    kind = rng.randrange(9 if depth < 3 else 7)
+    if kind == 0:
+        return rng.choice((None, True, False))
+    if kind == 1:
+        return rng.randrange(-2 ** 64, 2 ** 64)
+    if kind == 2:
+        return rng.randrange(-2 ** 33, 2 ** 33)
+    if kind == 3:
+        return rng.choice((rng.uniform(-1e6, 1e6), rng.randrange(-5000, 5000) / 4, rng.uniform(0, 1) * 1e-40,
+                           math.ldexp(rng.random(), rng.randrange(-1074, 1024)), -0.0, math.inf, math.nan))
+    if kind == 4:
+        return "".join(rng.choice("aü水🏃 ") for _ in range(rng.randrange(40)))
+    if kind == 5:
+        return rng.randbytes(rng.randrange(300))
+    if kind == 6:
+        return rng.randrange(0, 2 ** 32) + 2 ** 32
+    if kind == 7:
+        return [random_value(rng, depth + 1) for _ in range(rng.randrange(30))]
+    return {f"k{i}": random_value(rng, depth + 1) for i in range(rng.randrange(30))}
+
+
+@pytest.mark.parametrize("value, encoded", RFC_EXAMPLES)
+def test_matches_the_rfc_examples(value, encoded):
+    assert encode_cbor(value).hex() == encoded
+    assert same(decode_cbor(bytes.fromhex(encoded)), value)
+
+
+def test_random_values_round_trip():
+    rng = random.Random(8)
+    for _ in range(300):
+        value = random_value(rng)
+        assert same(decode_cbor(encode_cbor(value)), value)
+
+
+def test_out_of_range_integers_are_refused():
+    for value in (2 ** 64, -2 ** 64 - 1):
+        with pytest.raises(ValueError):
+            encode_cbor(value)
+
+
+def test_indefinite_array_round_trips():
+    items = [1, -2 ** 40, 2.5, None, {"a": [True, False]}]
+
+    assert decode_cbor(CBOR_ARRAY_START + encode_cbor_items(items) + CBOR_BREAK) == items
+    assert decode_cbor(CBOR_ARRAY_START + CBOR_BREAK) == []
+
+
+def test_timestamps_become_epoch_seconds():
+    start = datetime.datetime(2024, 3, 10, 7, 30, 15, 600000)
+    payload = {"start_time": start.isoformat(), "breaks": [{"timestamp": start.isoformat(), "total_seconds": 30}],
+               "end_time": "not a date", "session_id": start.isoformat()}
+
+    decoded = decode_cbor(encode_cbor(compact(payload)))
+
+    assert decoded == {"start_time": round(start.timestamp()),
+                       "breaks": [{"timestamp": round(start.timestamp()), "total_seconds": 30}],
+                       "end_time": "not a date", "session_id": start.isoformat()}
+
+
+@pytest.mark.parametrize("limit", [None, 2])
+def test_cbor_exports_decode_to_the_stored_sessions(data_dir, limit):
+    timer = ForrestGumpTimer(data_dir)
+    for i in range(3):
+        timer.start_session(timestamp=1_700_000_000 + i * 86400)
+        timer.add_break(1, 30, timestamp=1_700_000_600 + i * 86400)
+        timer.stop_session(timestamp=1_700_003_600 + i * 86400)
+    stored = compact(timer.load_all_sessions())[:limit]
+
+    chunks, _, next_cursor = prepare_export(timer, "json", None, limit, "cbor")
+    export = decode_cbor(b"".join(chunks))
+    sequence, _, _ = prepare_export(timer, "ndjson", None, limit, "cbor")
+
+    assert export["success"] is True
+    assert export["data"]["sessions"] == stored
+    assert export["data"]["total_sessions"] == 3
+    assert isinstance(export["data"]["export_date"], int)
+    assert export["data"].get("next_cursor") == next_cursor
+    assert decode_cbor_sequence(b"".join(sequence)) == stored
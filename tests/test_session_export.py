@@ -0,0 +1,102 @@
+"""
+Tests for the streamed, paginated session export (prepare_export)
+"""
+
+import datetime
+import json
+
+import pytest
+
+import session_export
+from forrest_timer import ForrestGumpTimer
+from session_export import prepare_export
+
+
+def make_timer(data_dir: str, storage: str, count: int = 23) -> ForrestGumpTimer:
+    timer = ForrestGumpTimer(data_dir, storage=storage)
+    records = []
+    for i in range(count):
+        # Spread over three months, so partitioned pages cross partitions
+        start = datetime.datetime(2024, 1, 1, 7) + datetime.timedelta(days=4 * i)
+        records.append({"session_id": start.isoformat(), "start_time": start.isoformat(),
+                        "end_time": (start + datetime.timedelta(hours=1)).isoformat(),
+                        "breaks": [{"minutes": 1, "seconds": 0, "total_seconds": 60,
+                                    "timestamp": (start + datetime.timedelta(minutes=20)).isoformat()}],
+                        "total_break_time": 60, "running_time": 3540.0 + i, "distance_miles": 2.36,
+                        "calories": 236})
+    timer.import_records(records)
+    return timer
+
+
+def export(timer: ForrestGumpTimer, export_format: str = "json", cursor=None, limit=None, fields=None):
+    chunks, mimetype, next_cursor = prepare_export(timer, export_format, cursor, limit, "json", fields)
+    return "".join(chunks), mimetype, next_cursor
+
+
+@pytest.mark.parametrize("storage", ["partitioned", "ndjson", "sqlite"])
+@pytest.mark.parametrize("limit", [1, 5, 23, 100])
+def test_paging_through_every_cursor_returns_each_session_once(data_dir, storage, limit):
+    timer = make_timer(data_dir, storage)
+
+    seen = []
+    cursor = None
+    while True:
+        body, _, cursor = export(timer, cursor=cursor, limit=limit)
+        data = json.loads(body)["data"]
+        assert data["next_cursor"] == cursor
+        assert 0 < len(data["sessions"]) <= limit
+        seen += data["sessions"]
+        if cursor is None:
+            break
+
+    assert seen == timer.load_all_sessions()
+
+
+@pytest.mark.parametrize("storage", ["partitioned", "ndjson", "sqlite"])
+def test_unpaginated_export_streams_every_page(data_dir, storage, monkeypatch):
+    monkeypatch.setattr(session_export, "EXPORT_CHUNK_SESSIONS", 4)
+    timer = make_timer(data_dir, storage)
+
+    body, mimetype, next_cursor = export(timer)
+    data = json.loads(body)["data"]
+
+    assert mimetype == "application/json" and next_cursor is None
+    assert "next_cursor" not in data
+    assert data["total_sessions"] == 23
+    assert data["sessions"] == timer.load_all_sessions()
+
+
+@pytest.mark.parametrize("storage", ["partitioned", "ndjson", "sqlite"])
+def test_ndjson_is_one_session_per_line(data_dir, storage, monkeypatch):
+    monkeypatch.setattr(session_export, "EXPORT_CHUNK_SESSIONS", 4)
+    timer = make_timer(data_dir, storage)
+
+    body, mimetype, _ = export(timer, "ndjson")
+    first_page, _, cursor = export(timer, "ndjson", limit=10)
+    rest, _, _ = export(timer, "ndjson", cursor=cursor)
+
+    assert mimetype == "application/x-ndjson"
+    assert body.endswith("\n")
+    assert [json.loads(line) for line in body.splitlines()] == timer.load_all_sessions()
+    assert first_page + rest == body
+
+
+def test_fields_limit_each_session(data_dir):
+    timer = make_timer(data_dir, "partitioned")
+
+    body, _, _ = export(timer, fields=["session_id", "distance_miles"], limit=3)
+    lines, _, _ = export(timer, "ndjson", fields=["start_time"])
+
+    assert json.loads(body)["data"]["sessions"] == [
+        {"session_id": s["session_id"], "distance_miles": s["distance_miles"]} for s in timer.load_all_sessions()[:3]]
+    assert [json.loads(line) for line in lines.splitlines()] == [
+        {"start_time": s["start_time"]} for s in timer.load_all_sessions()]
+
+
+def test_bad_format_and_cursor_raise_before_streaming(data_dir):
+    timer = make_timer(data_dir, "ndjson")
+
+    with pytest.raises(ValueError, match="Unknown export format"):
+        prepare_export(timer, "xml", None, None)
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        prepare_export(timer, "json", "not-a-cursor", 5)
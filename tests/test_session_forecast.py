@@ -0,0 +1,103 @@
+"""
+Tests for the completion forecast (CompletionForecaster)
+"""
+
+import datetime
+import math
+import random
+
+import pytest
+
+from session_forecast import CompletionForecaster, TREND_DECAY, _days_to_cover
+
+FIRST_DAY = datetime.date(2024, 1, 1)
+HISTORY_DAYS = 200
+
+
+def forecaster_for(miles_per_day) -> CompletionForecaster:
+    """Forecaster fed one session per day for HISTORY_DAYS days (0 or less: rest day)"""
+    forecaster = CompletionForecaster()
+    for t in range(HISTORY_DAYS):
+        distance = miles_per_day(t)
+        if distance > 0:
+            forecaster.add(FIRST_DAY.toordinal() + t, distance)
+    return forecaster
+
+
+def today() -> datetime.date:
+    return FIRST_DAY + datetime.timedelta(days=HISTORY_DAYS - 1)
+
+
+def test_flat_history_projects_the_rate():
+    forecast = forecaster_for(lambda t: 3.0).forecast(300, today())
+
+    assert forecast["daily_rate"] == pytest.approx(3.0)
+    assert forecast["trend_per_day"] == pytest.approx(0.0, abs=1e-9)
+    assert forecast["days_remaining"] == 100
+    # No spread and no uncertainty: the range collapses onto the projection (to rounding)
+    projected = datetime.date.fromisoformat(forecast["projected_finish_date"])
+    for bound in (forecast["finish_date_earliest"], forecast["finish_date_latest"]):
+        assert abs((datetime.date.fromisoformat(bound) - projected).days) <= 1
+
+
+def test_rising_trend_is_capped():
+    forecast = forecaster_for(lambda t: 1.0 + 0.01 * t).forecast(2000, today())
+
+    assert forecast["trend_per_day"] == pytest.approx(0.01, rel=1e-6)
+    # Faster than the current rate alone, slower than a trend that never ends
+    rate = forecast["daily_rate"]
+    uncapped = (-rate + math.sqrt(rate ** 2 + 2 * 0.01 * 2000)) / 0.01
+    assert uncapped < forecast["days_remaining"] < 2000 / rate
+
+
+def test_falling_trend_still_finishes():
+    forecast = forecaster_for(lambda t: 5.0 - 0.01 * t).forecast(2000, today())
+
+    assert forecast["trend_per_day"] == pytest.approx(-0.01, rel=1e-6)
+    # Followed forever the trend would stop the running after ~300 days
+    rate = forecast["daily_rate"]
+    assert rate ** 2 / (2 * 0.01) < 2000
+    assert forecast["days_remaining"] is not None
+    assert forecast["days_remaining"] > 2000 / rate
+
+
+def test_no_recent_running_never_finishes():
+    forecaster = forecaster_for(lambda t: 3.0 if t < 20 else 0.0)
+
+    forecast = forecaster.forecast(3000, today() + datetime.timedelta(days=3 * 365))
+
+    assert forecast["projected_finish_date"] is None
+    assert forecast["finish_date_latest"] is None
+
+
+def test_bounds_include_rate_and_trend_uncertainty():
+    rng = random.Random(7)
+    forecaster = forecaster_for(lambda t: rng.choice((0.0, 0.0, 4.0, 8.0)))
+    stats = forecaster.statistics(today().toordinal())
+    noise_only = dict(stats, daily_rate_se=0.0, trend_per_day_se=0.0)
+
+    assert stats["daily_rate_se"] > 0 and stats["trend_per_day_se"] > 0
+    width = _days_to_cover(1000, stats, -1.645) - _days_to_cover(1000, stats, 1.645)
+    noise_width = _days_to_cover(1000, noise_only, -1.645) - _days_to_cover(1000, noise_only, 1.645)
+    assert width > noise_width
+
+
+def test_matches_weighted_least_squares_in_any_order():
+    np = pytest.importorskip("numpy")
+    rng = random.Random(3)
+    daily = [rng.choice((0.0, 2.0, 3.0, 6.0)) + 0.01 * t for t in range(HISTORY_DAYS)]
+    sessions = [(t, part) for t, miles in enumerate(daily) for part in (miles / 2, miles / 2) if miles]
+    rng.shuffle(sessions)
+    forecaster = CompletionForecaster()
+    recorded = {}
+    for t, distance in sessions:
+        forecaster.add(FIRST_DAY.toordinal() + t, distance, recorded.get(t, 0.0))
+        recorded[t] = recorded.get(t, 0.0) + distance
+
+    stats = forecaster.statistics(today().toordinal())
+
+    t = np.arange(HISTORY_DAYS)
+    weights = TREND_DECAY ** (HISTORY_DAYS - 1 - t)
+    slope = np.polyfit(t, np.array(daily), 1, w=np.sqrt(weights))[0]
+    assert stats["trend_per_day"] == pytest.approx(slope, rel=1e-9)
+    assert stats["days"] == HISTORY_DAYS
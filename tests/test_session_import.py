@@ -0,0 +1,92 @@
+"""
+Tests for the bulk session import
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from forrest_timer import ForrestGumpTimer
+from session_import import import_files
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+GPX = """<?xml version="1.0"?>
+<gpx xmlns="http://www.topografix.com/GPX/1/1">
+  <trk><trkseg>
+    <trkpt lat="40.0" lon="-75.0"><time>2024-01-01T08:00:00</time></trkpt>
+    <trkpt lat="40.01" lon="-75.0"><time>2024-01-01T08:10:00</time></trkpt>
+  </trkseg></trk>
+  <trk><trkseg>
+    <trkpt lat="40.0"><time>2024-01-02T08:00:00</time></trkpt>
+    <trkpt lat="40.01" lon="-75.0"><time>2024-01-02T08:10:00</time></trkpt>
+  </trkseg></trk>
+</gpx>
+"""
+
+
+def session(start_time: str, breaks) -> dict:
+    return {"session_id": start_time, "start_time": start_time, "end_time": start_time[:11] + "09:00:00",
+            "breaks": breaks, "total_break_time": 0, "running_time": 1800.0, "distance_miles": 3.0,
+            "calories": 300}
+
+
+def test_gpx_point_without_coordinates_is_an_invalid_row(data_dir, tmp_path):
+    path = tmp_path / "runs.gpx"
+    path.write_text(GPX)
+
+    report = import_files(ForrestGumpTimer(data_dir), [str(path)], dry_run=True)
+
+    assert (report["read"], report["imported"], report["invalid"]) == (2, 1, 1)
+    assert report["errors"] == [f"{path}:2: unreadable number"]
+
+
+def test_malformed_ndjson_breaks_are_invalid_rows(data_dir, tmp_path):
+    good_break = {"minutes": 1, "seconds": 0, "total_seconds": 60, "timestamp": "2024-01-01T08:30:00"}
+    rows = [
+        session("2024-01-01T08:00:00", [good_break]),
+        session("2024-01-02T08:00:00", "none"),
+        session("2024-01-03T08:00:00", [42]),
+        session("2024-01-04T08:00:00", [dict(good_break, total_seconds=-5)]),
+        session("2024-01-05T08:00:00", [dict(good_break, minutes="1")]),
+        session("2024-01-06T08:00:00", [dict(good_break, timestamp="yesterday")]),
+    ]
+    path = tmp_path / "runs.ndjson"
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows) + "[1, 2]\n")
+    timer = ForrestGumpTimer(data_dir)
+
+    report = import_files(timer, [str(path)])
+
+    assert (report["imported"], report["invalid"]) == (1, 6)
+    assert [error.rsplit(": ", 1)[1] for error in report["errors"]] == (
+        ["malformed breaks"] * 5 + ["missing or unreadable start time"])
+    assert [s["breaks"] for s in timer.load_all_sessions()] == [[good_break]]
+
+
+def test_cli_writes_only_to_data_dir(tmp_path):
+    path = tmp_path / "runs.ndjson"
+    path.write_text(json.dumps(session("2024-01-01T08:00:00", [])) + "\n")
+    data_dir = tmp_path / "elsewhere"
+
+    result = subprocess.run([sys.executable, os.path.join(REPO, "session_import.py"), str(path),
+                             "--data-dir", str(data_dir)], cwd=str(tmp_path), capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    assert not (tmp_path / "data").exists()
+    assert len(ForrestGumpTimer(str(data_dir)).load_all_sessions()) == 1
+
+
+def test_fractional_break_seconds_are_kept(data_dir, tmp_path):
+    path = tmp_path / "runs.csv"
+    path.write_text("start_time,end_time,break_time\n"
+                    "2024-01-01T08:00:00,2024-01-01T09:00:00,90.5\n"
+                    "2024-01-02T08:00:00,2024-01-02T09:00:00,120\n")
+    timer = ForrestGumpTimer(data_dir)
+
+    import_files(timer, [str(path)])
+
+    sessions = timer.load_all_sessions()
+    assert [s["total_break_time"] for s in sessions] == [90.5, 120]
+    assert isinstance(sessions[1]["total_break_time"], int)
+    assert [s["running_time"] + s["total_break_time"] for s in sessions] == [3600.0, 3600.0]
@@ -0,0 +1,118 @@
+"""
+Tests for the active-session journal (SessionJournal) and crash recovery through it
+"""
+
+import datetime
+import os
+import time
+
+import pytest
+
+import session_journal
+from forrest_timer import ForrestGumpTimer
+from session_journal import SessionJournal
+from session_records import Break, Session
+
+START = 1_700_000_000
+
+
+def crash(*args, **kwargs):
+    raise RuntimeError("process died here")
+
+
+def restart(timer: ForrestGumpTimer) -> ForrestGumpTimer:
+    """A new process on the same data directory, after this one died"""
+    timer.journal.close()
+    return ForrestGumpTimer(timer.data_dir)
+
+
+def batch():
+    # Stops the open session, then starts and breaks a new one
+    return [{"op": "stop", "timestamp": START + 3600},
+            {"op": "start", "timestamp": START + 7200},
+            {"op": "break", "minutes": 1, "timestamp": START + 7300}]
+
+
+def test_crash_mid_batch_before_storage_keeps_the_open_session(data_dir, monkeypatch):
+    timer = ForrestGumpTimer(data_dir)
+    open_id = timer.start_session(timestamp=START)
+    monkeypatch.setattr(timer.storage.backend, "append_many", crash)
+    with pytest.raises(RuntimeError):
+        timer.apply_batch(batch())
+
+    timer = restart(timer)
+
+    assert timer.current_session.session_id == open_id
+    assert timer.get_overall_progress()["total_sessions"] == 0
+    # The client never got an answer and sends the batch again
+    assert all(result["success"] for result in timer.apply_batch(batch()))
+    assert [s["session_id"] for s in timer.load_all_sessions()] == [open_id]
+    assert len(restart(timer).current_session.breaks) == 1
+
+
+def test_crash_mid_batch_after_storage_stores_the_session_once(data_dir, monkeypatch):
+    timer = ForrestGumpTimer(data_dir)
+    open_id = timer.start_session(timestamp=START)
+    monkeypatch.setattr(timer.journal, "record_start", crash)
+    with pytest.raises(RuntimeError):
+        timer.apply_batch(batch())
+    monkeypatch.undo()
+
+    timer = restart(timer)
+
+    # The stored session is not brought back as the running one
+    assert timer.current_session is None
+    assert not os.path.exists(timer.journal.path)
+    results = timer.apply_batch(batch())
+    assert [result["success"] for result in results] == [False, True, True]
+    assert [s["session_id"] for s in timer.load_all_sessions()] == [open_id]
+    recovered = restart(timer).current_session
+    assert recovered.session_id == datetime.datetime.fromtimestamp(START + 7200).isoformat()
+    assert len(recovered.breaks) == 1
+
+
+def test_torn_last_line_is_dropped_and_journaling_resumes(data_dir):
+    timer = ForrestGumpTimer(data_dir)
+    timer.start_session(timestamp=START)
+    timer.add_break(1, 0, timestamp=START + 600)
+    timer.journal.close()
+    with open(timer.journal.path, "a") as f:
+        f.write('{"event": "break", "minu')
+
+    timer = ForrestGumpTimer(data_dir)
+    assert len(timer.current_session.breaks) == 1
+    timer.add_break(2, 0, timestamp=START + 1200)
+
+    # Crash again: the break added after resuming must not be glued to the torn line
+    timer = restart(timer)
+    assert [b.minutes for b in timer.current_session.breaks] == [1, 2]
+    timer.stop_session(timestamp=START + 3600)
+    assert [b["minutes"] for b in timer.load_all_sessions()[0]["breaks"]] == [1, 2]
+
+
+def test_grouped_fsync_covers_every_acknowledged_event(tmp_path, monkeypatch):
+    synced_sizes = []
+    fsync = os.fsync
+
+    def recording_fsync(fd):
+        fsync(fd)
+        synced_sizes.append(os.fstat(fd).st_size)
+
+    monkeypatch.setattr(session_journal.os, "fsync", recording_fsync)
+    journal = SessionJournal(str(tmp_path / "journal.jsonl"), fsync_interval=0.2, heartbeat_interval=60)
+    journal.record_start(Session("run", START))
+    for i in range(50):
+        journal.record_break(Break(0, 5, START + i))
+
+    # No further writes: the background thread still syncs the tail
+    time.sleep(0.6)
+    assert synced_sizes[-1] == os.path.getsize(journal.path)
+    assert journal.fsync_count <= 3
+
+    # The first is synced at once (a quiet spell ended), the second waits for the group
+    journal.record_break(Break(0, 5, START + 60))
+    journal.record_break(Break(0, 5, START + 61))
+    assert synced_sizes[-1] < os.path.getsize(journal.path)
+    journal.close()
+    assert synced_sizes[-1] == os.path.getsize(journal.path)
+    assert len(journal.recover()["session"].breaks) == 52
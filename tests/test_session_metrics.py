@@ -0,0 +1,66 @@
+"""
+Tests for the request metrics middleware (MetricsMiddleware)
+"""
+
+import time
+
+import pytest
+
+flask = pytest.importorskip("flask")
+
+from session_metrics import MetricsMiddleware, RequestMetrics
+
+STREAM_SECONDS = 0.2
+
+
+@pytest.fixture
+def metered():
+    """A small Flask app wrapped the way app.py wraps its own; returns (client, metrics)"""
+    app = flask.Flask(__name__)
+    metrics = RequestMetrics()
+    app.wsgi_app = MetricsMiddleware(app.wsgi_app, metrics)
+
+    @app.before_request
+    def name_request_endpoint():
+        flask.request.environ[MetricsMiddleware.ENDPOINT_KEY] = flask.request.endpoint or "unmatched"
+
+    @app.route("/fail")
+    def fail():
+        raise RuntimeError("boom")
+
+    @app.route("/stream")
+    def stream():
+        def chunks():
+            for _ in range(2):
+                time.sleep(STREAM_SECONDS / 2)
+                yield "chunk\n"
+        return flask.Response(chunks(), mimetype="text/plain")
+
+    return app.test_client(), metrics
+
+
+def test_unhandled_exception_is_counted_as_500(metered):
+    client, metrics = metered
+    with client.get("/fail") as response:
+        assert response.status_code == 500
+
+    assert metrics._requests == {("GET", "fail", 500): 1}
+    assert metrics._errors == {("GET", "fail"): 1}
+
+
+def test_propagated_exception_is_counted_as_500(metered):
+    client, metrics = metered
+    client.application.testing = True  # re-raise instead of answering 500, as in debug mode
+    with pytest.raises(RuntimeError):
+        client.get("/fail")
+
+    assert metrics._requests == {("GET", "fail", 500): 1}
+
+
+def test_streamed_response_is_timed_until_closed(metered):
+    client, metrics = metered
+    with client.get("/stream") as response:
+        assert response.get_data(as_text=True) == "chunk\nchunk\n"
+
+    assert metrics._requests == {("GET", "stream", 200): 1}
+    assert metrics._durations["stream"].sum >= STREAM_SECONDS
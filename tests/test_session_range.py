@@ -0,0 +1,89 @@
+"""
+Tests for range aggregation (DailyPrefixSums and get_range_data)
+"""
+
+import datetime
+import random
+
+import pytest
+
+from forrest_timer import ForrestGumpTimer
+from session_range import DailyPrefixSums, bucket_boundaries
+
+FIRST_DAY = datetime.datetime(2023, 1, 1, 6, 0)
+HISTORY_DAYS = 730
+
+
+def make_records(count: int, seed: int = 11) -> list:
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        start = FIRST_DAY + datetime.timedelta(days=rng.randrange(HISTORY_DAYS), minutes=i)
+        running_time = rng.uniform(600, 7200)
+        records.append({"session_id": start.isoformat(), "start_time": start.isoformat(),
+                        "end_time": (start + datetime.timedelta(seconds=running_time)).isoformat(),
+                        "breaks": [], "total_break_time": 0, "running_time": running_time,
+                        "distance_miles": running_time / 3600 * 2.4, "calories": rng.randrange(100, 900)})
+    return records
+
+
+def brute_force(records: list, start: datetime.date, end: datetime.date) -> list:
+    days = [datetime.date.fromisoformat(r["start_time"][:10]) for r in records]
+    selected = [r for r, day in zip(records, days) if start <= day < end]
+    return [sum(r["distance_miles"] for r in selected), sum(r["running_time"] for r in selected),
+            len(selected), sum(r["calories"] for r in selected)]
+
+
+def assert_totals(actual: list, expected: list) -> None:
+    assert actual[0] == pytest.approx(expected[0], rel=1e-9, abs=1e-9)
+    assert actual[1] == pytest.approx(expected[1], rel=1e-9, abs=1e-9)
+    assert actual[2:] == expected[2:]
+
+
+def test_prefix_sums_clamp_days_outside_the_history():
+    prefix_sums = DailyPrefixSums({10: [1.0, 60.0, 1, 100], 12: [2.0, 120.0, 2, 200]})
+
+    assert prefix_sums.totals(0, 100) == [3.0, 180.0, 3, 300]
+    assert prefix_sums.totals(11, 12) == [0.0, 0.0, 0, 0]
+    assert prefix_sums.totals(13, 20) == [0.0, 0.0, 0, 0]
+    assert prefix_sums.series([0, 11, 13, 50]) == [[1.0, 60.0, 1, 100], [2.0, 120.0, 2, 200], [0, 0, 0, 0]]
+    assert DailyPrefixSums({}).totals(0, 10) == [0, 0, 0, 0]
+
+
+@pytest.mark.parametrize("storage", ["partitioned", "ndjson", "sqlite"])
+def test_range_totals_and_buckets_match_brute_force(data_dir, storage):
+    records = make_records(400)
+    timer = ForrestGumpTimer(data_dir, storage=storage)
+    timer.import_records(records)
+    rng = random.Random(5)
+    first = FIRST_DAY.date()
+    ranges = [(first - datetime.timedelta(days=30), first + datetime.timedelta(days=HISTORY_DAYS + 30))]
+    for _ in range(10):
+        a, b = sorted(rng.sample(range(-20, HISTORY_DAYS + 20), 2))
+        ranges.append((first + datetime.timedelta(days=a), first + datetime.timedelta(days=b)))
+
+    for granularity in ("day", "week", "month", "year"):
+        for start, end in ranges:
+            data = timer.get_range_data(start.isoformat(), end.isoformat(), granularity)
+
+            assert_totals([data["total_distance"], data["total_time"], data["total_sessions"],
+                           data["total_calories"]], brute_force(records, start, end))
+            boundaries = bucket_boundaries(start, end, granularity)
+            assert [bucket["start"] for bucket in data["buckets"]] == [d.isoformat() for d in boundaries[:-1]]
+            for bucket, bucket_start, bucket_end in zip(data["buckets"], boundaries, boundaries[1:]):
+                assert_totals([bucket["distance"], bucket["time"], bucket["sessions"], bucket["calories"]],
+                              brute_force(records, bucket_start, bucket_end))
+
+
+def test_range_without_end_runs_through_today(data_dir):
+    timer = ForrestGumpTimer(data_dir)
+    timer.start_session()
+    timer.stop_session()
+    today = datetime.date.today()
+
+    data = timer.get_range_data(today - datetime.timedelta(days=6))
+
+    assert data["end"] == (today + datetime.timedelta(days=1)).isoformat()
+    assert data["total_sessions"] == 1
+    with pytest.raises(ValueError, match="Missing start"):
+        timer.get_range_data(None)
@@ -0,0 +1,118 @@
+"""
+Tests for the quantile sketches (QuantileSketch) and their monthly persistence
+"""
+
+import datetime
+import random
+
+import pytest
+
+from forrest_timer import ForrestGumpTimer, RunnerRegistry
+from session_sketch import (MAX_BINS, RELATIVE_ACCURACY, QuantileSketch, add_session, dump_sketches,
+                            empty_sketches, merge_sketches)
+
+QUANTILES = (0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99)
+
+
+def exact_quantile(values: list, q: float) -> float:
+    """The value QuantileSketch.quantile(q) estimates: rank q * (n - 1), rounded down"""
+    return sorted(values)[int(q * (len(values) - 1))]
+
+
+def sketch_of(values) -> QuantileSketch:
+    sketch = QuantileSketch()
+    for value in values:
+        sketch.add(value)
+    return sketch
+
+
+def make_records(count: int, months: int, seed: int) -> list:
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        start = datetime.datetime(2024, 1 + rng.randrange(months), 1 + rng.randrange(28), 7, i % 60, i // 60 % 60)
+        breaks = [{"minutes": 0, "seconds": 0, "total_seconds": rng.choice((0, 30, rng.uniform(5, 600))),
+                   "timestamp": start.isoformat()} for _ in range(rng.randrange(3))]
+        running_time = rng.lognormvariate(8, 0.6)
+        records.append({"session_id": start.isoformat(), "start_time": start.isoformat(),
+                        "end_time": (start + datetime.timedelta(seconds=running_time)).isoformat(),
+                        "breaks": breaks, "total_break_time": sum(b["total_seconds"] for b in breaks),
+                        "running_time": running_time, "distance_miles": running_time / 3600 * 2.4,
+                        "calories": int(running_time / 6)})
+    return records
+
+
+def test_quantiles_are_within_the_relative_accuracy():
+    rng = random.Random(1)
+    values = [rng.lognormvariate(1, 1.5) for _ in range(20000)] + [0.0] * 100
+
+    sketch = sketch_of(values)
+
+    for q in QUANTILES:
+        exact = exact_quantile(values, q)
+        assert abs(sketch.quantile(q) - exact) <= RELATIVE_ACCURACY * exact * (1 + 1e-9)
+    assert (sketch.quantile(0), sketch.quantile(1)) == (min(values), max(values))
+    assert QuantileSketch().quantile(0.5) is None
+
+
+def test_bins_stay_bounded():
+    values = [1.0001 ** i for i in range(0, 400000, 10)]
+
+    sketch = sketch_of(values)
+
+    assert len(sketch.bins) <= MAX_BINS
+    # Folding only costs accuracy at the bottom
+    exact = exact_quantile(values, 0.99)
+    assert abs(sketch.quantile(0.99) - exact) <= RELATIVE_ACCURACY * exact
+
+
+def test_merge_equals_the_sketch_of_all_values_in_any_order():
+    rng = random.Random(2)
+    parts = [[rng.expovariate(0.1) for _ in range(rng.randrange(1, 500))] for _ in range(6)]
+    whole = sketch_of(value for part in parts for value in part)
+
+    rng.shuffle(parts)
+    merged = QuantileSketch()
+    for part in parts:
+        merged.merge(sketch_of(part))
+
+    assert merged.to_dict() == whole.to_dict()
+    assert QuantileSketch.from_dict(whole.to_dict()).to_dict() == whole.to_dict()
+
+
+def test_percentiles_merge_across_runners_and_months(data_dir):
+    registry = RunnerRegistry(data_dir)
+    by_runner = {"alice": make_records(300, 6, seed=3), "bob": make_records(200, 4, seed=4)}
+    for runner_id, records in by_runner.items():
+        registry.get(runner_id, create=True).import_records(records)
+    everything = by_runner["alice"] + by_runner["bob"]
+    in_range = [r for r in everything if "2024-02" <= r["start_time"][:7] <= "2024-05"]
+
+    result = registry.get_percentiles(["alice", "bob"], "2024-02", "2024-05", QUANTILES, by_month=True)
+
+    distances = [r["distance_miles"] for r in in_range]
+    assert result["stats"]["distance"]["count"] == len(in_range)
+    for q, label in zip(QUANTILES, ("p1", "p10", "p25", "p50", "p75", "p90", "p99")):
+        exact = exact_quantile(distances, q)
+        assert abs(result["stats"]["distance"][label] - exact) <= RELATIVE_ACCURACY * exact * (1 + 1e-9)
+    assert sorted(result["months"]) == ["2024-02", "2024-03", "2024-04", "2024-05"]
+    assert sum(month["distance"]["count"] for month in result["months"].values()) == len(in_range)
+
+
+@pytest.mark.parametrize("storage", ["partitioned", "ndjson", "sqlite"])
+def test_monthly_sketches_survive_a_reload(data_dir, storage):
+    records = make_records(400, 5, seed=5)
+    timer = ForrestGumpTimer(data_dir, storage=storage)
+    timer.import_records(records[:250])
+    for record in records[250:]:
+        # Appended one by one, so the stored sketches are folded incrementally
+        timer._store_records([record])
+
+    reloaded = ForrestGumpTimer(data_dir, storage=storage).get_monthly_sketches()
+
+    expected = {}
+    for record in records:
+        add_session(expected.setdefault(record["start_time"][:7], empty_sketches()), record)
+    assert {month: dump_sketches(sketches) for month, sketches in reloaded.items()} == {
+        month: dump_sketches(sketches) for month, sketches in sorted(expected.items())}
+    assert dump_sketches(merge_sketches(reloaded.values())) == dump_sketches(merge_sketches(expected.values()))
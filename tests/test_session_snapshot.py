@@ -0,0 +1,92 @@
+"""
+Tests for the session index (SessionIndex): snapshot plus log tail against a full rescan
+"""
+
+import datetime
+import os
+import random
+import sqlite3
+
+import pytest
+
+from forrest_timer import ForrestGumpTimer
+from session_snapshot import SessionIndex
+
+TODAY = datetime.date(2024, 12, 31).toordinal()
+
+
+def make_records(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        start = datetime.datetime(2024, 1 + rng.randrange(12), 1 + rng.randrange(28), 6, i % 60, i // 60 % 60)
+        running_time = rng.uniform(600, 7200)
+        records.append({"session_id": f"{start.isoformat()}-{seed}", "start_time": start.isoformat(),
+                        "end_time": (start + datetime.timedelta(seconds=running_time)).isoformat(),
+                        "breaks": [], "total_break_time": 0, "running_time": running_time,
+                        "distance_miles": running_time / 3600 * 2.4, "calories": rng.randrange(100, 900)})
+    return records
+
+
+def reload(timer: ForrestGumpTimer) -> SessionIndex:
+    """The index as a new process loads it: latest snapshot plus the log tail"""
+    index = SessionIndex(timer.storage, os.path.join(timer.data_dir, "snapshot.json"))
+    index.load()
+    return index
+
+
+def assert_matches_rescan(index: SessionIndex, timer: ForrestGumpTimer) -> None:
+    rescan = SessionIndex(timer.storage, os.path.join(timer.data_dir, "no-snapshot.json"))
+    rescan.load()
+    assert index.session_ids == rescan.session_ids
+    assert index.session_ids == {session["session_id"] for session in timer.load_all_sessions()}
+    assert sorted(index.daily) == sorted(rescan.daily)
+    for day, values in rescan.daily.items():
+        assert index.daily[day][:2] == pytest.approx(values[:2], rel=1e-12)
+        assert index.daily[day][2:] == values[2:]
+    windows = index.rolling_totals(TODAY)
+    for name, window in rescan.rolling_totals(TODAY).items():
+        assert windows[name] == pytest.approx(window, rel=1e-9, abs=1e-9)
+
+
+def truncate_log(timer: ForrestGumpTimer, keep: int) -> None:
+    """Cut the stored log back to its first keep sessions (of the last partition, if partitioned)"""
+    backend = timer.storage.backend
+    if backend.name == "sqlite":
+        with sqlite3.connect(backend.path) as conn:
+            conn.execute("DELETE FROM sessions WHERE rowid > ?", (keep,))
+        return
+    path = backend.path if backend.name == "ndjson" else backend.partition_path(backend.partition_keys()[-1])
+    with open(path, "rb") as f:
+        lines = f.readlines()
+    with open(path, "wb") as f:
+        f.writelines(lines[:keep])
+
+
+@pytest.mark.parametrize("storage", ["partitioned", "ndjson", "sqlite"])
+def test_snapshot_plus_tail_matches_a_rescan(data_dir, storage):
+    timer = ForrestGumpTimer(data_dir, storage=storage)
+    timer.import_records(make_records(200, seed=1))
+    timer.get_session_index().write_snapshot()
+    # Stored behind the snapshot, into months it already covers
+    timer.import_records(make_records(100, seed=2))
+
+    index = reload(timer)
+
+    assert index.replayed_since_snapshot == 100
+    assert_matches_rescan(index, timer)
+
+
+@pytest.mark.parametrize("storage", ["partitioned", "ndjson", "sqlite"])
+def test_truncated_log_behind_a_snapshot_matches_a_rescan(data_dir, storage):
+    timer = ForrestGumpTimer(data_dir, storage=storage)
+    timer.import_records(make_records(200, seed=1))
+    timer.get_session_index().write_snapshot()
+
+    truncate_log(timer, 5)
+    timer.storage.refresh()
+    assert_matches_rescan(reload(timer), timer)
+
+    # Grown back past where the snapshot's position pointed
+    timer.import_records(make_records(300, seed=3))
+    assert_matches_rescan(reload(timer), timer)
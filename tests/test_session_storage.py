@@ -0,0 +1,96 @@
+"""
+Tests for the storage backends' maintained totals against a full rescan
+"""
+
+import datetime
+import os
+import random
+
+import pytest
+
+from session_records import encode_record
+from session_storage import TOTAL_KEYS, add_to_totals, create_storage, empty_totals
+
+
+def make_records(count: int, seed: int, breaks: int = None) -> list:
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        start = datetime.datetime(2024, 1 + rng.randrange(4), 1 + rng.randrange(28), 6, i % 60, i // 60 % 60)
+        session_breaks = [{"minutes": 0, "seconds": 30, "total_seconds": 30.5, "timestamp": start.isoformat()}
+                          for _ in range(rng.randrange(3) if breaks is None else breaks)]
+        records.append({"session_id": start.isoformat(), "start_time": start.isoformat(),
+                        "end_time": (start + datetime.timedelta(hours=1)).isoformat(), "breaks": session_breaks,
+                        "total_break_time": 30.5 * len(session_breaks), "running_time": rng.uniform(600, 7200),
+                        "distance_miles": rng.uniform(0.5, 6), "calories": rng.randrange(100, 900)})
+    return records
+
+
+def open_storage(name: str, data_dir: str):
+    # ForrestGumpTimer creates the data directory before opening its backend
+    os.makedirs(data_dir, exist_ok=True)
+    return create_storage(name, data_dir)
+
+
+def rescan(storage) -> dict:
+    totals = empty_totals()
+    for session in storage.load_all():
+        add_to_totals(totals, session)
+    return totals
+
+
+def assert_totals_equal(actual: dict, expected: dict) -> None:
+    for key in TOTAL_KEYS:
+        assert actual[key] == pytest.approx(expected[key], rel=1e-12), key
+
+
+def assert_matches_rescan(storage, data_dir: str) -> None:
+    expected = rescan(storage)
+    assert_totals_equal(storage.get_totals(), expected)
+    assert_totals_equal(storage.rebuild_totals(), expected)
+    # And as a fresh process reads them from the manifest, sidecar or totals row
+    assert_totals_equal(create_storage(storage.name, data_dir).get_totals(), expected)
+
+
+def test_sqlite_duplicate_session_adds_no_breaks(data_dir):
+    storage = open_storage("sqlite", data_dir)
+    original = make_records(1, seed=1, breaks=1)[0]
+    storage.append_many([original])
+
+    # Sent again with more breaks, alone and twice within one chunk
+    storage.append_many([dict(original, breaks=original["breaks"] * 3)])
+    retried = make_records(1, seed=2, breaks=1)[0]
+    storage.append_many([retried, dict(retried, breaks=retried["breaks"] * 4)])
+
+    assert [len(session["breaks"]) for session in storage.load_all()] == [1, 1]
+    assert storage.get_totals()["total_breaks"] == 2
+    assert_matches_rescan(storage, data_dir)
+
+
+@pytest.mark.parametrize("storage_name", ["partitioned", "ndjson", "sqlite"])
+def test_maintained_totals_match_a_rescan(data_dir, storage_name):
+    storage = open_storage(storage_name, data_dir)
+    records = make_records(300, seed=3)
+
+    storage.append_many(records[:200])
+    assert_matches_rescan(storage, data_dir)
+    for record in records[200:]:
+        storage.append_many([record])
+    assert_matches_rescan(storage, data_dir)
+
+
+@pytest.mark.parametrize("storage_name", ["partitioned", "ndjson"])
+def test_log_totals_match_a_rescan_after_the_log_is_rewritten(data_dir, storage_name):
+    storage = open_storage(storage_name, data_dir)
+    storage.append_many(make_records(200, seed=4))
+    storage.get_totals()
+    path = storage.path if storage_name == "ndjson" else storage.partition_path(storage.partition_keys()[0])
+
+    # Truncated to a few sessions and grown back past the recorded offset
+    # before anything reads the totals again
+    with open(path, "rb") as f:
+        lines = f.readlines()
+    with open(path, "wb") as f:
+        f.writelines(lines[:3] + [(encode_record(record) + "\n").encode() for record in make_records(250, seed=5)])
+    assert os.path.getsize(path) > sum(len(line) for line in lines)
+    assert_matches_rescan(storage, data_dir)
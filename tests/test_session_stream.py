@@ -0,0 +1,52 @@
+"""
+Tests for the live session stream (SessionBroadcaster)
+"""
+
+import pytest
+
+from forrest_timer import ForrestGumpTimer
+
+TICKS = 5
+
+
+def run_ticks(timer: ForrestGumpTimer, subscribers: int, monkeypatch) -> tuple:
+    """Drive TICKS ticks with `subscribers` clients; returns (stats calls, frames per client)"""
+    calls = []
+    get_session_stats = timer.get_session_stats
+
+    def counted_stats():
+        calls.append(1)
+        return get_session_stats()
+
+    monkeypatch.setattr(timer, "get_session_stats", counted_stats)
+    subscriptions = [timer.events.subscribe() for _ in range(subscribers)]
+    calls.clear()  # each new subscriber is sent the current stats once
+
+    for _ in range(TICKS):
+        timer.events.tick()
+
+    frames = [subscription.frames.qsize() for subscription in subscriptions]
+    for subscription in subscriptions:
+        subscription.close()
+    return len(calls), frames
+
+
+@pytest.fixture
+def running_timer(data_dir):
+    timer = ForrestGumpTimer(data_dir)
+    # Ticks are driven by hand; keep the ticker thread out of the way
+    timer.events.tick_interval = 3600
+    timer.start_session()
+    yield timer
+    timer.stop_session()
+
+
+def test_stats_computed_once_per_tick_whatever_the_subscriber_count(running_timer, monkeypatch):
+    one_calls, one_frames = run_ticks(running_timer, 1, monkeypatch)
+    many_calls, many_frames = run_ticks(running_timer, 50, monkeypatch)
+
+    assert one_calls == many_calls == TICKS
+    # Every client got every tick, plus the frame sent on subscribing
+    assert one_frames == [TICKS + 1]
+    assert many_frames == [TICKS + 1] * 50
+    assert running_timer.events.subscriber_count == 0